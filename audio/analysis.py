@@ -0,0 +1,170 @@
+"""Level analysis for 16-bit little-endian mono PCM frames.
+
+``analyze`` reads the frame through a ``numpy.frombuffer`` view (no copy of
+the payload) and covers every sample, cheaply enough to run on each frame
+of a live session.  ``LevelMonitor`` keeps per-session rolling statistics.
+"""
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+FULL_SCALE = 32768
+CLIP_LEVEL = 32767          # |sample| at or above this counts as clipped
+SILENCE_PEAK = 100          # frames whose peak stays below this are treated as silence
+_DBFS_FLOOR = -120.0
+
+
+def dbfs(level: float) -> float:
+    """Amplitude relative to int16 full scale, in dB"""
+    return 20 * math.log10(level / FULL_SCALE) if level > 0 else _DBFS_FLOOR
+
+
+@dataclass(slots=True)
+class FrameLevels:
+    """Levels of one frame; amplitudes are in int16 sample units"""
+    samples: int
+    peak: int
+    rms: float
+    clipped: int
+    dc_offset: float
+    zcr: float              # zero crossings per sample pair, 0..1
+
+    @property
+    def peak_dbfs(self) -> float:
+        return dbfs(self.peak)
+
+    @property
+    def rms_dbfs(self) -> float:
+        return dbfs(self.rms)
+
+    @property
+    def silent(self) -> bool:
+        return self.peak < SILENCE_PEAK
+
+    def describe(self) -> str:
+        text = (f"samples={self.samples} peak={self.peak} rms={self.rms:.0f} "
+                f"({self.rms_dbfs:.1f} dBFS) dc={self.dc_offset:.1f} zcr={self.zcr:.3f}")
+        if self.clipped:
+            text += f" clipped={self.clipped}"
+        if self.silent:
+            text += " (silence)"
+        return text
+
+
+EMPTY = FrameLevels(samples=0, peak=0, rms=0.0, clipped=0, dc_offset=0.0, zcr=0.0)
+
+
+def samples_of(pcm: BytesLike) -> np.ndarray:
+    """int16 view of a PCM buffer, ignoring a trailing odd byte"""
+    count = len(pcm) // 2
+    return np.frombuffer(pcm, dtype="<i2", count=count)
+
+
+def analyze(pcm: BytesLike, clip_level: int = CLIP_LEVEL) -> FrameLevels:
+    """
+    Peak, RMS, clipping, DC offset and zero-crossing rate over a whole frame
+
+    Args:
+        pcm (BytesLike): 16-bit little-endian mono PCM
+        clip_level (int): Magnitude counted as clipped
+
+    Returns:
+        FrameLevels: Levels of the frame, EMPTY for fewer than one sample
+    """
+    x = samples_of(pcm)
+    n = x.size
+    if n == 0:
+        return EMPTY
+
+    lo, hi = int(x.min()), int(x.max())
+    xf = x.astype(np.float32)
+    total = float(xf.sum(dtype=np.float64))
+    energy = float(np.dot(xf, xf))
+    if lo <= -clip_level or hi >= clip_level:
+        clipped = int(np.count_nonzero(x >= clip_level) + np.count_nonzero(x <= -clip_level))
+    else:
+        clipped = 0
+    negative = np.signbit(x)
+    crossings = int(np.count_nonzero(negative[1:] != negative[:-1]))
+
+    return FrameLevels(
+        samples=n,
+        peak=max(hi, -lo),
+        rms=math.sqrt(energy / n),
+        clipped=clipped,
+        dc_offset=total / n,
+        zcr=crossings / (n - 1) if n > 1 else 0.0,
+    )
+
+
+class LevelMonitor:
+    """Per-session level statistics: lifetime totals plus a rolling window of frames"""
+
+    def __init__(self, window: int = 50, clip_level: int = CLIP_LEVEL):
+        """
+        Args:
+            window (int): Number of recent frames the rolling figures cover
+            clip_level (int): Magnitude counted as clipped
+        """
+        self.clip_level = clip_level
+        self.last = EMPTY
+        self.frames = 0
+        self.samples = 0
+        self.silent_frames = 0
+        self.clipped_samples = 0
+        self.peak = 0
+        self._energy = 0.0
+        self._sum = 0.0
+        self._recent: deque = deque(maxlen=window)
+
+    def update(self, pcm: BytesLike) -> FrameLevels:
+        levels = analyze(pcm, self.clip_level)
+        if levels.samples == 0:
+            return levels
+        self.last = levels
+        self.frames += 1
+        self.samples += levels.samples
+        self.silent_frames += levels.silent
+        self.clipped_samples += levels.clipped
+        self.peak = max(self.peak, levels.peak)
+        self._energy += levels.rms * levels.rms * levels.samples
+        self._sum += levels.dc_offset * levels.samples
+        self._recent.append(levels)
+        return levels
+
+    @property
+    def rolling_rms(self) -> float:
+        """RMS over the recent window, weighted by frame length"""
+        samples = sum(f.samples for f in self._recent)
+        if not samples:
+            return 0.0
+        return math.sqrt(sum(f.rms * f.rms * f.samples for f in self._recent) / samples)
+
+    @property
+    def rolling_peak(self) -> int:
+        return max((f.peak for f in self._recent), default=0)
+
+    @property
+    def rolling_silence(self) -> float:
+        """Fraction of recent frames that were silent"""
+        return sum(f.silent for f in self._recent) / len(self._recent) if self._recent else 0.0
+
+    def stats(self) -> dict:
+        rms = math.sqrt(self._energy / self.samples) if self.samples else 0.0
+        return {
+            "frames": self.frames,
+            "samples": self.samples,
+            "peak": self.peak,
+            "rms_dbfs": round(dbfs(rms), 1),
+            "dc_offset": round(self._sum / self.samples, 1) if self.samples else 0.0,
+            "clipped_samples": self.clipped_samples,
+            "silent_frames": self.silent_frames,
+            "rolling_rms_dbfs": round(dbfs(self.rolling_rms), 1),
+            "rolling_peak": self.rolling_peak,
+            "rolling_silence": round(self.rolling_silence, 3),
+        }
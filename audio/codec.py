@@ -0,0 +1,103 @@
+"""Optional Opus transport for the /ws/audio payloads.
+
+A client asks for it with ``/ws/audio?codec=opus`` and the server answers
+``{"type": "codec", "codec": "opus"|"pcm"}`` before anything else, so the
+client knows what to send.  With Opus negotiated, each 0x01 mic frame
+carries one Opus packet (mono, 48 kHz, any legal frame duration) and each
+0x02 speaker frame one Opus packet of the 24 kHz downlink; otherwise, or
+when libopus is not installed, payloads stay raw 16-bit PCM.
+
+Opus needs ``opuslib`` plus the system libopus (``apt install libopus0``).
+"""
+import logging
+from typing import Optional
+
+from audio.analysis import BytesLike
+
+logger = logging.getLogger(__name__)
+
+try:
+    import opuslib
+except ImportError:                 # package missing: PCM only, nothing to report
+    opuslib = None
+except Exception as e:              # libopus missing or broken; opuslib raises whatever ctypes did
+    logger.warning("Opus disabled, opuslib failed to load: %r", e)
+    opuslib = None
+
+CODEC_PCM = "pcm"
+CODEC_OPUS = "opus"
+
+OPUS_FRAME_MS = (2.5, 5, 10, 20, 40, 60)
+_MAX_PACKET_MS = 120
+
+
+def opus_available() -> bool:
+    return opuslib is not None
+
+
+class PcmCodec:
+    """Raw PCM passthrough, the default and the fallback"""
+
+    name = CODEC_PCM
+
+    def decode(self, payload: BytesLike) -> BytesLike:
+        return payload
+
+    def encode(self, pcm: BytesLike) -> BytesLike:
+        return pcm
+
+
+class OpusCodec:
+    """Decodes uplink Opus packets to PCM and encodes downlink PCM frames to Opus"""
+
+    name = CODEC_OPUS
+
+    def __init__(self, decode_rate: int = 48000, encode_rate: int = 24000,
+                 bitrate: int = 24000, complexity: int = 5):
+        """
+        Args:
+            decode_rate (int): PCM rate the uplink is decoded to
+            encode_rate (int): Rate of the downlink PCM handed to ``encode``
+            bitrate (int): Downlink target bitrate in bits/s
+            complexity (int): Encoder complexity 0-10, trading CPU for quality
+        """
+        if opuslib is None:
+            raise RuntimeError("Opus support needs opuslib and libopus")
+        self.decoder = opuslib.Decoder(decode_rate, 1)
+        self.encoder = opuslib.Encoder(encode_rate, 1, opuslib.APPLICATION_VOIP)
+        self.encoder.bitrate = bitrate
+        self.encoder.complexity = complexity
+        self._max_decode_samples = decode_rate * _MAX_PACKET_MS // 1000
+        self._frame_sizes = [int(encode_rate * ms / 1000) for ms in OPUS_FRAME_MS]
+
+    def decode(self, packet: BytesLike) -> bytes:
+        try:
+            return self.decoder.decode(bytes(packet), self._max_decode_samples)
+        except opuslib.OpusError as e:
+            raise ValueError(f"Undecodable Opus packet: {e}") from e
+
+    def encode(self, pcm: BytesLike) -> bytes:
+        """Encode one frame, zero-padding it up to the next legal Opus duration"""
+        samples = len(pcm) // 2
+        frame_size = next((n for n in self._frame_sizes if n >= samples), None)
+        if frame_size is None:
+            raise ValueError(f"{samples} samples is longer than the largest Opus frame")
+        if frame_size != samples:
+            pcm = bytes(pcm[:samples * 2]) + bytes(2 * (frame_size - samples))
+        return self.encoder.encode(bytes(pcm), frame_size)
+
+
+def negotiate(requested: Optional[str], **opus_options):
+    """
+    Codec for a session, given the client's ``codec`` query parameter
+
+    Args:
+        requested (Optional[str]): Codec the client asked for, if any
+        **opus_options: Passed to OpusCodec
+
+    Returns:
+        PcmCodec | OpusCodec: Opus when requested and available, PCM otherwise
+    """
+    if requested == CODEC_OPUS and opuslib is not None:
+        return OpusCodec(**opus_options)
+    return PcmCodec()
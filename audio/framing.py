@@ -0,0 +1,136 @@
+"""Binary framing for the /ws/audio WebSocket protocol.
+
+Two wire formats are understood:
+
+* legacy - one type byte followed by the payload: 0x01 mic PCM,
+           0x02 speaker PCM, 0x03 UTF-8 text typed by the candidate,
+           0x04 control (server -> client), payload is one command byte:
+           0x01 interrupt - the candidate barged in, stop playback and
+           discard any speaker audio already buffered
+* v1     - the type byte with the high bit set, then a fixed header::
+
+      offset  size  field
+      0       1     kind | 0x80
+      1       1     version (1)
+      2       2     flags (reserved, 0)
+      4       4     sequence number
+      8       8     timestamp, microseconds since the epoch
+      16      4     sample rate in Hz
+      20      ...   PCM payload (or the control command)
+
+All fields are little-endian.  Parsing never copies the payload and
+building reuses one preallocated buffer per writer.
+"""
+import struct
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+FRAME_MIC = 0x01
+FRAME_SPEAKER = 0x02
+FRAME_TEXT = 0x03
+FRAME_CONTROL = 0x04
+
+CONTROL_INTERRUPT = 0x01
+
+VERSIONED_BIT = 0x80
+FRAME_VERSION = 1
+
+_HEADER = struct.Struct("<BBHIQI")
+HEADER_SIZE = _HEADER.size
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(slots=True)
+class Frame:
+    """A parsed frame; ``payload`` is a view into the received message"""
+    kind: int
+    payload: memoryview
+    version: int = 0
+    seq: Optional[int] = None
+    timestamp_us: Optional[int] = None
+    sample_rate: Optional[int] = None
+
+
+def parse_frame(data: BytesLike) -> Frame:
+    """
+    Split a received message into its header fields and payload view
+
+    Args:
+        data (BytesLike): One binary WebSocket message
+
+    Returns:
+        Frame: Parsed frame, the payload shares memory with ``data``
+    """
+    view = memoryview(data)
+    if len(view) < 1:
+        raise ValueError("Empty frame")
+
+    first = view[0]
+    if not first & VERSIONED_BIT:
+        return Frame(kind=first, payload=view[1:])
+
+    if len(view) < HEADER_SIZE:
+        raise ValueError(f"Truncated v1 frame header ({len(view)} bytes)")
+    kind, version, _flags, seq, ts, rate = _HEADER.unpack_from(view)
+    if version != FRAME_VERSION:
+        raise ValueError(f"Unsupported frame version: {version}")
+    return Frame(
+        kind=kind & ~VERSIONED_BIT,
+        payload=view[HEADER_SIZE:],
+        version=version,
+        seq=seq,
+        timestamp_us=ts,
+        sample_rate=rate,
+    )
+
+
+def encode_frame(kind: int, payload: BytesLike) -> bytes:
+    """One-off legacy frame for low-rate messages; use FrameWriter on hot paths"""
+    return bytes((kind,)) + payload
+
+
+class FrameWriter:
+    """Builds outgoing frames of one kind into a reusable buffer.
+
+    The memoryview returned by ``build`` is only valid until the next call,
+    so send (and await) each frame before building the next one.
+    """
+
+    def __init__(self, kind: int, sample_rate: int = 0, versioned: bool = False, capacity: int = 16384):
+        """
+        Args:
+            kind (int): Frame type byte, e.g. FRAME_SPEAKER
+            sample_rate (int): Rate written into v1 headers
+            versioned (bool): Emit v1 headers instead of the single legacy byte
+            capacity (int): Initial payload capacity; grows on demand
+        """
+        self.kind = kind
+        self.sample_rate = sample_rate
+        self.versioned = versioned
+        self.header_size = HEADER_SIZE if versioned else 1
+        self.seq = 0
+        self._buf = bytearray(self.header_size + capacity)
+        self._view = memoryview(self._buf)
+
+    def build(self, payload: BytesLike, timestamp_us: Optional[int] = None) -> memoryview:
+        size = self.header_size + len(payload)
+        if size > len(self._buf):
+            self._buf = bytearray(size)
+            self._view = memoryview(self._buf)
+
+        if self.versioned:
+            if timestamp_us is None:
+                timestamp_us = time.time_ns() // 1000
+            _HEADER.pack_into(
+                self._buf, 0,
+                self.kind | VERSIONED_BIT, FRAME_VERSION, 0,
+                self.seq & 0xFFFFFFFF, timestamp_us, self.sample_rate,
+            )
+        else:
+            self._buf[0] = self.kind
+
+        self._view[self.header_size:size] = payload
+        self.seq += 1
+        return self._view[:size]
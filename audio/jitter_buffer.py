@@ -0,0 +1,123 @@
+import asyncio
+from collections import deque
+
+
+class JitterBuffer:
+    """Bounded downlink playout buffer for raw PCM.
+
+    Drop-in for the ``asyncio.Queue`` the relay used to hold Gemini audio:
+    producers call ``put_nowait`` with chunks of any size, the consumer
+    awaits ``get`` and receives fixed-duration frames.  Memory is capped at
+    ``max_ms`` of audio; when the consumer falls behind, the oldest frames
+    are discarded so what the client hears stays close to real time.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = 40, target_ms: int = 120,
+                 max_ms: int = 5000, sample_width: int = 2):
+        """
+        Args:
+            sample_rate (int): Sample rate of the PCM being buffered
+            frame_ms (int): Duration of each frame handed to the consumer
+            target_ms (int): Depth to accumulate before playout (re)starts
+            max_ms (int): Hard cap on buffered audio, oldest frames dropped beyond it
+            sample_width (int): Bytes per sample
+        """
+        self.bytes_per_ms = sample_rate * sample_width / 1000
+        self.frame_bytes = int(self.bytes_per_ms * frame_ms) // sample_width * sample_width
+        self.target_bytes = int(self.bytes_per_ms * target_ms)
+        self.max_bytes = max(int(self.bytes_per_ms * max_ms), self.frame_bytes)
+
+        self._frames = deque()
+        self._pending = bytearray()
+        self._buffered = 0
+        self._ready = asyncio.Event()
+        self._playing = False
+        self._flushed = False
+        self._starved = False
+
+        self.frames_in = 0
+        self.frames_out = 0
+        self.dropped_frames = 0
+        self.late_frames = 0
+        self.underruns = 0
+
+    def qsize(self) -> int:
+        return len(self._frames)
+
+    @property
+    def depth_ms(self) -> float:
+        return (self._buffered + len(self._pending)) / self.bytes_per_ms
+
+    def put_nowait(self, data: bytes):
+        """Coalesce a chunk into fixed-size frames, evicting the oldest on overflow"""
+        self._flushed = False
+        self._pending += data
+        added = 0
+        while len(self._pending) >= self.frame_bytes:
+            self._push(bytes(self._pending[:self.frame_bytes]))
+            del self._pending[:self.frame_bytes]
+            added += 1
+
+        if added and self._starved:
+            self.late_frames += added
+            self._starved = False
+        self._enforce_cap()
+
+    def flush(self):
+        """Mark the end of a burst (e.g. end of turn): release the partial frame"""
+        if self._pending:
+            self._push(bytes(self._pending))
+            self._pending.clear()
+        self._flushed = True
+        self._ready.set()
+
+    def clear(self) -> int:
+        """Discard everything buffered and return the number of frames dropped"""
+        dropped = len(self._frames) + (1 if self._pending else 0)
+        self._frames.clear()
+        self._pending.clear()
+        self._buffered = 0
+        self._playing = False
+        self.dropped_frames += dropped
+        return dropped
+
+    async def get(self) -> bytes:
+        while True:
+            if self._frames and (self._playing or self._flushed or self._buffered >= self.target_bytes):
+                self._playing = True
+                frame = self._frames.popleft()
+                self._buffered -= len(frame)
+                self.frames_out += 1
+                return frame
+
+            if self._playing and not self._frames:
+                # Ran dry mid-burst: rebuffer to the target depth before resuming
+                self._playing = False
+                if not self._flushed:
+                    self.underruns += 1
+                    self._starved = True
+
+            self._ready.clear()
+            await self._ready.wait()
+
+    def stats(self) -> dict:
+        return {
+            "depth_ms": round(self.depth_ms, 1),
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "dropped_frames": self.dropped_frames,
+            "late_frames": self.late_frames,
+            "underruns": self.underruns,
+        }
+
+    def _push(self, frame: bytes):
+        self._frames.append(frame)
+        self._buffered += len(frame)
+        self.frames_in += 1
+        self._ready.set()
+
+    def _enforce_cap(self):
+        while self._frames and self._buffered + len(self._pending) > self.max_bytes:
+            frame = self._frames.popleft()
+            self._buffered -= len(frame)
+            self.dropped_frames += 1
@@ -0,0 +1,307 @@
+"""Memory-mapped, time-indexed access to recorded 16-bit mono session logs.
+
+``PcmLog`` maps a raw ``.pcm`` capture (or a WAV written by
+``services.recorder``) and hands out NumPy views by time range, so reading
+minute 37 of an interview touches only that minute's pages.  For overviews
+it keeps a peak / mean-square pyramid in a ``<file>.pyramid.npy`` sidecar:
+level 0 summarises ``base`` samples per bucket, each level above ``factor``
+buckets of the one below.  The sidecar is built once in bounded-size blocks,
+rebuilt when the log is newer or has grown, and itself memory-mapped, so a
+waveform of any span costs O(points) rather than O(span).
+
+    python -m audio.pcm_log audio_logs/mic_20250527_213447.pcm --start 12 --seconds 5
+"""
+import argparse
+import math
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from audio.analysis import FrameLevels, analyze, dbfs
+
+PYRAMID_DTYPE = np.dtype([("peak", "<u2"), ("ms", "<f4")])
+SIDECAR_SUFFIX = ".pyramid.npy"
+_BUILD_BLOCK_BUCKETS = 4096     # level-0 buckets summarised per pass while building
+_BUCKETS_PER_BIN = 16           # overview bins from the pyramid span at least this many buckets
+
+
+@dataclass
+class Overview:
+    """Peak and RMS of consecutive bins; amplitudes in int16 sample units.
+
+    ``edges_s`` holds the ``len(peak) + 1`` bin boundaries actually summarised;
+    ``start_s`` is the first of them and ``bin_s`` the mean bin length.
+    """
+    start_s: float
+    bin_s: float
+    peak: np.ndarray
+    rms: np.ndarray
+    edges_s: np.ndarray
+
+    def peak_dbfs(self) -> List[float]:
+        return [dbfs(p) for p in self.peak]
+
+
+def _wav_layout(head: bytes) -> Optional[Tuple[int, int]]:
+    """(data offset, sample rate) of a 16-bit mono PCM WAV header, None if not a WAV"""
+    if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+    pos, rate = 12, None
+    while pos + 8 <= len(head):
+        chunk, size = struct.unpack_from("<4sI", head, pos)
+        if chunk == b"fmt ":
+            fmt, channels, rate = struct.unpack_from("<HHI", head, pos + 8)
+            bits = struct.unpack_from("<H", head, pos + 22)[0]
+            if fmt != 1 or channels != 1 or bits != 16:
+                raise ValueError(f"Only 16-bit mono PCM WAV is supported (format={fmt}, "
+                                 f"channels={channels}, bits={bits})")
+        elif chunk == b"data":
+            if rate is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            return pos + 8, rate
+        pos += 8 + size + (size & 1)
+    raise ValueError("No data chunk in the first bytes of the WAV")
+
+
+class PcmLog:
+    """Read-only memory map of one capture, indexed by time"""
+
+    def __init__(self, path: str, sample_rate: int = 48000, base: int = 256, factor: int = 4):
+        """
+        Args:
+            path (str): Raw 16-bit little-endian mono .pcm, or a 16-bit mono WAV
+            sample_rate (int): Rate of a raw capture (WAVs carry their own)
+            base (int): Samples per bucket at the bottom of the pyramid
+            factor (int): Buckets merged per pyramid level
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.base = base
+        self.factor = factor
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        offset = 0
+        if self._mmap is not None:
+            layout = _wav_layout(self._mmap[:512])
+            if layout is not None:
+                offset, self.sample_rate = layout
+        count = max(0, size - offset) // 2
+        if count:
+            self.samples = np.frombuffer(self._mmap, dtype="<i2", count=count, offset=offset)
+        else:
+            self.samples = np.zeros(0, dtype="<i2")
+        self._pyramid: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.samples.size
+
+    def __enter__(self) -> "PcmLog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def duration_s(self) -> float:
+        return self.samples.size / self.sample_rate
+
+    def index(self, t: float) -> int:
+        """Sample index of time ``t`` seconds, clamped to the log"""
+        return min(max(0, int(round(t * self.sample_rate))), self.samples.size)
+
+    def view(self, start_s: float = 0.0, end_s: Optional[float] = None) -> np.ndarray:
+        """int16 samples in [start_s, end_s), a view into the map (no copy)"""
+        stop = self.samples.size if end_s is None else self.index(end_s)
+        return self.samples[self.index(start_s):stop]
+
+    def pcm(self, start_s: float = 0.0, end_s: Optional[float] = None) -> memoryview:
+        """The same range as raw PCM bytes, still without copying"""
+        return memoryview(self.view(start_s, end_s)).cast("B")
+
+    def frames(self, frame_ms: float, start_s: float = 0.0, end_s: Optional[float] = None) -> Iterator[np.ndarray]:
+        """Consecutive views of ``frame_ms``; a short final frame is included"""
+        span = self.view(start_s, end_s)
+        step = max(1, int(self.sample_rate * frame_ms / 1000))
+        for i in range(0, span.size, step):
+            yield span[i:i + step]
+
+    def levels(self, start_s: float = 0.0, end_s: Optional[float] = None) -> FrameLevels:
+        return analyze(self.pcm(start_s, end_s))
+
+    def overview(self, start_s: float = 0.0, end_s: Optional[float] = None, points: int = 1000) -> Overview:
+        """
+        Peak and RMS of ``points`` bins over a time range
+
+        Args:
+            start_s (float): Start of the range in seconds
+            end_s (Optional[float]): End of the range, the end of the log when None
+            points (int): Number of bins wanted
+
+        Returns:
+            Overview: Exactly ``points`` bins (fewer only when the range has fewer
+            samples).  Short ranges are read from the samples with exact edges;
+            longer ones from the pyramid, each edge snapped to the nearest
+            bucket boundary of a level with at least ``_BUCKETS_PER_BIN``
+            buckets per bin (or of level 0 when bins are shorter than that).
+        """
+        lo = self.index(start_s)
+        hi = self.samples.size if end_s is None else self.index(end_s)
+        span = hi - lo
+        if span <= 0 or points <= 0:
+            return Overview(lo / self.sample_rate, 0.0, np.zeros(0, np.int32), np.zeros(0),
+                            np.array([lo / self.sample_rate]))
+        points = min(points, span)
+        per_bin = span / points
+
+        if per_bin < self.base:
+            edges = np.linspace(lo, hi, points + 1).astype(np.int64)
+            x = self.samples[lo:hi].astype(np.int32)
+            starts = edges[:-1] - lo
+            peak = np.maximum.reduceat(np.abs(x), starts)
+            xf = x.astype(np.float64)
+            energy = np.add.reduceat(xf * xf, starts)
+            return self._overview(edges, peak, np.sqrt(energy / np.diff(edges)))
+
+        fine = per_bin / _BUCKETS_PER_BIN
+        level = int(math.log(fine / self.base, self.factor)) if fine >= self.base else 0
+        level = min(level, len(self.level_sizes()) - 1)
+        bucket = self.base * self.factor ** level
+        # Buckets are at most one bin long, so the snapped edges stay strictly increasing
+        snapped = np.floor(np.linspace(lo, hi, points + 1) / bucket + 0.5).astype(np.int64)
+        chunk = self._level(level)[snapped[0]:snapped[-1]]
+        counts = np.full(chunk.size, bucket, dtype=np.float64)
+        if snapped[-1] * bucket > self.samples.size:
+            counts[-1] = self.samples.size - (snapped[-1] - 1) * bucket
+
+        starts = snapped[:-1] - snapped[0]
+        peak = np.maximum.reduceat(chunk["peak"].astype(np.int32), starts)
+        energy = np.add.reduceat(chunk["ms"] * counts, starts)
+        rms = np.sqrt(energy / np.add.reduceat(counts, starts))
+        return self._overview(np.minimum(snapped * bucket, self.samples.size), peak, rms)
+
+    def _overview(self, edges: np.ndarray, peak: np.ndarray, rms: np.ndarray) -> Overview:
+        edges_s = edges / self.sample_rate
+        return Overview(edges_s[0], (edges_s[-1] - edges_s[0]) / peak.size, peak, rms, edges_s)
+
+    def close(self):
+        self.samples = np.zeros(0, dtype="<i2")
+        self._pyramid = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass    # views handed out are still alive; the map goes when they do
+            self._mmap = None
+        self._file.close()
+
+    # -- pyramid -----------------------------------------------------------
+
+    @property
+    def sidecar_path(self) -> str:
+        return self.path + SIDECAR_SUFFIX
+
+    def level_sizes(self) -> List[int]:
+        """Buckets per pyramid level, bottom first, up to a single bucket"""
+        sizes = []
+        bucket = self.base
+        while True:
+            sizes.append(max(1, -(-self.samples.size // bucket)))
+            if sizes[-1] == 1:
+                return sizes
+            bucket *= self.factor
+
+    def pyramid(self) -> np.ndarray:
+        """All levels back to back, memory-mapped from the sidecar (built or rebuilt when stale)"""
+        if self._pyramid is None:
+            expected = sum(self.level_sizes())
+            path = self.sidecar_path
+            try:
+                fresh = os.path.getmtime(path) >= os.path.getmtime(self.path)
+                cached = np.load(path, mmap_mode="r") if fresh else None
+            except (OSError, ValueError):
+                cached = None
+            if cached is None or cached.dtype != PYRAMID_DTYPE or cached.shape != (expected,):
+                self.build_pyramid()
+                cached = np.load(path, mmap_mode="r")
+            self._pyramid = cached
+        return self._pyramid
+
+    def _level(self, level: int) -> np.ndarray:
+        sizes = self.level_sizes()
+        level = min(level, len(sizes) - 1)
+        offset = sum(sizes[:level])
+        return self.pyramid()[offset:offset + sizes[level]]
+
+    def build_pyramid(self):
+        """Summarise the log into the sidecar in bounded-memory blocks"""
+        sizes = self.level_sizes()
+        tmp = self.sidecar_path + ".tmp"
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=PYRAMID_DTYPE, shape=(sum(sizes),))
+
+        # Level 0 straight from the samples
+        n, base = self.samples.size, self.base
+        block = base * _BUILD_BLOCK_BUCKETS
+        for start in range(0, n, block):
+            x = self.samples[start:start + block]
+            full = x.size // base
+            first = start // base
+            if full:
+                b = x[:full * base].reshape(full, base)
+                out["peak"][first:first + full] = np.maximum(b.max(axis=1).astype(np.int32),
+                                                             -b.min(axis=1).astype(np.int32))
+                bf = b.astype(np.float32)
+                out["ms"][first:first + full] = np.einsum("ij,ij->i", bf, bf, dtype=np.float64) / base
+            if x.size > full * base:
+                tail = x[full * base:].astype(np.int32)
+                out["peak"][first + full] = np.abs(tail).max()
+                tf = tail.astype(np.float64)    # an int32 dot overflows on loud audio
+                out["ms"][first + full] = float(np.dot(tf, tf)) / tail.size
+        if n == 0:
+            out[0] = (0, 0.0)
+
+        # Each level above from the one below, weighting the short final bucket by its length
+        offset, bucket = 0, base
+        for below, above in zip(sizes, sizes[1:]):
+            child = out[offset:offset + below]
+            counts = np.full(below, bucket, dtype=np.float64)
+            counts[-1] = n - (below - 1) * bucket
+            starts = np.arange(0, below, self.factor)
+            parent = out[offset + below:offset + below + above]
+            parent["peak"] = np.maximum.reduceat(child["peak"], starts)
+            parent["ms"] = np.add.reduceat(child["ms"] * counts, starts) / np.add.reduceat(counts, starts)
+            offset += below
+            bucket *= self.factor
+
+        out.flush()
+        del out
+        os.replace(tmp, self.sidecar_path)
+        self._pyramid = None
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Levels and a coarse waveform of a recorded session log")
+    parser.add_argument("path")
+    parser.add_argument("--rate", type=int, default=48000, help="sample rate of a raw .pcm capture")
+    parser.add_argument("--start", type=float, default=0.0, help="seconds")
+    parser.add_argument("--seconds", type=float, default=None, help="length of the range, default to the end")
+    parser.add_argument("--points", type=int, default=60, help="overview bins")
+    args = parser.parse_args(argv)
+
+    with PcmLog(args.path, sample_rate=args.rate) as log:
+        end = None if args.seconds is None else args.start + args.seconds
+        print(f"{args.path}: {log.duration_s:.1f} s at {log.sample_rate} Hz")
+        print(f"range {args.start:.1f}-{end if end is not None else log.duration_s:.1f} s: {log.levels(args.start, end).describe()}")
+        ov = log.overview(args.start, end, args.points)
+        for i, (peak, rms) in enumerate(zip(ov.peak, ov.rms)):
+            bar = "#" * max(0, int((dbfs(rms) + 80) / 2))
+            print(f"{ov.edges_s[i]:8.2f}s {dbfs(peak):6.1f} {dbfs(rms):6.1f} dBFS {bar}")
+
+
+if __name__ == "__main__":
+    main_cli()
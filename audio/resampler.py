@@ -0,0 +1,122 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+
+class StreamingResampler:
+    """Stateful polyphase resampler for little-endian 16-bit mono PCM.
+
+    Frames can be fed in any size (including odd byte counts); the filter
+    history and the fractional output position are carried over between
+    calls so consecutive frames resample exactly as one continuous signal.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, taps_per_phase: int = 32, beta: float = 8.0):
+        """
+        Build the windowed-sinc prototype filter and split it into phases
+
+        Args:
+            in_rate (int): Sample rate of the incoming PCM
+            out_rate (int): Sample rate to produce
+            taps_per_phase (int): FIR length per polyphase branch
+            beta (float): Kaiser window shape parameter
+        """
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+
+        g = math.gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.taps = taps_per_phase
+
+        # Prototype low-pass at the upsampled rate, cut off at the lower Nyquist
+        length = self.taps * self.up
+        cutoff = 0.5 / max(self.up, self.down)
+        n = np.arange(length) - (length - 1) / 2.0
+        h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta)
+        h *= self.up / h.sum()
+
+        # phases[p, q] = h[p + q * up]
+        self.phases = h.reshape(self.taps, self.up).T.astype(np.float32)
+        self.reset()
+
+    def reset(self):
+        """Drop all carried-over state"""
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._consumed = 0      # absolute input samples seen so far
+        self._next_pos = 0      # upsampled position of the next output sample
+        self._odd_byte: Optional[bytes] = None
+
+    @property
+    def mime_type(self) -> str:
+        return f"audio/pcm;rate={self.out_rate}"
+
+    @property
+    def delay(self) -> float:
+        """Group delay of the filter, in input samples"""
+        return (self.taps * self.up - 1) / (2 * self.up)
+
+    def flush(self) -> bytes:
+        """
+        Push the end of the stream through the filter, then reset
+
+        The last ``delay`` input samples only reach the output once later
+        samples arrive; this feeds zeros in their place.  Live streams never
+        need it, but finite ones (files) lose their final few ms without it.
+
+        Returns:
+            bytes: Raw int16 samples at out_rate still owed for the input so far
+        """
+        self._odd_byte = None
+        tail = b"" if self.up == self.down or not self._consumed else self.process(bytes(2 * math.ceil(self.delay)))
+        self.reset()
+        return tail
+
+    def process(self, pcm: bytes) -> bytes:
+        """
+        Resample one frame
+
+        Args:
+            pcm (bytes): Raw int16 little-endian samples at in_rate
+
+        Returns:
+            bytes: Raw int16 samples at out_rate (may be empty for tiny frames)
+        """
+        if self.up == self.down:
+            return bytes(pcm)
+
+        if self._odd_byte is not None:
+            pcm = self._odd_byte + bytes(pcm)
+            self._odd_byte = None
+        if len(pcm) % 2:
+            self._odd_byte = bytes(pcm[-1:])
+            pcm = memoryview(pcm)[:-1]
+
+        x = np.frombuffer(pcm, dtype="<i2")
+        if x.size == 0:
+            return b""
+
+        buf = np.concatenate((self._history, x.astype(np.float32)))
+        base = self._consumed - (self.taps - 1)   # absolute index of buf[0]
+        self._consumed += x.size
+
+        # Every output whose newest input sample is already available
+        last_pos = (self._consumed - 1) * self.up + self.up - 1
+        count = (last_pos - self._next_pos) // self.down + 1 if last_pos >= self._next_pos else 0
+
+        if count > 0:
+            pos = self._next_pos + self.down * np.arange(count, dtype=np.int64)
+            newest = pos // self.up - base
+            phase = pos % self.up
+            window = buf[newest[:, None] - np.arange(self.taps)]
+            y = np.einsum("ij,ij->i", window, self.phases[phase])
+            self._next_pos += count * self.down
+            out = np.clip(np.rint(y), -32768, 32767).astype("<i2").tobytes()
+        else:
+            out = b""
+
+        self._history = buf[-(self.taps - 1):].copy() if self.taps > 1 else buf[:0]
+        return out
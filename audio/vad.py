@@ -0,0 +1,170 @@
+"""Streaming energy / zero-crossing voice-activity detection for uplink audio.
+
+Frames are classified from their ``FrameLevels`` (see ``audio.analysis``):
+speech when the RMS level clears an adaptive threshold, or sits a little
+below it with a high zero-crossing rate (unvoiced consonants such as "s"
+or "f").  The threshold rides ``margin_db`` above a noise-floor estimate
+that follows quiet frames quickly and louder ones only slowly, so steady
+background noise (fans, hum) stops counting as speech after a few seconds.
+
+Around that per-frame decision the detector keeps a small state machine:
+
+* ``min_speech_ms`` of consecutive speech opens a segment, and the
+  ``preroll_ms`` of audio buffered before it is released with it, so word
+  onsets are not clipped
+* after speech stops, frames keep flowing for ``hangover_ms`` before the
+  segment closes
+* between segments frames are dropped, or thinned to one every
+  ``keepalive_ms`` when that is set
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from audio.analysis import BytesLike, FrameLevels, analyze
+
+
+@dataclass(slots=True)
+class VadDecision:
+    """What to do with one incoming frame"""
+    frames: List[BytesLike] = field(default_factory=list)   # forward these, in order
+    started: bool = False                                   # a speech segment opened before ``frames``
+    ended: bool = False                                     # the segment closed after ``frames``
+
+
+class VoiceActivityDetector:
+    """Gates a PCM stream down to speech segments plus pre-roll and hangover"""
+
+    def __init__(self, sample_rate: int, threshold_dbfs: float = -50.0, margin_db: float = 12.0,
+                 unvoiced_margin_db: float = 8.0, unvoiced_zcr: float = 0.3,
+                 min_speech_ms: float = 60.0, hangover_ms: float = 600.0, preroll_ms: float = 300.0,
+                 keepalive_ms: float = 0.0, noise_fall: float = 0.2, noise_rise: float = 0.01,
+                 sample_width: int = 2):
+        """
+        Args:
+            sample_rate (int): Sample rate of the frames passed to ``process``
+            threshold_dbfs (float): Lowest RMS level ever treated as speech
+            margin_db (float): Speech must also be this far above the tracked noise floor
+            unvoiced_margin_db (float): How far below the threshold high-ZCR frames still count
+            unvoiced_zcr (float): Zero-crossing rate marking a frame as unvoiced speech
+            min_speech_ms (float): Consecutive speech needed to open a segment
+            hangover_ms (float): Non-speech tolerated before a segment closes
+            preroll_ms (float): Audio kept from before a segment and forwarded with it
+            keepalive_ms (float): Forward one frame per this much silence, 0 drops all of it
+            noise_fall (float): Per-frame smoothing when the level is below the noise floor
+            noise_rise (float): Per-frame smoothing when it is above
+            sample_width (int): Bytes per sample
+        """
+        self.bytes_per_ms = sample_rate * sample_width / 1000
+        self.threshold_dbfs = threshold_dbfs
+        self.margin_db = margin_db
+        self.unvoiced_margin_db = unvoiced_margin_db
+        self.unvoiced_zcr = unvoiced_zcr
+        self.min_speech_ms = min_speech_ms
+        self.hangover_ms = hangover_ms
+        self.preroll_bytes = int(preroll_ms * self.bytes_per_ms)
+        self.keepalive_ms = keepalive_ms
+        self.noise_fall = noise_fall
+        self.noise_rise = noise_rise
+
+        self.noise_floor_dbfs = threshold_dbfs - margin_db
+        self.in_speech = False
+        self._run_ms = 0.0              # consecutive speech while closed / non-speech while open
+        self._since_keepalive_ms = 0.0
+        self._preroll: deque = deque()
+        self._preroll_size = 0
+
+        self.frames_in = 0
+        self.frames_forwarded = 0
+        self.bytes_dropped = 0
+        self.segments = 0
+
+    @property
+    def threshold(self) -> float:
+        return max(self.threshold_dbfs, self.noise_floor_dbfs + self.margin_db)
+
+    def is_speech(self, levels: FrameLevels) -> bool:
+        level = levels.rms_dbfs
+        threshold = self.threshold
+        if level >= threshold:
+            return True
+        return level >= threshold - self.unvoiced_margin_db and levels.zcr >= self.unvoiced_zcr
+
+    def process(self, pcm: BytesLike, levels: Optional[FrameLevels] = None) -> VadDecision:
+        """
+        Classify one frame and advance the gate
+
+        Args:
+            pcm (BytesLike): 16-bit mono PCM frame
+            levels (Optional[FrameLevels]): Levels already computed for this frame, if any
+
+        Returns:
+            VadDecision: Frames to forward now and segment start/end markers
+        """
+        if levels is None:
+            levels = analyze(pcm)
+        self.frames_in += 1
+        duration_ms = len(pcm) / self.bytes_per_ms
+        speech = self.is_speech(levels)
+        if levels.samples:
+            delta = levels.rms_dbfs - self.noise_floor_dbfs
+            self.noise_floor_dbfs += (self.noise_fall if delta < 0 else self.noise_rise) * delta
+
+        decision = VadDecision()
+        if self.in_speech:
+            decision.frames.append(pcm)
+            self._run_ms = 0.0 if speech else self._run_ms + duration_ms
+            if self._run_ms >= self.hangover_ms:
+                self.in_speech = False
+                self._run_ms = 0.0
+                decision.ended = True
+        else:
+            self._run_ms = self._run_ms + duration_ms if speech else 0.0
+            if speech and self._run_ms >= self.min_speech_ms:
+                self.in_speech = True
+                self._run_ms = 0.0
+                self.segments += 1
+                decision.started = True
+                decision.frames.extend(self._preroll)
+                decision.frames.append(pcm)
+                self._preroll.clear()
+                self._preroll_size = 0
+            else:
+                self._hold(bytes(pcm), duration_ms, decision)
+
+        self.frames_forwarded += len(decision.frames)
+        return decision
+
+    def reset(self):
+        """Forget the current segment and pre-roll (the noise floor is kept)"""
+        self.in_speech = False
+        self._run_ms = 0.0
+        self._since_keepalive_ms = 0.0
+        self._preroll.clear()
+        self._preroll_size = 0
+
+    def stats(self) -> dict:
+        return {
+            "frames_in": self.frames_in,
+            "frames_forwarded": self.frames_forwarded,
+            "bytes_dropped": self.bytes_dropped,
+            "segments": self.segments,
+            "in_speech": self.in_speech,
+            "noise_floor_dbfs": round(self.noise_floor_dbfs, 1),
+        }
+
+    def _hold(self, frame: bytes, duration_ms: float, decision: VadDecision):
+        """Keep a gated frame as pre-roll, or pass it on as a keepalive"""
+        if self.keepalive_ms:
+            self._since_keepalive_ms += duration_ms
+            if self._since_keepalive_ms >= self.keepalive_ms:
+                self._since_keepalive_ms = 0.0
+                decision.frames.append(frame)
+                return
+
+        self._preroll.append(frame)
+        self._preroll_size += len(frame)
+        while self._preroll_size > self.preroll_bytes and self._preroll:
+            evicted = self._preroll.popleft()
+            self._preroll_size -= len(evicted)
+            self.bytes_dropped += len(evicted)
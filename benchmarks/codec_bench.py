@@ -0,0 +1,111 @@
+"""CPU cost of the Opus transport per session, against raw PCM.
+
+Replays the recorded mic captures through the server-side codec path:
+uplink packets are encoded client-style outside the timed region, then
+``OpusCodec.decode`` is timed; the downlink is the same audio at 24 kHz cut
+into playout frames and run through ``OpusCodec.encode``.  Reports CPU per
+frame, CPU per second of audio (percent of one core per session), the
+sessions one core could carry, and the wire bitrate next to raw PCM.
+
+    python -m benchmarks.codec_bench --complexity 3 5 8 --bitrate 16000 24000
+"""
+import argparse
+import glob
+import sys
+import time
+from typing import List
+
+from audio import codec
+from audio.pcm_log import PcmLog
+from audio.resampler import StreamingResampler
+
+UP_RATE = 48000
+DOWN_RATE = 24000
+
+
+def load_audio(pattern: str, seconds: float) -> bytes:
+    """``seconds`` of audio from the captures, in order, looped if they are shorter"""
+    needed = int(seconds * UP_RATE) * 2
+    parts, have = [], 0
+    for path in sorted(glob.glob(pattern)):
+        with PcmLog(path, sample_rate=UP_RATE) as log:
+            part = bytes(log.pcm(0, (needed - have) / 2 / UP_RATE))
+        parts.append(part)
+        have += len(part)
+        if have >= needed:
+            break
+    data = b"".join(parts)
+    if not data:
+        raise SystemExit(f"No audio matches {pattern}")
+    return (data * (needed // len(data) + 1))[:needed]
+
+
+def frames(pcm: bytes, rate: int, frame_ms: float) -> List[bytes]:
+    size = int(rate * frame_ms / 1000) * 2
+    return [pcm[i:i + size] for i in range(0, len(pcm) - size + 1, size)]
+
+
+def cpu_time(fn, items) -> float:
+    started = time.process_time()
+    for item in items:
+        fn(item)
+    return time.process_time() - started
+
+
+def report(label: str, cpu_s: float, count: int, audio_s: float, wire_bytes: int, pcm_rate: int):
+    per_frame_us = cpu_s / count * 1e6
+    load = cpu_s / audio_s
+    per_core = int(1 / load) if load else 0
+    kbps = wire_bytes * 8 / audio_s / 1000
+    pcm_kbps = pcm_rate * 16 / 1000
+    print(f"  {label:<8} {per_frame_us:8.1f} us/frame  {100 * load:6.2f}% core/session  "
+          f"~{per_core:5d} sessions/core  {kbps:6.1f} kbit/s (PCM {pcm_kbps:.0f}, x{pcm_kbps / kbps:.1f})")
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--pcm", default="audio_logs/mic_*.pcm", help="glob of 48 kHz 16-bit mono captures")
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio per measurement")
+    parser.add_argument("--uplink-frame-ms", type=float, default=20.0, help="client packet duration")
+    parser.add_argument("--downlink-frame-ms", type=float, default=40.0, help="playout frame duration")
+    parser.add_argument("--bitrate", nargs="*", type=int, default=[24000])
+    parser.add_argument("--complexity", nargs="*", type=int, default=[5])
+    args = parser.parse_args(argv)
+
+    if not codec.opus_available():
+        print("Opus is not available (pip install opuslib, plus the system libopus)")
+        return 1
+
+    up_pcm = load_audio(args.pcm, args.seconds)
+    down_pcm = StreamingResampler(UP_RATE, DOWN_RATE).process(up_pcm)
+    up_frames = frames(up_pcm, UP_RATE, args.uplink_frame_ms)
+    down_frames = frames(down_pcm, DOWN_RATE, args.downlink_frame_ms)
+    print(f"{args.seconds:.0f} s of audio: {len(up_frames)} uplink / {len(down_frames)} downlink frames")
+
+    passthrough = codec.PcmCodec()
+    print("pcm")
+    report("decode", cpu_time(passthrough.decode, up_frames), len(up_frames), args.seconds,
+           len(up_pcm), UP_RATE)
+    report("encode", cpu_time(passthrough.encode, down_frames), len(down_frames), args.seconds,
+           len(down_pcm), DOWN_RATE)
+
+    for bitrate in args.bitrate:
+        for complexity in args.complexity:
+            # The client's encoder (uplink) runs at the same settings; it is not timed
+            client = codec.OpusCodec(decode_rate=DOWN_RATE, encode_rate=UP_RATE,
+                                     bitrate=bitrate, complexity=complexity)
+            packets = [client.encode(f) for f in up_frames]
+            server = codec.OpusCodec(decode_rate=UP_RATE, encode_rate=DOWN_RATE,
+                                     bitrate=bitrate, complexity=complexity)
+
+            print(f"opus bitrate={bitrate} complexity={complexity}")
+            report("decode", cpu_time(server.decode, packets), len(packets), args.seconds,
+                   sum(map(len, packets)), UP_RATE)
+            encoded = []
+            cpu_s = cpu_time(lambda f: encoded.append(server.encode(f)), down_frames)
+            report("encode", cpu_s, len(down_frames), args.seconds, sum(map(len, encoded)), DOWN_RATE)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,372 @@
+"""Micro-benchmarks for the relay hot path, checked against stored baselines.
+
+Each benchmark drives the real code (``main.AudioLoop`` and
+``test_server3.AudioTestHandler``) through in-memory WebSocket / live
+session stand-ins, for every frame size x concurrent session count, and
+reports the cost per frame in microseconds:
+
+* read_ws_chunk       ``AudioLoop._read_ws_chunk`` (receive + parse)
+* listen_audio        mic frames through ``listen_audio`` into ``out_queue``
+* play_audio          jitter buffer -> ``FrameWriter`` -> ``send_bytes``
+* receive_transcript  ``receive_from_gemini``: audio + transcription accumulation
+* chunk_analysis      ``AudioTestHandler`` level monitoring plus the sampled chunk details
+
+Each factory builds one session's state up front and returns ``(job, frames)``;
+only the jobs themselves are timed.  Every cell is sampled ``--repeats`` times,
+round-robin over the whole matrix so a slow spell on the host spoils one
+sample per cell rather than all of them, and each sample runs for at least
+``--min-time`` seconds.  The median sample is the result.  The spread of the
+samples is stored with the baseline as each group's noise, and a group only
+fails once it is slower than both the tolerance and that noise allow.
+
+Compare against benchmarks/baseline.json (exit status 1 on regression):
+
+    python -m benchmarks.relay_bench
+
+Record a new baseline after an intended change, on the machine that checks it:
+
+    python -m benchmarks.relay_bench --save
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")  # main builds a real client at import
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi import WebSocketDisconnect
+from google.genai import types
+
+import main
+import test_server3
+from audio.framing import FRAME_MIC, encode_frame
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+FRAME_SIZES = [256, 1024, 4096, 16384]
+SESSION_COUNTS = [1, 10, 100, 500]
+FRAMES_PER_RUN = 4000       # split across the concurrent sessions
+MIN_FRAMES_PER_SESSION = 8
+MIN_SAMPLE_S = 0.05
+NOISE_SIGMAS = 2.0          # a group may drift this many of its (combined) noise sigmas
+
+
+class _Stop(Exception):
+    pass
+
+
+class ReplayWebSocket:
+    """Serves pre-built frames to ``receive_bytes`` and counts ``send_bytes``"""
+
+    def __init__(self, frames: List[bytes], stop_after_sends: int = 0):
+        self._frames = iter(frames)
+        self.stop_after_sends = stop_after_sends
+        self.sent = 0
+
+    async def receive_bytes(self) -> bytes:
+        await asyncio.sleep(0)      # a real socket read yields to other sessions
+        try:
+            return next(self._frames)
+        except StopIteration:
+            raise WebSocketDisconnect(1000)
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(0)
+        self.sent += 1
+        if self.sent == self.stop_after_sends:
+            raise _Stop()
+
+
+class ScriptedLiveSession:
+    """Replays the same model turn ``turns`` times, then ends the loop"""
+
+    def __init__(self, loop: "main.AudioLoop", turn: List[types.LiveServerMessage], turns: int):
+        self.loop = loop
+        self.turn = turn
+        self.remaining = turns
+
+    async def receive(self):
+        if self.remaining == 0:
+            self.loop.active = False
+            return
+        self.remaining -= 1
+        for message in self.turn:
+            await asyncio.sleep(0)
+            yield message
+
+
+def pcm(size: int) -> bytes:
+    rng = np.random.default_rng(size)
+    return (rng.standard_normal(size // 2) * 3000).astype("<i2").tobytes()
+
+
+def new_loop() -> "main.AudioLoop":
+    loop = main.AudioLoop()
+    loop.out_queue = asyncio.Queue()     # unbounded: measure the producer side only
+    return loop
+
+
+def bench_read_ws_chunk(size: int, per_session: int):
+    frame = encode_frame(FRAME_MIC, pcm(size))
+    loop = new_loop()
+    loop.set_websocket(ReplayWebSocket([frame] * per_session))
+
+    async def job():
+        for _ in range(per_session):
+            await loop._read_ws_chunk()
+    return job, per_session
+
+
+def bench_listen_audio(size: int, per_session: int):
+    frame = encode_frame(FRAME_MIC, pcm(size))
+    loop = new_loop()
+    loop.vad = None     # measure the full forward path; how much the VAD gates depends on the audio
+    loop.set_websocket(ReplayWebSocket([frame] * per_session))
+
+    async def job():
+        try:
+            await loop.listen_audio()
+        except WebSocketDisconnect:
+            pass
+    return job, per_session
+
+
+def bench_play_audio(size: int, per_session: int):
+    data = pcm(size)
+    loop = new_loop()
+    loop.audio_in_queue.max_bytes = 1 << 40     # keep eviction out of the measurement
+    frame_bytes = loop.audio_in_queue.frame_bytes
+    # play_audio sends fixed-size jitter-buffer frames; stop once every input byte went out
+    sends = -(-size * per_session // frame_bytes)
+    loop.set_websocket(ReplayWebSocket([], stop_after_sends=sends))
+
+    async def feed():
+        for _ in range(per_session):
+            loop.audio_in_queue.put_nowait(data)
+            await asyncio.sleep(0)
+        loop.audio_in_queue.flush()
+
+    async def job():
+        feeder = asyncio.create_task(feed())
+        try:
+            await loop.play_audio()
+        except _Stop:
+            pass
+        await feeder
+    return job, per_session
+
+
+def bench_receive_transcript(size: int, per_session: int):
+    chunk = pcm(size)
+    loop = new_loop()
+    loop.audio_in_queue.max_bytes = 1 << 40     # keep eviction out of the measurement
+    turn = [
+        types.LiveServerMessage(server_content=types.LiveServerContent(
+            model_turn=types.Content(role="model", parts=[
+                types.Part(inline_data=types.Blob(data=chunk, mime_type="audio/pcm;rate=24000")),
+            ]),
+            output_transcription=types.Transcription(text=f"word{i} "),
+            input_transcription=types.Transcription(text=f"heard{i} ") if i % 4 == 0 else None,
+        ))
+        for i in range(10)
+    ] + [types.LiveServerMessage(server_content=types.LiveServerContent(turn_complete=True))]
+    turns = max(1, per_session // len(turn))
+    loop.session = ScriptedLiveSession(loop, turn, turns=turns)
+
+    async def job():
+        await loop.receive_from_gemini()
+    return job, turns * len(turn)
+
+
+def bench_chunk_analysis(size: int, per_session: int):
+    data = memoryview(pcm(size))
+    handler = test_server3.AudioTestHandler()
+
+    async def job():
+        for _ in range(per_session):
+            levels = handler.levels.update(data)
+            handler._log_chunk_details(FRAME_MIC, data, levels)
+            await asyncio.sleep(0)
+    return job, per_session
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "read_ws_chunk": bench_read_ws_chunk,
+    "listen_audio": bench_listen_audio,
+    "play_audio": bench_play_audio,
+    "receive_transcript": bench_receive_transcript,
+    "chunk_analysis": bench_chunk_analysis,
+}
+
+
+def measure(name: str, size: int, sessions: int, min_time_s: float = MIN_SAMPLE_S) -> float:
+    """One sample: cost per frame in microseconds over as many runs as fill ``min_time_s``"""
+    per_session = max(MIN_FRAMES_PER_SESSION, FRAMES_PER_RUN // sessions)
+    factory = BENCHMARKS[name]
+
+    async def run():
+        jobs = [factory(size, per_session) for _ in range(sessions)]
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter_ns()
+            await asyncio.gather(*(job() for job, _ in jobs))
+            elapsed = time.perf_counter_ns() - started
+        finally:
+            gc.enable()
+        return elapsed, sum(frames for _, frames in jobs)
+
+    elapsed = frames = 0
+    while elapsed < min_time_s * 1e9:
+        run_ns, run_frames = asyncio.run(run())
+        elapsed += run_ns
+        frames += run_frames
+    return elapsed / frames / 1000
+
+
+def sample(cells: List[Tuple[str, int, int]], repeats: int, min_time_s: float) -> Dict[str, List[float]]:
+    """``repeats`` samples of every (benchmark, size, sessions) cell, taken round-robin"""
+    samples: Dict[str, List[float]] = {cell_key(*cell): [] for cell in cells}
+    for _ in range(repeats):
+        for cell in cells:
+            samples[cell_key(*cell)].append(measure(*cell, min_time_s=min_time_s))
+    return samples
+
+
+def cell_key(name: str, size: int, sessions: int) -> str:
+    return f"{name}[{size}B x{sessions}]"
+
+
+def group_of(key: str) -> str:
+    """"listen_audio[1024B x10]" -> "listen_audio[1024B]" """
+    return key.split(" x")[0] + "]"
+
+
+def spread(samples: Dict[str, List[float]]) -> Dict[str, float]:
+    """
+    Per group, the noise of one sample: robust standard deviation of the log
+    sample times (1.4826 x median absolute deviation), pooled over its cells
+    """
+    variances: Dict[str, List[float]] = {}
+    for key, values in samples.items():
+        logs = np.log(values)
+        sigma = 1.4826 * np.median(np.abs(logs - np.median(logs)))
+        variances.setdefault(group_of(key), []).append(sigma * sigma)
+    return {group: round(float(np.sqrt(np.mean(values))), 4) for group, values in variances.items()}
+
+
+def machine() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+    }
+
+
+def compare(results: Dict[str, float], baseline: Dict, tolerance: float,
+            noise: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Print each result against its baseline and return the regressed groups
+
+    Single cells are too noisy to gate on, so the check is per benchmark and
+    frame size: the geometric mean of the ratios over all session counts.
+    A group may be slower by ``tolerance`` or by ``NOISE_SIGMAS`` of the
+    noise both runs saw in it (baseline ``spread`` and ``noise``), whichever
+    is larger.
+
+    Args:
+        results (Dict[str, float]): Keys like "listen_audio[1024B x10]" -> us per frame
+        baseline (Dict): Parsed baseline.json
+        tolerance (float): Allowed slowdown, 0.2 = 20%
+        noise (Optional[Dict[str, float]]): This run's spread per group, see ``spread``
+
+    Returns:
+        List[str]: Groups ("listen_audio[1024B]") slower than the baseline beyond their allowance
+    """
+    if baseline.get("machine") != machine():
+        print("note: baseline was recorded on a different machine/runtime:", baseline.get("machine"))
+    ratios: Dict[str, List[float]] = {}
+    for key, us in results.items():
+        ref = baseline["results"].get(key)
+        if ref is None:
+            print(f"{key:<40} {us:10.2f} us   (no baseline)")
+            continue
+        ratio = us / ref
+        print(f"{key:<40} {us:10.2f} us   baseline {ref:10.2f} us   x{ratio:5.2f}")
+        ratios.setdefault(group_of(key), []).append(ratio)
+
+    regressions = []
+    for group, values in ratios.items():
+        geomean = float(np.exp(np.mean(np.log(values))))
+        sigma = np.hypot(baseline.get("spread", {}).get(group, 0.0), (noise or {}).get(group, 0.0))
+        allowed = max(tolerance, float(np.expm1(NOISE_SIGMAS * sigma)))
+        if geomean > 1 + allowed:
+            regressions.append(group)
+            print(f"REGRESSION {group}: x{geomean:.2f} (allowed x{1 + allowed:.2f})")
+        elif geomean < 1 - tolerance:
+            print(f"improved   {group}: x{geomean:.2f}")
+    return regressions
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--sizes", nargs="*", type=int, default=FRAME_SIZES, help="frame sizes in bytes")
+    parser.add_argument("--sessions", nargs="*", type=int, default=SESSION_COUNTS)
+    parser.add_argument("--repeats", type=int, default=5, help="samples per cell, the median counts")
+    parser.add_argument("--min-time", type=float, default=MIN_SAMPLE_S, help="seconds each sample runs at least")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before failing, raised to the measured noise where that is larger")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    # Analysis only runs for sampled chunks at DEBUG; force it on, but discard the records
+    logging.getLogger("relay").handlers[:] = [logging.NullHandler()]
+    test_server3.logger.setLevel(logging.DEBUG)
+
+    cells = [(name, size, sessions)
+             for name in args.only or BENCHMARKS for size in args.sizes for sessions in args.sessions]
+    samples = sample(cells, args.repeats, args.min_time)
+    results = {key: round(float(np.median(values)), 3) for key, values in samples.items()}
+    noise = spread(samples)
+
+    if args.save:
+        for key, us in results.items():
+            print(f"{key:<40} {us:10.2f} us")
+        # Merge, so re-recording a subset (--only/--sizes/--sessions) keeps the other entries
+        saved = {"results": {}, "spread": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved.update(json.load(f))
+        saved["results"].update(results)
+        saved.setdefault("spread", {}).update(noise)
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": machine(), "results": saved["results"], "spread": saved["spread"]}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save first")
+        return 1
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, noise)
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -2,10 +2,11 @@ import os
 import asyncio
 import base64
 import io
-import traceback
 import time
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-import asyncio, struct
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
 
 
 import pyaudio
@@ -13,14 +14,124 @@ import pyaudio
 from google import genai
 from google.genai import types
 
-app = FastAPI()
+from audio.analysis import LevelMonitor
+from audio.codec import PcmCodec, negotiate
+from audio.framing import (
+    CONTROL_INTERRUPT, FRAME_CONTROL, FRAME_MIC, FRAME_SPEAKER, FRAME_TEXT, FrameWriter, parse_frame,
+)
+from audio.jitter_buffer import JitterBuffer
+from audio.resampler import StreamingResampler
+from audio.vad import VoiceActivityDetector
+from services import metrics
+from services.live_pool import LiveSessionPool
+from services.context_window import ContextTracker, check_budget, estimate_tokens
+from services.live_resume import UplinkReplayBuffer, UpstreamLost
+from services.recorder import SessionRecorder
+from services.logging_utils import RateCounter, SessionLogger, get_logger
+from services.session_manager import SessionManager, SessionRejected
+from services.transcript_store import TranscriptStore, TurnBuffer
+from services.turn_trace import TurnTracer
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if CONTEXT_COMPRESSION != "off":
+        check_budget(estimate_tokens(prompt), CONTEXT_TRIGGER_TOKENS, CONTEXT_TARGET_TOKENS)
+    live_pool.start()
+    yield
+    await live_pool.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+logger = get_logger("main")
 FORMAT = pyaudio.paInt16
-SEND_SR = 48_000
+SEND_SR = 48_000        # browser mic rate
+GEMINI_SEND_SR = 16_000 # what the Live API actually consumes
 RECV_SR = 24_000
 CHUNK = 1024   
 
+# Downlink playout buffer (see audio/jitter_buffer.py)
+PLAYOUT_FRAME_MS = 40
+PLAYOUT_TARGET_MS = 120
+PLAYOUT_MAX_MS = 5000
+
+# Send v1 frame headers (seq / timestamp / rate) on the downlink instead of the 1-byte flag
+VERSIONED_FRAMES = False
+
+# Local voice-activity gating of the uplink (see audio/vad.py):
+#   off    - forward every mic frame
+#   gate   - forward speech plus pre-roll/hangover only; close each segment with audio_stream_end
+#            so Gemini's own VAD ends the turn without waiting for more silence
+#   manual - as gate, but Gemini's automatic detection is disabled and segments are bracketed
+#            with explicit activity_start / activity_end
+UPLINK_VAD = os.getenv("UPLINK_VAD", "gate")
+# Gemini ends a turn after this much silence; the gate's hangover must not be shorter, or
+# audio_stream_end would cut off candidates who merely pause to think
+SILENCE_DURATION_MS = 1000
+VAD_HANGOVER_MS = float(os.getenv("VAD_HANGOVER_MS", str(SILENCE_DURATION_MS)))
+VAD_PREROLL_MS = float(os.getenv("VAD_PREROLL_MS", "300"))
+
+# Barge-in: when the candidate talks over the AI, drop queued AI audio and send the client a
+# 0x04 interrupt control frame so it discards what it has buffered too (see audio/framing.py)
+#   off    - play every answer out in full
+#   server - react to Gemini's server_content.interrupted
+#   vad    - also react to local VAD speech onset (needs UPLINK_VAD != off); faster, but relies
+#            on the client's echo cancellation so the AI's own voice does not cut it off
+BARGE_IN = os.getenv("BARGE_IN", "server")
+
+# Opus transport, negotiated per connection with /ws/audio?codec=opus (see audio/codec.py)
+OPUS_BITRATE = int(os.getenv("OPUS_BITRATE", "24000"))
+OPUS_COMPLEXITY = int(os.getenv("OPUS_COMPLEXITY", "5"))
+
+# Debug only: read typed turns from this process's stdin (blocks an executor thread per session)
+CONSOLE_INPUT = os.getenv("CONSOLE_INPUT", "0") == "1"
+
+# Append-only JSONL transcripts, one file per session (see services/transcript_store.py)
+TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "transcripts")
+
+# Session recordings, mic and AI tracks as WAV files streamed to disk (see services/recorder.py);
+# empty disables recording.  Files rotate every RECORD_ROTATE_S of audio.
+RECORD_DIR = os.getenv("RECORD_DIR", "")
+RECORD_ROTATE_S = float(os.getenv("RECORD_ROTATE_S", "900"))
+
+# Concurrency governor for upstream live sessions (see services/session_manager.py)
+MAX_LIVE_SESSIONS = int(os.getenv("MAX_LIVE_SESSIONS", "20"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "50"))
+ADMISSION_TIMEOUT_S = float(os.getenv("ADMISSION_TIMEOUT_S", "120"))
+
+# Pre-warmed, prompt-primed live sessions (see services/live_pool.py); 0 disables the pool.
+# Idle pooled sessions hold upstream quota too, so keep this small relative to MAX_LIVE_SESSIONS.
+LIVE_POOL_SIZE = int(os.getenv("LIVE_POOL_SIZE", "0"))
+LIVE_POOL_MAX_IDLE_S = float(os.getenv("LIVE_POOL_MAX_IDLE_S", "300"))
+
+# Resume the live session with its latest handle when the upstream connection drops or Gemini
+# sends go_away, keeping the browser socket open; uplink sent since the handle is replayed
+# (see services/live_resume.py)
+SESSION_RESUMPTION = os.getenv("SESSION_RESUMPTION", "1") == "1"
+RECONNECT_ATTEMPTS = int(os.getenv("RECONNECT_ATTEMPTS", "5"))
+RECONNECT_BACKOFF_S = float(os.getenv("RECONNECT_BACKOFF_S", "0.5"))
+REPLAY_BUFFER_MS = float(os.getenv("REPLAY_BUFFER_MS", "10000"))
+
+# Keeping the live session's context bounded over long interviews (see services/context_window.py):
+#   off     - let the context grow for the whole interview
+#   sliding - Gemini drops the oldest turns itself once the context passes CONTEXT_TRIGGER_TOKENS,
+#             down to CONTEXT_TARGET_TOKENS; the prompt also goes in system_instruction so it stays
+#   reseed  - at the first turn boundary past the trigger, move to a fresh session primed with the
+#             condensed transcript (at most CONTEXT_TARGET_TOKENS)
+# Prompt tokens plus CONTEXT_TARGET_TOKENS must stay below the trigger; checked at startup.
+CONTEXT_COMPRESSION = os.getenv("CONTEXT_COMPRESSION", "sliding")
+CONTEXT_TRIGGER_TOKENS = int(os.getenv("CONTEXT_TRIGGER_TOKENS", "32000"))
+CONTEXT_TARGET_TOKENS = int(os.getenv("CONTEXT_TARGET_TOKENS", "8000"))
+
 MODEL = "models/gemini-2.0-flash-live-001"
 
+prompt = """ 
+You are an ai interviewer and you are interviewing a candidate for a software engineering position.
+You will ask the candidate questions and wait for their response.
+you will then ask follow-up questions based on their response.
+You will not ask the candidate to write code, but you will ask them to explain their thought process and how they would approach a problem.
+"""
+
 client = genai.Client(
     http_options={"api_version": "v1beta"},
     api_key="",
@@ -36,16 +147,22 @@ CONFIG = types.LiveConnectConfig(
     ),
     realtime_input_config=types.RealtimeInputConfig(
         automatic_activity_detection=types.AutomaticActivityDetection(
-            disabled=False,
+            disabled=UPLINK_VAD == "manual",
             start_of_speech_sensitivity=types.StartSensitivity.START_SENSITIVITY_HIGH,
             end_of_speech_sensitivity=types.EndSensitivity.END_SENSITIVITY_LOW,
             prefix_padding_ms=100,
-            silence_duration_ms=1000,
+            silence_duration_ms=SILENCE_DURATION_MS,
         )
     ),
     # Comment out input transcription for now
     input_audio_transcription=types.AudioTranscriptionConfig(),
     output_audio_transcription=types.AudioTranscriptionConfig(),
+    session_resumption=types.SessionResumptionConfig() if SESSION_RESUMPTION else None,
+    context_window_compression=types.ContextWindowCompressionConfig(
+        trigger_tokens=CONTEXT_TRIGGER_TOKENS,
+        sliding_window=types.SlidingWindow(target_tokens=CONTEXT_TARGET_TOKENS),
+    ) if CONTEXT_COMPRESSION == "sliding" else None,
+    system_instruction=prompt if CONTEXT_COMPRESSION == "sliding" else None,
     generation_config=types.GenerationConfig(
         temperature=0.7,
         top_p=0.95,
@@ -55,21 +172,101 @@ CONFIG = types.LiveConnectConfig(
 
 pya = pyaudio.PyAudio()
 
-prompt = """ 
-You are an ai interviewer and you are interviewing a candidate for a software engineering position.
-You will ask the candidate questions and wait for their response.
-you will then ask follow-up questions based on their response.
-You will not ask the candidate to write code, but you will ask them to explain their thought process and how they would approach a problem.
-"""
+# Bound once so the per-frame cost is a float add
+BYTES_CLIENT_IN = metrics.RELAY_BYTES.labels(direction="client_in")
+BYTES_GEMINI_OUT = metrics.RELAY_BYTES.labels(direction="gemini_out")
+BYTES_GEMINI_IN = metrics.RELAY_BYTES.labels(direction="gemini_in")
+BYTES_CLIENT_OUT = metrics.RELAY_BYTES.labels(direction="client_out")
+FRAMES_CLIENT_IN = metrics.RELAY_FRAMES.labels(direction="client_in")
+FRAMES_GEMINI_OUT = metrics.RELAY_FRAMES.labels(direction="gemini_out")
+FRAMES_GEMINI_IN = metrics.RELAY_FRAMES.labels(direction="gemini_in")
+FRAMES_CLIENT_OUT = metrics.RELAY_FRAMES.labels(direction="client_out")
+MIC_LEVEL = metrics.MIC_LEVEL.labels()
+MIC_CLIPPED = metrics.MIC_CLIPPED_SAMPLES.labels()
+VAD_DROPPED = metrics.VAD_DROPPED_BYTES.labels()
+VAD_SEGMENTS = metrics.VAD_SEGMENTS.labels()
+BARGE_IN_DROPPED = metrics.BARGE_IN_DROPPED_FRAMES.labels()
+GEMINI_SEND_BYTES_PER_S = GEMINI_SEND_SR * 2
+RECV_BYTES_PER_S = RECV_SR * 2
+
+# out_queue items are send_realtime_input kwargs, or {"turn": text} for a typed candidate turn;
+# these mark speech segment boundaries
+ACTIVITY_START = {"activity_start": types.ActivityStart()}
+ACTIVITY_END = {"activity_end": types.ActivityEnd()}
+AUDIO_STREAM_END = {"audio_stream_end": True}
+
+sessions = SessionManager(
+    MAX_LIVE_SESSIONS,
+    max_queue=ADMISSION_QUEUE_SIZE,
+    queue_timeout=ADMISSION_TIMEOUT_S,
+)
+
+
+async def prime_session(session, context=None):
+    """Send the interviewer prompt as the first turn; with context, pick the interview up silently"""
+    if context is None:
+        await session.send(input=f"{prompt}", end_of_turn=True)
+    else:
+        await session.send(input=f"{prompt}\n{context}", end_of_turn=False)
+
+
+live_pool = LiveSessionPool(
+    lambda: client.aio.live.connect(model=MODEL, config=CONFIG),
+    size=LIVE_POOL_SIZE,
+    prime=prime_session,
+    max_idle_s=LIVE_POOL_MAX_IDLE_S,
+)
+
+metrics.LIVE_POOL_IDLE.set_function(lambda: live_pool.idle_count)
+metrics.ACTIVE_SESSIONS.set_function(lambda: sessions.active_count)
+metrics.QUEUED_SESSIONS.set_function(lambda: sessions.queued_count)
+metrics.QUEUE_DEPTH.labels(queue="out_queue").set_function(
+    lambda: sum(info.loop.out_queue.qsize() for info in sessions.sessions() if info.loop)
+)
+metrics.QUEUE_DEPTH.labels(queue="audio_in_queue").set_function(
+    lambda: sum(info.loop.audio_in_queue.qsize() for info in sessions.sessions() if info.loop)
+)
 
 class AudioLoop:
-    def __init__(self):
-        self.audio_in_queue = asyncio.Queue()
+    def __init__(self, session_id=None, codec=None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.codec = codec or PcmCodec()
+        self.log = SessionLogger(logger, self.session_id)
+        self.counters = RateCounter(logger, f"session {self.session_id[:8]}")
+        self.audio_in_queue = JitterBuffer(
+            RECV_SR,
+            frame_ms=PLAYOUT_FRAME_MS,
+            target_ms=PLAYOUT_TARGET_MS,
+            max_ms=PLAYOUT_MAX_MS,
+        )
         self.out_queue = asyncio.Queue(maxsize=20)  # Match your WebSocket handler
         self.session = None
         self.active = True
-        self.last_audio_time = time.time()
-        self.conversation = []
+        self.transcript = TranscriptStore(TRANSCRIPT_DIR, self.session_id)
+        self.recorder = None
+        if RECORD_DIR:
+            self.recorder = SessionRecorder(RECORD_DIR, self.session_id, {"mic": SEND_SR, "speaker": RECV_SR},
+                                            rotate_s=RECORD_ROTATE_S)
+        self.resampler = StreamingResampler(SEND_SR, GEMINI_SEND_SR)
+        self.tracer = TurnTracer()
+        self.mic_levels = LevelMonitor()
+        self.vad = None
+        if UPLINK_VAD != "off":
+            self.vad = VoiceActivityDetector(SEND_SR, hangover_ms=VAD_HANGOVER_MS, preroll_ms=VAD_PREROLL_MS)
+        self.frame_writer = FrameWriter(FRAME_SPEAKER, sample_rate=RECV_SR, versioned=VERSIONED_FRAMES)
+        self.control_writer = FrameWriter(FRAME_CONTROL, sample_rate=RECV_SR, versioned=VERSIONED_FRAMES, capacity=16)
+        self.model_turn_active = False      # Gemini is mid-answer (audio received, turn not complete)
+        self.discard_model_audio = False    # rest of the current answer was interrupted locally
+        self.replay = None
+        if SESSION_RESUMPTION:
+            self.replay = UplinkReplayBuffer(int(REPLAY_BUFFER_MS * GEMINI_SEND_SR * 2 / 1000))
+        self.resume_handle = None
+        self.dropped_at = None              # when the upstream connection was lost, while reconnecting
+        self.unhealthy_drops = 0            # drops since the upstream last sent a resumption handle
+        self.reconnects = 0
+        self.context = ContextTracker(estimate_tokens(prompt), CONTEXT_TRIGGER_TOKENS, CONTEXT_TARGET_TOKENS)
+        self.seed = None                    # condensed history the current session was primed with
+        self.reseed_due = False
     
     def set_websocket(self, ws):
         
@@ -78,32 +275,98 @@ class AudioLoop:
     def add_label(self, label, text):
         return f"{label}: {text}"
 
+    @property
+    def conversation(self):
+        """Recent turns as labelled lines; the full history lives in the transcript file"""
+        return self.transcript.lines()
+
     async def send_text(self):
+        """Console debug input; production text arrives as FRAME_TEXT frames"""
         while self.active:
             text = await asyncio.to_thread(input, "message > ")
             if text.lower() == "q":
                 self.active = False
                 break
-            await self.session.send(input=text or ".", end_of_turn=True)
+            await self.out_queue.put({"turn": text or "."})
 
     async def listen_audio(self):          # REPLACE the PyAudio mic reader
         while self.active:
             flag, pcm = await self._read_ws_chunk()
-            if flag == 0x01:               # mic-side chunk
-                await self.out_queue.put({"data": pcm, "mime_type": "audio/pcm"})
-                # print(f"Received {len(pcm)} bytes of audio data from mic")
+            if flag == FRAME_MIC:          # mic-side chunk
+                BYTES_CLIENT_IN.inc(len(pcm))
+                FRAMES_CLIENT_IN.inc()
+                try:
+                    pcm = self.codec.decode(pcm)
+                except ValueError as e:
+                    self.counters.add("undecodable_frames")
+                    self.log.debug("%s", e)
+                    continue
+                if self.recorder is not None:
+                    self.recorder.write("mic", pcm)
+                levels = self.mic_levels.update(pcm)
+                if levels.samples:
+                    MIC_LEVEL.observe(levels.rms_dbfs)
+                    if levels.clipped:
+                        MIC_CLIPPED.inc(levels.clipped)
+                if self.vad is None:
+                    await self._forward_mic(pcm)
+                else:
+                    await self._gate_mic(pcm, levels)
+            elif flag == FRAME_TEXT:       # typed candidate message
+                text = str(pcm, "utf-8", errors="replace").strip()
+                await self.out_queue.put({"turn": text or "."})
                 
 
+    async def _forward_mic(self, pcm):
+        pcm = self.resampler.process(pcm)
+        if pcm:
+            await self.out_queue.put({"data": pcm, "mime_type": self.resampler.mime_type})
+
+    async def _gate_mic(self, pcm, levels):
+        """Forward only what the VAD passes, bracketed by segment markers"""
+        dropped = self.vad.bytes_dropped
+        decision = self.vad.process(pcm, levels)
+        if self.vad.bytes_dropped != dropped:
+            VAD_DROPPED.inc(self.vad.bytes_dropped - dropped)
+        if decision.started:
+            VAD_SEGMENTS.inc()
+            self.resampler.reset()      # the gap is not continuous audio
+            if BARGE_IN == "vad" and (self.model_turn_active or self.audio_in_queue.depth_ms > 0):
+                # Gemini would stop this answer too once it hears the candidate; the rest is moot
+                self.discard_model_audio = self.model_turn_active
+                await self.interrupt_playout("vad")
+            if UPLINK_VAD == "manual":
+                await self.out_queue.put(ACTIVITY_START)
+        for frame in decision.frames:
+            await self._forward_mic(frame)
+        if decision.ended:
+            await self.out_queue.put(ACTIVITY_END if UPLINK_VAD == "manual" else AUDIO_STREAM_END)
+
     async def send_audio_to_gemini(self):
         """Match your WebSocket handler's method name and logic"""
         try:
             while self.active:
                 msg = await self.out_queue.get()
-                # print(f"Sending {len(msg['data'])} bytes of audio data to Gemini")
-                await self.session.send_realtime_input(audio=msg)
+                await self._send_upstream(msg)
         except Exception as e:
-            print(f"Error in send_audio_to_gemini: {e}")
-            traceback.print_exc()
+            self.log.exception("Error in send_audio_to_gemini: %s", e)
+
+    async def _send_upstream(self, msg, replayed=False):
+        if self.replay is not None:
+            self.replay.record(msg)     # before sending: a send that fails is replayed too
+        if "turn" in msg:
+            await self.session.send(input=msg["turn"], end_of_turn=True)
+            return
+        if "data" not in msg:
+            await self.session.send_realtime_input(**msg)
+            return
+        if not replayed:
+            # Counted once, on the first attempt; a replay (even of a send that failed) is not new audio
+            self.context.add_audio(len(msg["data"]) / GEMINI_SEND_BYTES_PER_S)
+            BYTES_GEMINI_OUT.inc(len(msg["data"]))
+            FRAMES_GEMINI_OUT.inc()
+        await self.session.send_realtime_input(audio=msg)
+        self.tracer.uplink_sent()
 
     async def receive_from_gemini(self):
         """Match your WebSocket handler's method name and logic"""
@@ -112,110 +375,348 @@ class AudioLoop:
                 turn = self.session.receive()
 
                 # Buffer for each label
-                ai_text = ""
-                candidate_text = ""
+                ai_text = TurnBuffer()
+                candidate_text = TurnBuffer()
 
                 async for response in turn:
+                    self.tracer.message()
+                    content = response.server_content
+
+                    if response.usage_metadata:
+                        self.context.observe_usage(response.usage_metadata.total_token_count)
+                    if update := response.session_resumption_update:
+                        self._on_resumption_update(update)
+                    if response.go_away is not None:
+                        # The server will close this connection soon; resume on a fresh one now
+                        self.log.info("Gemini go_away (time left %s)", response.go_away.time_left)
+                        return
+
+                    if content and content.interrupted and BARGE_IN != "off" and not self.discard_model_audio:
+                        self.discard_model_audio = True
+                        await self.interrupt_playout("server")
+
                     # Handle audio data
-                    if data := response.data:
-                        print(f"Received audio data from Gemini: {len(data)} bytes")
+                    if (data := response.data) and not self.discard_model_audio:
+                        self.model_turn_active = True
+                        self.tracer.model_audio()
+                        self.counters.add("gemini_audio_bytes", len(data))
+                        BYTES_GEMINI_IN.inc(len(data))
+                        FRAMES_GEMINI_IN.inc()
+                        self.context.add_audio(len(data) / RECV_BYTES_PER_S)
+                        dropped = self.audio_in_queue.dropped_frames
                         self.audio_in_queue.put_nowait(data)
+                        if self.audio_in_queue.dropped_frames != dropped:
+                            metrics.DROPPED_FRAMES.inc(self.audio_in_queue.dropped_frames - dropped)
 
-                    # Handle transcriptions
-                    if response.server_content.output_transcription:
-                        chunk = response.server_content.output_transcription.text or ""
-                        ai_text += chunk
-                        print("AI Transcript:", chunk)
+                    if content is None:
+                        continue
 
-                    if response.server_content.input_transcription:
-                        chunk = response.server_content.input_transcription.text or ""
-                        candidate_text += chunk
-                        print("User Transcript:", chunk)
+                    # Handle transcriptions
+                    if content.output_transcription:
+                        chunk = content.output_transcription.text or ""
+                        ai_text.append(chunk)
+                        self.log.debug("AI transcript fragment: %r", chunk)
+
+                    if content.input_transcription:
+                        chunk = content.input_transcription.text or ""
+                        candidate_text.append(chunk)
+                        self.log.debug("User transcript fragment: %r", chunk)
+                        self.tracer.input_transcription()
+
+                # Release the tail of the AI's answer instead of waiting for a full frame
+                self.audio_in_queue.flush()
+                self.tracer.end_turn()
+                self.model_turn_active = False
+                self.discard_model_audio = False
 
                 # Append only once per speaker at the end of the turn
-                if candidate_text.strip():
-                    self.conversation.append(self.add_label("User", candidate_text.strip()))
-                    print("Appended User text to conversation")
-
-                if ai_text.strip():
-                    self.conversation.append(self.add_label("AI", ai_text.strip()))
-                    print("Appended AI text to conversation")
+                self.transcript.add_turn("User", candidate_text.text(), candidate_text.started_at)
+                self.transcript.add_turn("AI", ai_text.text(), ai_text.started_at)
+                self.context.add_turn("User", candidate_text.text())
+                self.context.add_turn("AI", ai_text.text())
 
-                print("conversation:", self.conversation)
-                print("Turn complete")
+                self.log.debug("Turn complete (%d entries)", self.transcript.turn_count)
+                if self._context_full():
+                    return      # relay_upstream moves to a reseeded session
 
         except Exception as e:
-            print(f"Error in receive_from_gemini: {e}")
-            traceback.print_exc()
+            self.log.exception("Error in receive_from_gemini: %s", e)
+
+    def _context_full(self):
+        """Check the context size at a turn boundary; True when a reseed should happen now"""
+        metrics.CONTEXT_TOKENS.observe(self.context.tokens)
+        if CONTEXT_COMPRESSION == "off" or not self.context.over_trigger:
+            return False
+        if CONTEXT_COMPRESSION == "sliding":
+            # Gemini slides the window itself past the trigger; mirror that in the estimate
+            self.log.info("Context past %d tokens; Gemini compresses it", self.context.trigger_tokens)
+            self.context.compressed(self.context.target_tokens)
+            self.tracer.context = "compressed"
+            metrics.CONTEXT_COMPRESSIONS.labels(mode="sliding").inc()
+            return False
+        self.reseed_due = True
+        if self.replay is not None:
+            self.replay.clear()     # from here on the uplink belongs to the reseeded session
+        return True
+
+    def _on_resumption_update(self, update):
+        if update.resumable and update.new_handle:
+            self.resume_handle = update.new_handle
+            self.unhealthy_drops = 0
+            if self.replay is not None:
+                self.replay.ack()
 
     async def play_audio(self):            # REPLACE the PyAudio speaker writer
         while self.active:
             pcm = await self.audio_in_queue.get()
-            msg = struct.pack("B", 0x02) + pcm
-            print(type(msg))
+            if self.recorder is not None:
+                self.recorder.write("speaker", pcm)
+            payload = self.codec.encode(pcm)
+            # The writer reuses its buffer, and the transport may hold the frame past the next build
+            msg = bytes(self.frame_writer.build(payload))
+            self.counters.add("frames_to_client")
             await self.ws.send_bytes(msg)
+            self.tracer.playout()
+            BYTES_CLIENT_OUT.inc(len(payload))
+            FRAMES_CLIENT_OUT.inc()
             
+    async def interrupt_playout(self, source):
+        """Barge-in: drop the AI audio queued here and tell the client to drop its own"""
+        depth_ms = self.audio_in_queue.depth_ms
+        dropped = self.audio_in_queue.clear()
+        BARGE_IN_DROPPED.inc(dropped)
+        metrics.BARGE_INS.labels(source=source).inc()
+        # copy: the frame may still be queued in the socket when the next interrupt builds
+        await self.ws.send_bytes(bytes(self.control_writer.build(bytes((CONTROL_INTERRUPT,)))))
+        self.log.info("Barge-in (%s): dropped %d frames / %.0f ms of AI audio", source, dropped, depth_ms)
+
     # helper – read one framed message
     async def _read_ws_chunk(self):
         data = await self.ws.receive_bytes()
-        return data[0], data[1:]
-
-    async def monitor_silence(self):
-        """Add the silence monitoring from your WebSocket handler"""
+        frame = parse_frame(data)
+        return frame.kind, frame.payload
+
+    @asynccontextmanager
+    async def open_session(self):
+        """Take a pre-warmed session from the pool, else connect and send the prompt now"""
+        pooled = await live_pool.acquire() if self.seed is None else None
+        if pooled is not None:
+            self.log.info("Using pre-warmed live session (idle %.1fs)", pooled.age)
+            async with pooled as session:
+                yield session
+            return
+
+        async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
+            # Send initial prompt like your WebSocket handler
+            self.log.info("Sending initial prompt to Gemini")
+            await prime_session(session, self.seed)
+            self.log.debug("Initial prompt sent")
+            yield session
+
+    @asynccontextmanager
+    async def resume_session(self):
+        """Reconnect with the latest resumption handle, retrying with backoff"""
+        config = CONFIG.model_copy(update={"session_resumption": types.SessionResumptionConfig(handle=self.resume_handle)})
+        delay = RECONNECT_BACKOFF_S
+        for attempt in range(1, RECONNECT_ATTEMPTS + 1):
+            stack = AsyncExitStack()
+            try:
+                session = await stack.enter_async_context(client.aio.live.connect(model=MODEL, config=config))
+            except Exception as e:
+                self.log.warning("Resume attempt %d/%d failed: %s", attempt, RECONNECT_ATTEMPTS, e)
+                await asyncio.sleep(delay)
+                delay *= 2
+                continue
+            async with stack:
+                yield session
+            return
+        raise UpstreamLost(f"could not resume the live session after {RECONNECT_ATTEMPTS} attempts")
+
+    @asynccontextmanager
+    async def reseed_session(self):
+        """Move to a fresh session primed with the condensed interview so far"""
+        started = time.monotonic()
+        seed = self.context.seed_text()
+        async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
+            await prime_session(session, seed)
+            self.seed = seed
+            self.resume_handle = None       # the old handle would bring the full context back
+            self.session = session
+            count = 0
+            if self.replay is not None:
+                count, _ = await self._replay_uplink()
+            self.context.compressed(self.context.base_tokens + estimate_tokens(seed))
+            self.tracer.context = "compressed"
+            metrics.CONTEXT_COMPRESSIONS.labels(mode="reseed").inc()
+            self.log.info("Reseeded live session with %d tokens of context in %.0f ms (%d messages replayed)",
+                          self.context.tokens, (time.monotonic() - started) * 1000, count)
+            yield session
+
+    def _reopen_session(self):
+        """Session context to continue with after the upstream connection was lost"""
+        if not SESSION_RESUMPTION:
+            raise UpstreamLost("live session ended")
+        self.unhealthy_drops += 1
+        if self.unhealthy_drops > RECONNECT_ATTEMPTS:
+            raise UpstreamLost(f"live session dropped {self.unhealthy_drops - 1} times without recovering")
+        if self.resume_handle is None:
+            # Nothing to resume yet: start over, prompt included; old uplink would confuse it
+            self.log.warning("Live session lost before any resumption handle; starting a new one")
+            self.replay.clear()
+            return self.open_session()
+        return self.resume_session()
+
+    async def _pump_upstream(self):
+        """Relay to and from one live connection until either direction stops"""
+        tasks = [
+            asyncio.create_task(self.send_audio_to_gemini()),
+            asyncio.create_task(self.receive_from_gemini()),
+        ]
         try:
-            while self.active:
-                await asyncio.sleep(0.5)  # Check every 0.5 seconds
-                time_since_last_audio = time.time() - self.last_audio_time
-                if time_since_last_audio > 2.0:  # 2 seconds threshold
-                    print("Detected 2 seconds of silence. Signaling end of speech.")
-                    # This might help trigger transcription
-                    self.last_audio_time = time.time()  # Reset to prevent repeated signals
-        except Exception as e:
-            print(f"Error in monitor_silence: {e}")
-            traceback.print_exc()
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _replay_uplink(self):
+        """Send what the resumed session may not have received, ahead of anything newer"""
+        messages = self.replay.take()
+        replayed = sum(len(msg.get("data", b"")) for msg in messages)
+        for msg in messages:
+            await self._send_upstream(msg, replayed=True)
+        metrics.REPLAYED_BYTES.inc(replayed)
+        return len(messages), replayed
+
+    async def relay_upstream(self):
+        """Run the Gemini side of the session, resuming it whenever the connection drops"""
+        opener = self.open_session()
+        while self.active:
+            async with opener as session:
+                self.session = session
+                if self.dropped_at is not None:
+                    # The answer in flight when the connection dropped will not complete
+                    self.audio_in_queue.flush()
+                    self.model_turn_active = False
+                    self.discard_model_audio = False
+                    count, replayed = await self._replay_uplink()
+                    elapsed = time.monotonic() - self.dropped_at
+                    self.dropped_at = None
+                    self.reconnects += 1
+                    metrics.RECONNECTS.inc()
+                    metrics.RECONNECT_SECONDS.observe(elapsed)
+                    self.log.info("Live session reconnected in %.0f ms, replayed %d messages / %d bytes",
+                                  elapsed * 1000, count, replayed)
+                await self._pump_upstream()
+            if not self.active:
+                break
+            if self.reseed_due:
+                self.reseed_due = False
+                opener = self.reseed_session()
+                continue
+            self.dropped_at = time.monotonic()
+            self.log.warning("Live session connection lost; reconnecting")
+            opener = self._reopen_session()
 
     async def run(self):
         """Match your WebSocket handler structure"""
+        self.transcript.start()
+        if self.recorder is not None:
+            self.recorder.start()
         try:
-            async with client.aio.live.connect(model=MODEL, config=CONFIG) as session:
-                self.session = session
-                
-                # Send initial prompt like your WebSocket handler
-                print("Sending initial prompt to Gemini...")
-                await self.session.send(input=f"{prompt}", end_of_turn=True)
-                print("Initial prompt sent.")
-                
-                # Create tasks matching your WebSocket handler structure
-                async with asyncio.TaskGroup() as tg:
-                    tg.create_task(self.send_audio_to_gemini())
-                    tg.create_task(self.receive_from_gemini())
-                    tg.create_task(self.listen_audio())
-                    tg.create_task(self.play_audio())
+            # The browser side runs throughout; the Gemini side reconnects underneath it
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.relay_upstream())
+                tg.create_task(self.listen_audio())
+                tg.create_task(self.play_audio())
+                if CONSOLE_INPUT:
                     tg.create_task(self.send_text())
-                    # tg.create_task(self.monitor_silence())
 
         except asyncio.CancelledError:
-            print("Session cancelled")
+            self.log.info("Session cancelled")
         except Exception as e:
-            print(f"Error in AudioLoop: {e}")
-            traceback.print_exc()
+            self.log.exception("Error in AudioLoop: %s", e)
         finally:
             self.active = False
             if hasattr(self, 'audio_stream'):
                 self.audio_stream.close()
-            print("AudioLoop finished")
+            await self.transcript.aclose()
+            if self.recorder is not None:
+                await self.recorder.aclose()
+                self.log.info("Recording: %s", self.recorder.stats())
+            self.counters.emit()
+            self.log.debug("Turn trace: %s", self.tracer.dump())
+            self.log.info("Mic levels: %s", self.mic_levels.stats())
+            if self.vad is not None:
+                self.log.info("Uplink VAD: %s", self.vad.stats())
+            if self.reconnects:
+                self.log.info("Live session reconnects: %d", self.reconnects)
+            self.log.info("AudioLoop finished")
 
 
 
 @app.websocket("/ws/audio")
 async def audio_ws(ws: WebSocket):
     await ws.accept()
-    loop = AudioLoop()            # your class, unchanged except ↓
-    loop.set_websocket(ws)        # small helper you add
+
+    queued = False
+
+    async def notify_queued(position, estimated_wait):
+        nonlocal queued
+        queued = True
+        await ws.send_json({
+            "type": "queued",
+            "position": position,
+            "estimated_wait_s": round(estimated_wait, 1),
+        })
+
+    requested_codec = ws.query_params.get("codec")
+    codec = negotiate(requested_codec, decode_rate=SEND_SR, encode_rate=RECV_SR,
+                      bitrate=OPUS_BITRATE, complexity=OPUS_COMPLEXITY)
+    if requested_codec:
+        # Answer before anything else so the client knows which payloads to send
+        await ws.send_json({"type": "codec", "codec": codec.name})
+    metrics.CODEC_SESSIONS.labels(codec=codec.name).inc()
+
+    loop = None
     try:
-        await loop.run()          # this now runs until the socket closes
+        async with sessions.admit(client=str(ws.client), on_queued=notify_queued) as info:
+            if queued:
+                # Every client shown a queue position learns it got through, however short the wait
+                await ws.send_json({"type": "admitted", "session_id": info.session_id})
+            loop = AudioLoop(info.session_id, codec=codec)
+            loop.set_websocket(ws)        # small helper you add
+            info.loop = loop
+            await loop.run()              # this now runs until the socket closes
+    except SessionRejected as e:
+        await ws.send_json({"type": "rejected", "reason": str(e)})
+        await ws.close(code=1013)         # "try again later"
     except WebSocketDisconnect:
-        loop.active = False
+        if loop is not None:
+            loop.active = False
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/sessions")
+async def list_sessions():
+    return sessions.snapshot()
+
+
+@app.get("/sessions/{session_id}/trace")
+async def session_trace(session_id: str):
+    for info in sessions.sessions():
+        if info.session_id == session_id and info.loop is not None:
+            return {
+                "session_id": session_id,
+                "turns": info.loop.tracer.dump(),
+                "mic_levels": info.loop.mic_levels.stats(),
+                "context": info.loop.context.stats(),
+            }
+    raise HTTPException(status_code=404, detail="Session not found")
 
 
 @app.get("/")
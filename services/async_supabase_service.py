@@ -0,0 +1,409 @@
+import asyncio
+import os
+import random
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from services.record_cache import TTLCache, filters_key, id_key
+from services.supabase_service import (
+    InterviewerGeminiResponse,
+    cached_rows,
+    chunk_ids,
+    collect_rows,
+    expand_filters,
+    parse_order,
+    select_columns,
+)
+
+
+class AsyncInterviewerGeminiService:
+    """Async counterpart of InterviewerGeminiService talking to PostgREST over one pooled HTTP client.
+
+    Safe to call from the FastAPI event loop: requests never block it, at
+    most ``max_concurrency`` are in flight at once, and transient failures
+    (timeouts, connection errors, 429/5xx) are retried with jittered
+    exponential backoff.
+    """
+
+    RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+    def __init__(self, supabase_url: str, supabase_key: str, *, rest_path: str = "/rest/v1",
+                 timeout: float = 5.0, max_connections: int = 20, max_concurrency: int = 10,
+                 max_retries: int = 3, backoff_base: float = 0.2, backoff_max: float = 2.0,
+                 cache_ttl: float = 300.0, cache_size: int = 1024,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the pooled HTTP client
+
+        Args:
+            supabase_url (str): Your Supabase project URL (or a local PostgREST-style stub)
+            supabase_key (str): Your Supabase anon key
+            rest_path (str): Path of the REST API under supabase_url
+            timeout (float): Per-request timeout in seconds
+            max_connections (int): Size of the shared connection pool
+            max_concurrency (int): Requests allowed in flight at once
+            max_retries (int): Retries after the first attempt for transient failures
+            backoff_base (float): First retry delay in seconds, doubled per attempt
+            backoff_max (float): Upper bound on a single retry delay
+            cache_ttl (float): Seconds get_by_id/get_with_filters results stay cached
+            cache_size (int): Max cached lookups before LRU eviction
+            transport (Optional[httpx.AsyncBaseTransport]): Custom transport, e.g. for an in-process stub
+        """
+        if not supabase_url:
+            raise Exception("Failed to initialize Supabase client: missing URL")
+
+        self.table_name = "interviewer_gemini"
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = TTLCache(cache_size, cache_ttl, should_cache=lambda r: r.success)
+        self._client = httpx.AsyncClient(
+            base_url=supabase_url.rstrip("/") + rest_path,
+            headers={
+                "apikey": supabase_key or "",
+                "Authorization": f"Bearer {supabase_key or ''}",
+                "Accept": "application/json",
+            },
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def get_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> InterviewerGeminiResponse:
+        """
+        Get all records from interviewer_gemini table
+
+        Args:
+            limit (Optional[int]): Limit the number of records returned
+            offset (Optional[int]): Number of records to skip
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        try:
+            params = {"select": "*"}
+            if limit:
+                params["limit"] = str(limit)
+            if offset:
+                params["offset"] = str(offset)
+
+            data = (await self._get(params)).json()
+
+            return InterviewerGeminiResponse(
+                success=True,
+                data=data,
+                count=len(data) if data else 0
+            )
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to fetch all records: {str(e)}"
+            )
+
+    async def iter_pages(self, page_size: int = 500, columns: Optional[Sequence[str]] = None,
+                         filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk the table in id order, one page per request, using keyset pagination
+
+        Args:
+            page_size (int): Rows per request
+            columns (Optional[Sequence[str]]): Columns to fetch, ``id`` is always added; None fetches all
+            filters (Optional[Dict[str, Any]]): Dictionary of column:value pairs to filter by
+
+        Yields:
+            List[Dict[str, Any]]: One page of rows
+
+        Raises:
+            httpx.HTTPError: If a page request fails after retries
+        """
+        params = {"select": select_columns(columns, required=("id",)), "order": "id.asc", "limit": str(page_size)}
+        for column, value in (filters or {}).items():
+            params[column] = f"eq.{format_value(value)}"
+
+        while True:
+            rows = (await self._get(params)).json()
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            params["id"] = f"gt.{rows[-1]['id']}"
+
+    async def iter_all(self, page_size: int = 500, columns: Optional[Sequence[str]] = None,
+                       filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream rows one at a time; see iter_pages"""
+        async for page in self.iter_pages(page_size, columns, filters):
+            for row in page:
+                yield row
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> InterviewerGeminiResponse:
+        """
+        Exact row count computed by the server, without transferring any rows
+
+        Args:
+            filters (Optional[Dict[str, Any]]): Dictionary of column:value pairs to filter by
+
+        Returns:
+            InterviewerGeminiResponse: Response object with count or error
+        """
+        try:
+            params = {"select": "id"}
+            for column, value in (filters or {}).items():
+                params[column] = f"eq.{format_value(value)}"
+
+            response = await self._get(params, headers={"Prefer": "count=exact"}, method="HEAD")
+            # Content-Range: 0-24/3573 (or */0 when nothing matches)
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+
+            return InterviewerGeminiResponse(success=True, count=int(total))
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to count records: {str(e)}"
+            )
+
+    async def get_many(self, ids: Iterable[Any], columns: Optional[Sequence[str]] = None) -> InterviewerGeminiResponse:
+        """
+        Get several records by ID; URL-sized ``id=in.(...)`` chunks are fetched concurrently
+
+        Args:
+            ids (Iterable[Any]): IDs to fetch, duplicates allowed
+            columns (Optional[Sequence[str]]): Columns to fetch, ``id`` is always added; None fetches all
+
+        Returns:
+            InterviewerGeminiResponse: ``data`` is aligned with ``ids`` (None where no row exists),
+                ``count`` is the number of IDs found
+        """
+        try:
+            ids = list(ids)
+            found = cached_rows(self.cache, ids) if columns is None else {}
+            missing = [i for i in dict.fromkeys(ids) if str(i) not in found]
+
+            select = select_columns(columns, required=("id",))
+            responses = await asyncio.gather(*(
+                self._get({"select": select, "id": filter_expr("in", chunk)})
+                for chunk in chunk_ids(missing)
+            ))
+            for response in responses:
+                collect_rows(response.json(), found, self.cache if columns is None else None)
+
+            data = [found.get(str(i)) for i in ids]
+            return InterviewerGeminiResponse(
+                success=True,
+                data=data,
+                count=sum(row is not None for row in data)
+            )
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to fetch records by IDs: {str(e)}"
+            )
+
+    async def query(self, filters: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+                    order_by: Optional[Sequence[str]] = None, limit: Optional[int] = None) -> InterviewerGeminiResponse:
+        """
+        Get records with equality, ``in`` and range filters in a single request
+
+        Args:
+            filters (Optional[Dict[str, Any]]): Scalar -> eq, list -> in, dict -> {op: value}
+                with op in eq/neq/gt/gte/lt/lte/in
+            columns (Optional[Sequence[str]]): Columns to fetch; None fetches all
+            order_by (Optional[Sequence[str]]): Columns to sort by, prefix with "-" for descending
+            limit (Optional[int]): Limit the number of records returned
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        try:
+            # A column may carry several conditions (ranges), so params is a list of pairs
+            params = [("select", select_columns(columns))]
+            params += [(column, filter_expr(op, value)) for column, op, value in expand_filters(filters)]
+            order = ",".join(f"{column}.{'desc' if descending else 'asc'}" for column, descending in parse_order(order_by))
+            if order:
+                params.append(("order", order))
+            if limit:
+                params.append(("limit", str(limit)))
+
+            data = (await self._get(params)).json()
+
+            return InterviewerGeminiResponse(
+                success=True,
+                data=data,
+                count=len(data) if data else 0
+            )
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to query records: {str(e)}"
+            )
+
+    async def get_by_id(self, record_id: Any) -> InterviewerGeminiResponse:
+        """
+        Get a single record by ID, served from the cache when fresh
+
+        Args:
+            record_id (Any): The ID of the record to fetch
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        return await self.cache.get_or_load_async(id_key(record_id), lambda: self._fetch_by_id(record_id))
+
+    async def get_with_filters(self, filters: Dict[str, Any]) -> InterviewerGeminiResponse:
+        """
+        Get records matching AND-ed equality filters, served from the cache when fresh
+
+        Args:
+            filters (Dict[str, Any]): Dictionary of column:value pairs to filter by
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        filters = dict(filters)
+        return await self.cache.get_or_load_async(filters_key(filters), lambda: self._fetch_with_filters(filters))
+
+    def invalidate(self, record_id: Optional[Any] = None):
+        """
+        Drop cached lookups after a write
+
+        Args:
+            record_id (Optional[Any]): Record that changed; None clears the whole cache.
+                Filter results are always dropped since the change may affect them.
+        """
+        if record_id is None:
+            self.cache.invalidate()
+            return
+        self.cache.invalidate(id_key(record_id))
+        self.cache.invalidate_where(lambda key: key[0] == "filters")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    async def _fetch_by_id(self, record_id: Any) -> InterviewerGeminiResponse:
+        """
+        Get a single record by ID from interviewer_gemini table
+
+        Args:
+            record_id (Any): The ID of the record to fetch
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        try:
+            data = (await self._get({"select": "*", "id": f"eq.{format_value(record_id)}"})).json()
+
+            if data:
+                return InterviewerGeminiResponse(
+                    success=True,
+                    data=data[0],  # Return single record
+                    count=1
+                )
+            else:
+                return InterviewerGeminiResponse(
+                    success=False,
+                    error=f"No record found with ID: {record_id}"
+                )
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to fetch record with ID {record_id}: {str(e)}"
+            )
+
+    async def _fetch_with_filters(self, filters: Dict[str, Any]) -> InterviewerGeminiResponse:
+        """
+        Get records with custom filters
+
+        Args:
+            filters (Dict[str, Any]): Dictionary of column:value pairs to filter by
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        try:
+            params = {"select": "*"}
+            for column, value in filters.items():
+                params[column] = f"eq.{format_value(value)}"
+
+            data = (await self._get(params)).json()
+
+            return InterviewerGeminiResponse(
+                success=True,
+                data=data,
+                count=len(data) if data else 0
+            )
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to fetch records with filters: {str(e)}"
+            )
+
+    async def _get(self, params: Union[Dict[str, str], List[Tuple[str, str]]], headers: Optional[Dict[str, str]] = None,
+                   method: str = "GET") -> httpx.Response:
+        """Issue one request against the table, retrying transient failures"""
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, f"/{self.table_name}", params=params, headers=headers)
+                if response.status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return random.uniform(delay / 2, delay)
+
+
+def format_value(value: Any) -> str:
+    """Render a Python value the way PostgREST expects it in a filter"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    return str(value)
+
+
+def filter_expr(op: str, value: Any) -> str:
+    """PostgREST filter value, e.g. ("gte", 15) -> "gte.15", ("in", [1, 2]) -> "in.(1,2)" """
+    if op != "in":
+        return f"{op}.{format_value(value)}"
+    items = []
+    for item in value:
+        text = format_value(item)
+        if any(c in text for c in ',()" '):
+            text = '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        items.append(text)
+    return f"in.({','.join(items)})"
+
+
+# Example usage
+if __name__ == "__main__":
+    async def main():
+        async with AsyncInterviewerGeminiService(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_ANON_KEY")) as service:
+            # Independent lookups share the pool and run concurrently
+            all_records, record_by_id = await asyncio.gather(service.get_all(limit=10), service.get_by_id(945))
+            print(all_records.count if all_records.success else all_records.error)
+            print(record_by_id.data if record_by_id.success else record_by_id.error)
+
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+"""Context-size tracking and compression for long interviews.
+
+Every turn stays in the live session's context, so a 45-minute interview
+gets slower and costlier per turn.  ``ContextTracker`` estimates the context
+size per session: text at ~4 characters per token, audio at the Live API's
+32 tokens per second, overridden by ``usage_metadata`` when Gemini reports
+it.  Past ``trigger_tokens`` the relay either lets the Live API slide the
+window itself (``ContextWindowCompressionConfig``) or reseeds a fresh
+session with ``seed_text()``: the older turns condensed by ``condense`` plus
+the latest ones verbatim, within ``target_tokens``.  ``check_budget`` makes
+sure a compressed context lands clearly below the trigger, and after a
+compression the tracker only fires again once that headroom has been used
+up by new audio and turns, so a session cannot reseed on every turn.
+"""
+import re
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+AUDIO_TOKENS_PER_S = 32
+
+_SENTENCE_END = re.compile(r"(?<=[.?!])\s+")
+_SEED_HEAD = "The interview is already under way; do not greet the candidate again."
+_SEED_SUMMARY = "Earlier in the interview (condensed):"
+_SEED_RECENT = "Most recent exchange:"
+_SEED_TAIL = "Continue the interview from here."
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def check_budget(base_tokens: int, trigger_tokens: int, target_tokens: int):
+    """Raise ValueError unless a compressed context (prompt plus target) is below the trigger"""
+    if base_tokens + target_tokens >= trigger_tokens:
+        raise ValueError(f"Context compression needs prompt ({base_tokens}) + target ({target_tokens}) "
+                         f"tokens below the trigger ({trigger_tokens})")
+
+
+def condense(speaker: str, text: str, max_words: int = 30) -> str:
+    """
+    One-line stand-in for a summary of a turn
+
+    Args:
+        speaker (str): "AI" or "User"
+        text (str): Full turn text
+        max_words (int): Longest condensed line, in words
+
+    Returns:
+        str: The interviewer's question (its last sentence ending in "?") or the
+        first sentence of anything else, clipped to ``max_words``
+    """
+    sentences = [s for s in _SENTENCE_END.split(text.strip()) if s]
+    if not sentences:
+        return f"{speaker}: "
+    picked = sentences[0]
+    if speaker == "AI":
+        picked = next((s for s in reversed(sentences) if s.endswith("?")), picked)
+    words = picked.split()
+    if len(words) > max_words:
+        picked = " ".join(words[:max_words]) + " ..."
+    return f"{speaker}: {picked}"
+
+
+class ContextTracker:
+    """Per-session context size estimate and the turns needed to rebuild it"""
+
+    def __init__(self, base_tokens: int, trigger_tokens: int, target_tokens: int, keep_turns: int = 6):
+        """
+        Args:
+            base_tokens (int): Tokens every session starts with (the prompt)
+            trigger_tokens (int): Context size at which compression is due
+            target_tokens (int): Budget for a reseeded session's context text
+            keep_turns (int): Latest turns carried over verbatim on reseed
+        """
+        self.base_tokens = base_tokens
+        self.trigger_tokens = trigger_tokens
+        self.target_tokens = target_tokens
+        self.keep_turns = keep_turns
+
+        self.estimated = base_tokens
+        self.reported: Optional[int] = None
+        self.compressions = 0
+        self._added_since_compression: Optional[float] = None     # None until the first compression
+        self._summary: List[str] = []                 # condensed lines, oldest first
+        self._recent: Deque[Tuple[str, str]] = deque()
+
+    @property
+    def tokens(self) -> int:
+        """Gemini's last report plus audio added since, else the local estimate"""
+        return self.reported if self.reported is not None else self.estimated
+
+    @property
+    def headroom(self) -> int:
+        """Tokens a compressed context has to grow by before the trigger is due again"""
+        return max(1, self.trigger_tokens - self.base_tokens - self.target_tokens)
+
+    @property
+    def over_trigger(self) -> bool:
+        if self._added_since_compression is not None and self._added_since_compression < self.headroom:
+            return False    # nothing new since the last compression; compressing again would not help
+        return self.tokens >= self.trigger_tokens
+
+    def add_audio(self, seconds: float):
+        added = seconds * AUDIO_TOKENS_PER_S
+        self.estimated += added
+        if self.reported is not None:
+            self.reported += added
+        if self._added_since_compression is not None:
+            self._added_since_compression += added
+
+    def add_turn(self, speaker: str, text: str):
+        if not text:
+            return
+        if self._added_since_compression is not None:
+            self._added_since_compression += estimate_tokens(text)
+        self._recent.append((speaker, text))
+        while len(self._recent) > self.keep_turns:
+            self._summary.append(condense(*self._recent.popleft()))
+
+    def observe_usage(self, total_token_count: Optional[int]):
+        if total_token_count:
+            self.reported = total_token_count
+
+    def seed_text(self) -> str:
+        """
+        Condensed history plus the latest turns, to prime a fresh session with
+
+        Returns:
+            str: At most ``target_tokens`` of text.  The newest turns are kept
+            verbatim while they fit; older recent turns are condensed into the
+            history, and the oldest condensed lines go first when that overflows.
+        """
+        frame = "\n\n".join([_SEED_HEAD, _SEED_SUMMARY, _SEED_RECENT, _SEED_TAIL])
+        budget = self.target_tokens - estimate_tokens(frame)
+
+        recent: Deque[Tuple[str, str]] = deque()
+        while self._recent:
+            speaker, text = self._recent[-1]
+            cost = estimate_tokens(f"\n{speaker}: {text}")
+            if cost > budget:
+                break
+            budget -= cost
+            recent.appendleft(self._recent.pop())
+        self._summary.extend(condense(speaker, text) for speaker, text in self._recent)
+        self._recent = recent
+
+        summary: Deque[str] = deque()
+        for line in reversed(self._summary):
+            cost = estimate_tokens("\n" + line)
+            if cost > budget:
+                break
+            budget -= cost
+            summary.appendleft(line)
+        self._summary = list(summary)
+
+        parts = [_SEED_HEAD]
+        if summary:
+            parts.append(_SEED_SUMMARY + "\n" + "\n".join(summary))
+        if recent:
+            parts.append(_SEED_RECENT + "\n" + "\n".join(f"{speaker}: {text}" for speaker, text in recent))
+        parts.append(_SEED_TAIL)
+        return "\n\n".join(parts)
+
+    def compressed(self, tokens: int):
+        """The context was cut down to about ``tokens``; count from there"""
+        self.compressions += 1
+        self._added_since_compression = 0.0
+        self.estimated = tokens
+        self.reported = None
+
+    def stats(self) -> dict:
+        return {
+            "tokens": int(self.tokens),
+            "reported": self.reported is not None,
+            "compressions": self.compressions,
+            "summary_lines": len(self._summary),
+        }
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from typing import Any, AsyncContextManager, Awaitable, Callable, List, Optional
+
+from services import metrics
+from services.logging_utils import get_logger
+
+logger = get_logger("live_pool")
+
+POOL_HITS = metrics.LIVE_POOL_ACQUIRES.labels(result="hit")
+POOL_MISSES = metrics.LIVE_POOL_ACQUIRES.labels(result="miss")
+
+
+def websocket_is_open(session: Any) -> bool:
+    """Best-effort liveness check on a google-genai AsyncSession's underlying socket"""
+    ws = getattr(session, "_ws", None)
+    return ws is None or getattr(ws, "close_code", None) is None
+
+
+class PooledSession:
+    """A connected (and primed) live session; ``async with`` it to close it when done"""
+
+    def __init__(self, session: Any, stack: AsyncExitStack):
+        self.session = session
+        self.created_at = time.monotonic()
+        self._stack = stack
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    async def aclose(self):
+        try:
+            await self._stack.aclose()
+        except Exception as e:
+            logger.debug("Error closing pooled live session: %s", e)
+
+    async def __aenter__(self):
+        return self.session
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+class LiveSessionPool:
+    """Keeps ``size`` upstream live sessions connected and primed ahead of demand.
+
+    A session is handed out once and closed by its new owner; the pool
+    refills in the background.  Idle sessions are recycled after
+    ``max_idle_s`` so a handed-out session still has most of the upstream
+    connection lifetime ahead of it, and dropped early if their socket dies.
+    """
+
+    def __init__(self, connect: Callable[[], AsyncContextManager], size: int = 2,
+                 prime: Optional[Callable[[Any], Awaitable[None]]] = None,
+                 max_idle_s: float = 300.0, check_interval: float = 10.0,
+                 is_healthy: Callable[[Any], bool] = websocket_is_open, retry_delay: float = 5.0):
+        """
+        Args:
+            connect (Callable[[], AsyncContextManager]): Opens one session, e.g.
+                ``lambda: client.aio.live.connect(model=MODEL, config=CONFIG)``
+            size (int): Number of idle sessions to keep ready
+            prime (Optional[Callable[[Any], Awaitable[None]]]): Awaited on each new session before it is pooled
+            max_idle_s (float): Idle sessions older than this are closed and replaced
+            check_interval (float): Seconds between health/age sweeps
+            is_healthy (Callable[[Any], bool]): Liveness check applied on sweep and on acquire
+            retry_delay (float): Pause after a failed connect before trying again
+        """
+        self.connect = connect
+        self.size = size
+        self.prime = prime
+        self.max_idle_s = max_idle_s
+        self.check_interval = check_interval
+        self.is_healthy = is_healthy
+        self.retry_delay = retry_delay
+
+        self._idle: List[PooledSession] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def start(self):
+        if self._task is None and self.size > 0:
+            self._task = asyncio.create_task(self._maintain())
+
+    async def acquire(self) -> Optional[PooledSession]:
+        """Take a ready session, or None when the pool is empty (connect directly then)"""
+        while self._idle:
+            pooled = self._idle.pop(0)
+            if pooled.age < self.max_idle_s and self.is_healthy(pooled.session):
+                POOL_HITS.inc()
+                self._wakeup.set()
+                return pooled
+            await pooled.aclose()
+        POOL_MISSES.inc()
+        self._wakeup.set()
+        return None
+
+    async def aclose(self):
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(pooled.aclose() for pooled in idle))
+
+    async def _maintain(self):
+        while not self._closed:
+            self._wakeup.clear()
+            await self._sweep()
+            missing = self.size - len(self._idle)
+            if missing > 0:
+                results = await asyncio.gather(*(self._open() for _ in range(missing)), return_exceptions=True)
+                failures = [r for r in results if isinstance(r, BaseException)]
+                if failures:
+                    logger.warning("Failed to pre-warm %d live session(s): %s", len(failures), failures[0])
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _sweep(self):
+        stale = [p for p in self._idle if p.age >= self.max_idle_s or not self.is_healthy(p.session)]
+        if stale:
+            self._idle = [p for p in self._idle if p not in stale]
+            await asyncio.gather(*(pooled.aclose() for pooled in stale))
+
+    async def _open(self):
+        stack = AsyncExitStack()
+        try:
+            session = await stack.enter_async_context(self.connect())
+            if self.prime is not None:
+                await self.prime(session)
+        except BaseException:
+            await stack.aclose()
+            raise
+        pooled = PooledSession(session, stack)
+        if self._closed:
+            await pooled.aclose()
+            return
+        self._idle.append(pooled)
@@ -0,0 +1,74 @@
+"""Bookkeeping for resuming a dropped Gemini live session.
+
+While a session runs the Live API sends ``session_resumption_update``
+messages carrying a handle; reconnecting with the latest handle restores the
+conversation without re-sending the prompt.  A handle only covers the
+client messages the server had consumed when it was issued, so
+``UplinkReplayBuffer`` keeps what was sent since, to send again on the
+resumed connection.
+
+The Developer API does not say exactly which message a handle covers
+(``last_consumed_client_message_index`` needs Vertex's transparent mode), so
+messages sent within ``ack_lag_s`` of a handle arriving stay in the buffer:
+a resume may repeat a fraction of a second of audio rather than lose it.
+"""
+import time
+from collections import deque
+from typing import Callable, Deque, List, Tuple
+
+
+class UpstreamLost(Exception):
+    """The live session dropped and could not be resumed"""
+
+
+class UplinkReplayBuffer:
+    """Uplink messages (``out_queue`` items) not yet covered by a resumption handle"""
+
+    def __init__(self, max_bytes: int, ack_lag_s: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_bytes (int): Audio kept at most; older messages are evicted unacknowledged
+            ack_lag_s (float): Messages sent this recently are not assumed covered by a new handle
+            clock (Callable[[], float]): Time source, monotonic seconds
+        """
+        self.max_bytes = max_bytes
+        self.ack_lag_s = ack_lag_s
+        self.clock = clock
+        self._entries: Deque[Tuple[float, dict, int]] = deque()
+        self._bytes = 0
+        self.evicted_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def record(self, msg: dict):
+        """Remember a message as it is sent upstream"""
+        size = len(msg.get("data", b""))
+        self._entries.append((self.clock(), msg, size))
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, _, evicted = self._entries.popleft()
+            self._bytes -= evicted
+            self.evicted_bytes += evicted
+
+    def ack(self):
+        """A new handle arrived: forget the messages it certainly covers"""
+        cutoff = self.clock() - self.ack_lag_s
+        while self._entries and self._entries[0][0] <= cutoff:
+            _, _, size = self._entries.popleft()
+            self._bytes -= size
+
+    def take(self) -> List[dict]:
+        """Everything unacknowledged, oldest first; the buffer is left empty"""
+        messages = [msg for _, msg, _ in self._entries]
+        self.clear()
+        return messages
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
@@ -0,0 +1,116 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from typing import Dict, Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+ROOT_LOGGER = "relay"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None) -> logging.Logger:
+    """
+    Configure the ``relay`` logger hierarchy once per process
+
+    Records are handed to a background thread through a queue, so the event
+    loop never blocks on a terminal or pipe write.
+
+    Args:
+        level (Optional[str]): Level name, defaults to $LOG_LEVEL or INFO
+
+    Returns:
+        logging.Logger: The configured ``relay`` root logger
+    """
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    if _listener is not None:
+        return root
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root.handlers[:] = [logging.handlers.QueueHandler(records)]
+    root.propagate = False
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Child of the ``relay`` logger, e.g. get_logger("main") -> relay.main"""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class SessionLogger(logging.LoggerAdapter):
+    """Prefixes every message with a short session tag"""
+
+    def __init__(self, logger: logging.Logger, session_id: str):
+        super().__init__(logger, {"session": session_id})
+        self.prefix = f"[{session_id[:8]}] "
+
+    def process(self, msg, kwargs):
+        return self.prefix + msg, kwargs
+
+
+class LogSampler:
+    """Admits one event in every ``every`` calls, and at most one per ``interval`` seconds"""
+
+    def __init__(self, every: int = 1, interval: float = 0.0):
+        self.every = max(every, 1)
+        self.interval = interval
+        self._calls = 0
+        self._next_at = 0.0
+
+    def __call__(self) -> bool:
+        self._calls += 1
+        if self._calls % self.every:
+            return False
+        if self.interval:
+            now = time.monotonic()
+            if now < self._next_at:
+                return False
+            self._next_at = now + self.interval
+        return True
+
+
+class RateCounter:
+    """Per-session counters written to the log at most once per ``interval`` seconds.
+
+    ``add`` is a dict increment plus a clock read when the level is enabled
+    and a single cached level check when it is not; all formatting happens
+    in ``emit``.
+    """
+
+    def __init__(self, logger: logging.Logger, label: str, interval: float = 5.0, level: int = logging.DEBUG):
+        self.logger = logger
+        self.label = label
+        self.interval = interval
+        self.level = level
+        self._window: Dict[str, int] = {}
+        self._window_start = time.monotonic()
+
+    def add(self, key: str, n: int = 1):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        self._window[key] = self._window.get(key, 0) + n
+        now = time.monotonic()
+        if now - self._window_start >= self.interval:
+            self.emit(now)
+
+    def emit(self, now: Optional[float] = None):
+        now = now or time.monotonic()
+        if self._window:
+            elapsed = max(now - self._window_start, 1e-9)
+            summary = " ".join(f"{k}={v}" for k, v in sorted(self._window.items()))
+            self.logger.log(self.level, "%s over %.1fs: %s", self.label, elapsed, summary)
+            self._window.clear()
+        self._window_start = now
@@ -0,0 +1,267 @@
+import bisect
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+DEFAULT_DURATION_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Registry:
+    """Collection of metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, "_Metric"] = {}
+
+    def register(self, metric: "_Metric"):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional["_Metric"]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, **labels):
+        """Child for one label combination; bind it once and reuse it on hot paths"""
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels, use .labels(...)")
+        return self._children[()]
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _ValueChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the value at scrape time instead of storing it"""
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _ValueChild()
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._unlabelled().set_function(function)
+
+    def get(self) -> float:
+        return self._unlabelled().get()
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"
+            for key, child in self._children.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float):
+        self._unlabelled().set(value)
+
+    def dec(self, amount: float = 1.0):
+        self._unlabelled().dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "bucket_counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Sequence[float]):
+        self.upper_bounds = upper_bounds
+        self.bucket_counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect.bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._unlabelled().observe(value)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, n in zip(self.upper_bounds + (math.inf,), child.bucket_counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+# ---------------------------------------------------------------------------
+# Relay metrics shared by main.py and the services it uses
+# ---------------------------------------------------------------------------
+
+ACTIVE_SESSIONS = Gauge("relay_active_sessions", "Live interview sessions currently running")
+QUEUED_SESSIONS = Gauge("relay_queued_sessions", "Connections waiting for a live session slot")
+
+RELAY_BYTES = Counter(
+    "relay_bytes_total", "Audio payload bytes by direction",
+    ["direction"],
+)
+RELAY_FRAMES = Counter(
+    "relay_frames_total", "Audio frames/chunks by direction",
+    ["direction"],
+)
+QUEUE_DEPTH = Gauge(
+    "relay_queue_depth", "Items waiting in per-session queues, summed over sessions",
+    ["queue"],
+)
+
+TIME_TO_FIRST_AUDIO = Histogram(
+    "relay_gemini_time_to_first_audio_seconds",
+    "Per turn: end of the candidate's input to the first Gemini audio chunk",
+)
+TURN_DURATION = Histogram(
+    "relay_turn_duration_seconds", "Duration of a Gemini turn, first to last message",
+    buckets=DEFAULT_DURATION_BUCKETS,
+)
+TURN_LATENCY = Histogram(
+    "relay_turn_latency_seconds",
+    "Per-turn latency by stage, from the last forwarded mic frame to the first frame played",
+    ["stage"],
+)
+DROPPED_FRAMES = Counter("relay_dropped_frames_total", "Downlink frames dropped by the playout buffer")
+LIVE_POOL_IDLE = Gauge("relay_live_pool_idle_sessions", "Pre-warmed live sessions ready to hand out")
+LIVE_POOL_ACQUIRES = Counter(
+    "relay_live_pool_acquires_total", "Session starts served from the warm pool (hit) or connected cold (miss)",
+    ["result"],
+)
+MIC_LEVEL = Histogram(
+    "relay_mic_rms_dbfs", "RMS level of each mic frame from the client, dBFS",
+    buckets=(-90.0, -70.0, -60.0, -50.0, -40.0, -30.0, -20.0, -10.0, -3.0, 0.0),
+)
+MIC_CLIPPED_SAMPLES = Counter("relay_mic_clipped_samples_total", "Mic samples at int16 full scale")
+VAD_DROPPED_BYTES = Counter("relay_vad_dropped_bytes_total", "Mic bytes (client rate) withheld from Gemini as silence")
+VAD_SEGMENTS = Counter("relay_vad_speech_segments_total", "Speech segments opened by the uplink VAD")
+BARGE_INS = Counter(
+    "relay_barge_ins_total", "Candidate interruptions of the AI's answer, by what detected them",
+    ["source"],
+)
+BARGE_IN_DROPPED_FRAMES = Counter(
+    "relay_barge_in_dropped_frames_total", "Downlink frames discarded because the candidate interrupted",
+)
+CODEC_SESSIONS = Counter(
+    "relay_codec_sessions_total", "WebSocket connections by negotiated audio payload codec",
+    ["codec"],
+)
+RECONNECTS = Counter("relay_reconnects_total", "Upstream live-session reconnects")
+RECONNECT_SECONDS = Histogram(
+    "relay_reconnect_seconds", "Upstream drop detected to resumed session ready, uplink replay included",
+)
+REPLAYED_BYTES = Counter("relay_replayed_bytes_total", "Uplink audio bytes sent again after a reconnect")
+CONTEXT_TOKENS = Histogram(
+    "relay_context_tokens", "Estimated live-session context size at the end of each turn",
+    buckets=(1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000, 256000),
+)
+CONTEXT_COMPRESSIONS = Counter(
+    "relay_context_compressions_total", "Live-session context compressions, by mode",
+    ["mode"],
+)
+CONTEXT_TURN_LATENCY = Histogram(
+    "relay_turn_latency_by_context_seconds",
+    "Time to first audio per turn, before (full) and after (compressed) the session's first context compression",
+    ["context"],
+)
+RECORDED_BYTES = Counter("relay_recorded_bytes_total", "Session audio bytes written to recordings, by track", ["track"])
+RECORDER_DROPPED_BYTES = Counter(
+    "relay_recorder_dropped_bytes_total", "Session audio bytes not recorded because the writer fell behind",
+)
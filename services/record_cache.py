@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+_ABANDONED = object()    # the loading caller was cancelled; waiters retry and one of them loads
+
+
+def id_key(record_id: Any) -> Tuple[str, str]:
+    """Cache key for a single record; 945 and "945" address the same row"""
+    return ("id", str(record_id))
+
+
+def filters_key(filters: Dict[str, Any]) -> Tuple[str, Tuple]:
+    """Cache key for a filter dict, independent of insertion order"""
+    return ("filters", tuple(sorted((str(column), _freeze(value)) for column, value in filters.items())))
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after ``ttl`` seconds.
+
+    ``get_or_load`` / ``get_or_load_async`` make it read-through: concurrent
+    misses for one key share a single loader call.  Cached values are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0,
+                 should_cache: Callable[[Any], bool] = lambda value: True,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int): Entries kept before the least recently used is evicted
+            ttl (float): Seconds an entry stays valid
+            should_cache (Callable[[Any], bool]): Loaded values failing this are returned but not stored
+            clock (Callable[[], float]): Time source, injectable for tests
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.should_cache = should_cache
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight_async: Dict[Hashable, asyncio.Future] = {}
+        self._inflight_sync: Dict[Hashable, "_Flight"] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything when ``key`` is None"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+
+            future = self._inflight_async.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            value = await asyncio.shield(future)
+            if value is not _ABANDONED:
+                return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_async[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            # Only this caller went away; the others must not inherit its cancellation
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved in case nobody else is waiting
+            raise
+        else:
+            if self.should_cache(value):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight_async.pop(key, None)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            flight = self._inflight_sync.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight_sync[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            flight.fail(e)
+            raise
+        else:
+            if self.should_cache(value):
+                self.set(key, value)
+            flight.succeed(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight_sync.pop(key, None)
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+
+class _Flight:
+    """Result slot shared by threads waiting on the same sync load"""
+
+    __slots__ = ("_event", "_value", "_error")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._value = None
+        self._error: Optional[BaseException] = None
+
+    def succeed(self, value: Any):
+        self._value = value
+        self._event.set()
+
+    def fail(self, error: BaseException):
+        self._error = error
+        self._event.set()
+
+    def wait(self) -> Any:
+        self._event.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+from services import metrics
+from services.logging_utils import get_logger
+
+logger = get_logger("recorder")
+
+WAV_HEADER_BYTES = 44
+
+
+def wav_header(sample_rate: int, data_bytes: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """Canonical 44-byte PCM WAV header for ``data_bytes`` of audio"""
+    block_align = channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_bytes, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b"data", data_bytes,
+    )
+
+
+class TrackFile:
+    """One track's current output file; only used from the writer thread.
+
+    WAV sizes are patched after every batch, so the file on disk is a
+    playable WAV of everything written so far.  Once a file holds
+    ``rotate_bytes`` of audio the next batch starts a new part.
+    """
+
+    def __init__(self, directory: str, name: str, sample_rate: int, wav: bool = True, rotate_bytes: int = 0):
+        self.directory = directory
+        self.name = name
+        self.sample_rate = sample_rate
+        self.wav = wav
+        self.rotate_bytes = rotate_bytes
+        self.paths: List[str] = []
+        self.data_bytes = 0
+        self._file = None
+
+    def write(self, data: bytes):
+        if self._file is None or (self.rotate_bytes and self.data_bytes >= self.rotate_bytes):
+            self._next_part()
+        self._file.write(data)
+        self.data_bytes += len(data)
+        if self.wav:
+            self._patch_header()
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _next_part(self):
+        self.close()
+        part = len(self.paths) + 1
+        suffix = f"_{part:03d}" if part > 1 else ""
+        path = os.path.join(self.directory, f"{self.name}{suffix}.{'wav' if self.wav else 'pcm'}")
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = open(path, "wb")
+        self.paths.append(path)
+        self.data_bytes = 0
+        if self.wav:
+            self._file.write(wav_header(self.sample_rate, 0))
+
+    def _patch_header(self):
+        f = self._file
+        f.seek(4)
+        f.write(struct.pack("<I", 36 + self.data_bytes))
+        f.seek(40)
+        f.write(struct.pack("<I", self.data_bytes))
+        f.seek(0, os.SEEK_END)
+
+
+class SessionRecorder:
+    """Streams a session's audio tracks to disk in constant memory.
+
+    ``write`` only appends to a per-track pending buffer; full buffers (and
+    partial ones every ``flush_interval_s``) go on a bounded queue that a
+    background task writes from a worker thread, several batches per call.
+    If the disk falls behind and the queue is full, batches are dropped and
+    counted rather than stalling the audio path or growing memory.
+    """
+
+    def __init__(self, directory: str, tag: str, tracks: Dict[str, int], wav: bool = True,
+                 rotate_s: float = 900.0, batch_bytes: int = 64 * 1024, max_batches: int = 32,
+                 flush_interval_s: float = 1.0):
+        """
+        Args:
+            directory (str): Where the files are written
+            tag (str): Common part of the file names, <track>_<tag>[_NNN].wav
+            tracks (Dict[str, int]): Track name -> sample rate of its 16-bit mono PCM
+            wav (bool): Write WAV files; False writes headerless .pcm
+            rotate_s (float): Audio per file before starting a new part, 0 for one file
+            batch_bytes (int): Pending bytes per track that trigger a write
+            max_batches (int): Batches queued for the writer at most
+            flush_interval_s (float): Longest a partial batch waits before being written
+        """
+        self.batch_bytes = batch_bytes
+        self.flush_interval_s = flush_interval_s
+        self.files = {
+            name: TrackFile(directory, f"{name}_{tag}", rate, wav=wav, rotate_bytes=int(rotate_s * rate) * 2)
+            for name, rate in tracks.items()
+        }
+        self.recorded_bytes = {name: 0 for name in tracks}
+        self.dropped_bytes = 0
+
+        self._pending = {name: bytearray() for name in tracks}
+        self._counters = {name: metrics.RECORDED_BYTES.labels(track=name) for name in tracks}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_batches)
+        self._writer: Optional[asyncio.Task] = None
+        self._flushed_at = time.monotonic()
+
+    @property
+    def paths(self) -> List[str]:
+        return [path for track in self.files.values() for path in track.paths]
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def write(self, track: str, pcm):
+        """Queue audio for a track; never blocks"""
+        pending = self._pending[track]
+        pending += pcm
+        if len(pending) >= self.batch_bytes:
+            self._submit(track)
+
+    async def aclose(self):
+        """Write everything pending, then close the files"""
+        if self._writer is not None:
+            self._flush_pending()
+            await self._queue.join()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        await asyncio.to_thread(self._close_files)
+
+    def stats(self) -> dict:
+        return {
+            "recorded_bytes": dict(self.recorded_bytes),
+            "dropped_bytes": self.dropped_bytes,
+            "files": self.paths,
+        }
+
+    def _submit(self, track: str):
+        pending = self._pending[track]
+        if not pending:
+            return
+        data = bytes(pending)
+        pending.clear()
+        try:
+            self._queue.put_nowait((track, data))
+        except asyncio.QueueFull:
+            self.dropped_bytes += len(data)
+            metrics.RECORDER_DROPPED_BYTES.inc(len(data))
+
+    def _flush_pending(self):
+        self._flushed_at = time.monotonic()
+        for track in self._pending:
+            self._submit(track)
+
+    async def _write_loop(self):
+        while True:
+            try:
+                batch = [await asyncio.wait_for(self._queue.get(), self.flush_interval_s)]
+            except asyncio.TimeoutError:
+                batch = []
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if batch:
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except Exception as e:      # a failed batch is lost, but the writer keeps going
+                    logger.error("Failed to record %d audio batches: %r", len(batch), e)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+            if time.monotonic() - self._flushed_at >= self.flush_interval_s:
+                self._flush_pending()
+
+    def _write_batch(self, batch: List[Tuple[str, bytes]]):
+        # One write per track and batch, in arrival order within each track
+        grouped: Dict[str, List[bytes]] = {}
+        for track, data in batch:
+            grouped.setdefault(track, []).append(data)
+        for track, chunks in grouped.items():
+            data = b"".join(chunks)
+            self.files[track].write(data)
+            self.recorded_bytes[track] += len(data)
+            self._counters[track].inc(len(data))
+
+    def _close_files(self):
+        for track in self.files.values():
+            track.close()
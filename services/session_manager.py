@@ -0,0 +1,182 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SessionRejected(Exception):
+    """Raised when a session cannot be admitted (queue full or wait timed out)"""
+
+
+@dataclass
+class SessionInfo:
+    """Registry entry for one /ws/audio connection"""
+    session_id: str
+    client: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    state: str = "queued"
+    loop: Any = field(default=None, repr=False)
+
+    @property
+    def queued_for(self) -> float:
+        end = self.started_at or time.time()
+        return end - self.enqueued_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "session_id": self.session_id,
+            "client": self.client,
+            "state": self.state,
+            "queued_s": round(self.queued_for, 2),
+            "active_s": round(now - self.started_at, 2) if self.started_at else None,
+        }
+
+
+QueueCallback = Callable[[int, float], Awaitable[None]]
+
+
+class SessionManager:
+    """Caps concurrent live sessions and queues the overflow in FIFO order"""
+
+    def __init__(self, max_sessions: int, max_queue: int = 50, queue_timeout: float = 120.0,
+                 update_interval: float = 5.0, default_session_s: float = 900.0):
+        """
+        Args:
+            max_sessions (int): Live sessions allowed to run at once
+            max_queue (int): Waiting connections allowed before new ones are rejected
+            queue_timeout (float): Seconds a connection may wait before it is rejected
+            update_interval (float): Seconds between position updates sent to waiters
+            default_session_s (float): Assumed session length until real ones are observed
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.update_interval = update_interval
+        self.default_session_s = default_session_s
+
+        self._active: Dict[str, SessionInfo] = {}
+        self._waiters: deque = deque()
+        self._durations: deque = deque(maxlen=100)
+
+        self.admitted_total = 0
+        self.rejected_total = 0
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._waiters)
+
+    def sessions(self):
+        return list(self._active.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_sessions": self.max_sessions,
+            "active": [info.to_dict() for info in self._active.values()],
+            "queued": [info.to_dict() for info, _ in self._waiters],
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+        }
+
+    def estimate_wait(self, position: int) -> float:
+        """
+        Estimate seconds until the waiter at ``position`` (1-based) is admitted
+
+        Slots free up as active sessions reach the average observed length;
+        every full round of ``max_sessions`` ahead adds another average length.
+        """
+        avg = sum(self._durations) / len(self._durations) if self._durations else self.default_session_s
+        now = time.time()
+        remaining = sorted(max(avg - (now - info.started_at), 0.0) for info in self._active.values())
+        if not remaining:
+            return 0.0
+        idx = (position - 1) % len(remaining)
+        rounds = (position - 1) // len(remaining)
+        return remaining[idx] + rounds * avg
+
+    @asynccontextmanager
+    async def admit(self, client: Optional[str] = None, on_queued: Optional[QueueCallback] = None):
+        """
+        Hold a live-session slot for the duration of the ``async with`` block
+
+        Args:
+            client (Optional[str]): Peer description kept in the registry
+            on_queued (Optional[QueueCallback]): Awaited with (position, estimated_wait_s)
+                while the connection waits for a slot
+
+        Raises:
+            SessionRejected: If the queue is full or the wait exceeds queue_timeout
+        """
+        info = SessionInfo(session_id=uuid.uuid4().hex, client=client)
+        await self._acquire(info, on_queued)
+        try:
+            yield info
+        finally:
+            self._release(info)
+
+    async def _acquire(self, info: SessionInfo, on_queued: Optional[QueueCallback]):
+        if len(self._active) < self.max_sessions and not self._waiters:
+            self._activate(info)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_total += 1
+            raise SessionRejected("Server is at capacity, please try again later")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (info, future)
+        self._waiters.append(entry)
+        deadline = time.monotonic() + self.queue_timeout
+        try:
+            while not future.done():
+                if on_queued is not None:
+                    position = self._waiters.index(entry) + 1
+                    await on_queued(position, self.estimate_wait(position))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), min(self.update_interval, remaining))
+                except asyncio.TimeoutError:
+                    continue
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # A slot was handed over just as we gave up: pass it on
+                self._release(info)
+            else:
+                future.cancel()
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected_total += 1
+                raise SessionRejected("Timed out waiting for a free interview slot") from None
+            raise
+
+    def _activate(self, info: SessionInfo):
+        info.started_at = time.time()
+        info.state = "active"
+        self._active[info.session_id] = info
+        self.admitted_total += 1
+
+    def _release(self, info: SessionInfo):
+        if self._active.pop(info.session_id, None) is None:
+            return
+        info.state = "finished"
+        self._durations.append(time.time() - info.started_at)
+
+        while self._waiters and len(self._active) < self.max_sessions:
+            waiter, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._activate(waiter)
+            future.set_result(None)
@@ -1,8 +1,10 @@
 from supabase import create_client, Client
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Sequence, Tuple
 import os
 from dataclasses import dataclass
 
+from services.record_cache import TTLCache, filters_key, id_key
+
 
 @dataclass
 class InterviewerGeminiResponse:
@@ -13,20 +15,95 @@ class InterviewerGeminiResponse:
     count: Optional[int] = None
 
 
+FILTER_OPS = ("eq", "neq", "gt", "gte", "lt", "lte", "in")
+
+# Budget for the id list in one ?id=in.(...) request, well under common URL limits
+MAX_IN_LIST_CHARS = 1500
+
+
+def expand_filters(filters: Optional[Dict[str, Any]]) -> List[Tuple[str, str, Any]]:
+    """
+    Normalise a filter dict into (column, op, value) triples
+
+    A scalar means ``eq``, a list/tuple/set means ``in`` and a dict maps
+    operators to values, e.g. ``{"duration_minutes": {"gte": 15, "lt": 60}}``.
+    """
+    expanded = []
+    for column, spec in (filters or {}).items():
+        if isinstance(spec, dict):
+            for op, value in spec.items():
+                if op not in FILTER_OPS:
+                    raise ValueError(f"Unsupported filter operator for {column}: {op}")
+                expanded.append((column, op, list(value) if op == "in" else value))
+        elif isinstance(spec, (list, tuple, set, frozenset)):
+            expanded.append((column, "in", list(spec)))
+        else:
+            expanded.append((column, "eq", spec))
+    return expanded
+
+
+def parse_order(order_by: Optional[Sequence[str]]) -> List[Tuple[str, bool]]:
+    """["-created_at", "id"] -> [("created_at", True), ("id", False)] as (column, descending)"""
+    return [(column[1:], True) if column.startswith("-") else (column, False) for column in (order_by or ())]
+
+
+def chunk_ids(ids: Iterable[Any], max_chars: int = MAX_IN_LIST_CHARS) -> List[List[Any]]:
+    """Split ids into runs whose comma-joined form stays within ``max_chars``"""
+    chunks, current, size = [], [], 0
+    for record_id in ids:
+        n = len(str(record_id)) + 1
+        if current and size + n > max_chars:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(record_id)
+        size += n
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def cached_rows(cache: TTLCache, ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """Rows for ``ids`` still fresh in a get_by_id cache, keyed by str(id)"""
+    found = {}
+    for record_id in dict.fromkeys(ids):
+        cached = cache.get(id_key(record_id))
+        if cached is not None:
+            found[str(record_id)] = cached.data
+    return found
+
+
+def collect_rows(rows: List[Dict[str, Any]], found: Dict[str, Dict[str, Any]], cache: Optional[TTLCache] = None):
+    """Index fetched rows by str(id), seeding the get_by_id cache with full rows when given"""
+    for row in rows:
+        found[str(row["id"])] = row
+        if cache is not None:
+            cache.set(id_key(row["id"]), InterviewerGeminiResponse(success=True, data=row, count=1))
+
+
+def select_columns(columns: Optional[Sequence[str]] = None, required: Sequence[str] = ()) -> str:
+    """Build a select projection, always including the ``required`` columns"""
+    if not columns:
+        return "*"
+    return ",".join(dict.fromkeys([*required, *columns]))
+
+
 class InterviewerGeminiService:
     """Service class for managing interviewer_gemini table operations"""
     
-    def __init__(self, supabase_url: str, supabase_key: str):
+    def __init__(self, supabase_url: str, supabase_key: str, cache_ttl: float = 300.0, cache_size: int = 1024):
         """
         Initialize the Supabase client
         
         Args:
             supabase_url (str): Your Supabase project URL
             supabase_key (str): Your Supabase anon key
+            cache_ttl (float): Seconds get_by_id/get_with_filters results stay cached
+            cache_size (int): Max cached lookups before LRU eviction
         """
         try:
             self.supabase: Client = create_client(supabase_url, supabase_key)
             self.table_name = "interviewer_gemini"
+            self.cache = TTLCache(cache_size, cache_ttl, should_cache=lambda r: r.success)
         except Exception as e:
             raise Exception(f"Failed to initialize Supabase client: {str(e)}")
     
@@ -62,8 +139,193 @@ class InterviewerGeminiService:
                 success=False,
                 error=f"Failed to fetch all records: {str(e)}"
             )
+
+    def iter_pages(self, page_size: int = 500, columns: Optional[Sequence[str]] = None,
+                   filters: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Walk the table in id order, one page per request, using keyset pagination
+
+        Each page is fetched with ``id > last id seen`` rather than an offset,
+        so every request costs the same however deep the walk is and memory
+        stays at one page.
+
+        Args:
+            page_size (int): Rows per request
+            columns (Optional[Sequence[str]]): Columns to fetch, ``id`` is always added; None fetches all
+            filters (Optional[Dict[str, Any]]): Dictionary of column:value pairs to filter by
+
+        Yields:
+            List[Dict[str, Any]]: One page of rows
+
+        Raises:
+            Exception: If a page request fails
+        """
+        select = select_columns(columns, required=("id",))
+        last_id = None
+        while True:
+            query = self.supabase.table(self.table_name).select(select)
+            for column, value in (filters or {}).items():
+                query = query.eq(column, value)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+
+            rows = query.order("id").limit(page_size).execute().data or []
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def iter_all(self, page_size: int = 500, columns: Optional[Sequence[str]] = None,
+                 filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream rows one at a time; see iter_pages"""
+        for page in self.iter_pages(page_size, columns, filters):
+            yield from page
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> InterviewerGeminiResponse:
+        """
+        Exact row count computed by the server, without transferring any rows
+
+        Args:
+            filters (Optional[Dict[str, Any]]): Dictionary of column:value pairs to filter by
+
+        Returns:
+            InterviewerGeminiResponse: Response object with count or error
+        """
+        try:
+            query = self.supabase.table(self.table_name).select("id", count="exact", head=True)
+            for column, value in (filters or {}).items():
+                query = query.eq(column, value)
+
+            response = query.execute()
+
+            return InterviewerGeminiResponse(success=True, count=response.count)
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to count records: {str(e)}"
+            )
     
+    def get_many(self, ids: Iterable[Any], columns: Optional[Sequence[str]] = None) -> InterviewerGeminiResponse:
+        """
+        Get several records by ID with as few requests as possible
+
+        IDs are fetched with ``id=in.(...)`` in URL-sized chunks; full-row
+        lookups are served from the cache where fresh and refill it.
+
+        Args:
+            ids (Iterable[Any]): IDs to fetch, duplicates allowed
+            columns (Optional[Sequence[str]]): Columns to fetch, ``id`` is always added; None fetches all
+
+        Returns:
+            InterviewerGeminiResponse: ``data`` is aligned with ``ids`` (None where no row exists),
+                ``count`` is the number of IDs found
+        """
+        try:
+            ids = list(ids)
+            found = cached_rows(self.cache, ids) if columns is None else {}
+            missing = [i for i in dict.fromkeys(ids) if str(i) not in found]
+
+            select = select_columns(columns, required=("id",))
+            for chunk in chunk_ids(missing):
+                response = self.supabase.table(self.table_name).select(select).in_("id", chunk).execute()
+                collect_rows(response.data or [], found, self.cache if columns is None else None)
+
+            data = [found.get(str(i)) for i in ids]
+            return InterviewerGeminiResponse(
+                success=True,
+                data=data,
+                count=sum(row is not None for row in data)
+            )
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to fetch records by IDs: {str(e)}"
+            )
+
+    def query(self, filters: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+              order_by: Optional[Sequence[str]] = None, limit: Optional[int] = None) -> InterviewerGeminiResponse:
+        """
+        Get records with equality, ``in`` and range filters in a single request
+
+        Args:
+            filters (Optional[Dict[str, Any]]): Scalar -> eq, list -> in, dict -> {op: value}
+                with op in eq/neq/gt/gte/lt/lte/in
+            columns (Optional[Sequence[str]]): Columns to fetch; None fetches all
+            order_by (Optional[Sequence[str]]): Columns to sort by, prefix with "-" for descending
+            limit (Optional[int]): Limit the number of records returned
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        try:
+            query = self.supabase.table(self.table_name).select(select_columns(columns))
+            for column, op, value in expand_filters(filters):
+                query = query.in_(column, value) if op == "in" else getattr(query, op)(column, value)
+            for column, descending in parse_order(order_by):
+                query = query.order(column, desc=descending)
+            if limit:
+                query = query.limit(limit)
+
+            response = query.execute()
+
+            return InterviewerGeminiResponse(
+                success=True,
+                data=response.data,
+                count=len(response.data) if response.data else 0
+            )
+
+        except Exception as e:
+            return InterviewerGeminiResponse(
+                success=False,
+                error=f"Failed to query records: {str(e)}"
+            )
+
     def get_by_id(self, record_id: Any) -> InterviewerGeminiResponse:
+        """
+        Get a single record by ID, served from the cache when fresh
+
+        Args:
+            record_id (Any): The ID of the record to fetch
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        return self.cache.get_or_load(id_key(record_id), lambda: self._fetch_by_id(record_id))
+
+    def get_with_filters(self, filters: Dict[str, Any]) -> InterviewerGeminiResponse:
+        """
+        Get records matching AND-ed equality filters, served from the cache when fresh
+
+        Args:
+            filters (Dict[str, Any]): Dictionary of column:value pairs to filter by
+
+        Returns:
+            InterviewerGeminiResponse: Response object with data or error
+        """
+        filters = dict(filters)
+        return self.cache.get_or_load(filters_key(filters), lambda: self._fetch_with_filters(filters))
+
+    def invalidate(self, record_id: Optional[Any] = None):
+        """
+        Drop cached lookups after a write
+
+        Args:
+            record_id (Optional[Any]): Record that changed; None clears the whole cache.
+                Filter results are always dropped since the change may affect them.
+        """
+        if record_id is None:
+            self.cache.invalidate()
+            return
+        self.cache.invalidate(id_key(record_id))
+        self.cache.invalidate_where(lambda key: key[0] == "filters")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def _fetch_by_id(self, record_id: Any) -> InterviewerGeminiResponse:
         """
         Get a single record by ID from interviewer_gemini table
         
@@ -94,7 +356,7 @@ class InterviewerGeminiService:
                 error=f"Failed to fetch record with ID {record_id}: {str(e)}"
             )
     
-    def get_with_filters(self, filters: Dict[str, Any]) -> InterviewerGeminiResponse:
+    def _fetch_with_filters(self, filters: Dict[str, Any]) -> InterviewerGeminiResponse:
         """
         Get records with custom filters
         
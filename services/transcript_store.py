@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from services.logging_utils import get_logger
+
+logger = get_logger("transcript_store")
+
+
+@dataclass
+class TranscriptTurn:
+    """One finished utterance by either speaker"""
+    session_id: str
+    index: int
+    speaker: str
+    text: str
+    started_at: float
+    ended_at: float
+
+    def label(self) -> str:
+        return f"{self.speaker}: {self.text}"
+
+
+class TurnBuffer:
+    """Collects transcription fragments for one speaker; joined once at the end of the turn"""
+
+    __slots__ = ("parts", "started_at")
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.started_at: Optional[float] = None
+
+    def append(self, chunk: str):
+        if not chunk:
+            return
+        if self.started_at is None:
+            self.started_at = time.time()
+        self.parts.append(chunk)
+
+    def text(self) -> str:
+        return "".join(self.parts).strip()
+
+
+class TranscriptStore:
+    """Per-session transcript: a bounded in-memory tail plus an append-only JSONL file.
+
+    ``add_turn`` only enqueues; a background task batches the queued turns
+    and appends them from a worker thread, so the receive loop never waits
+    on disk.  Each batch is flushed, so after a crash ``load_transcript``
+    recovers every turn that reached the writer.
+    """
+
+    def __init__(self, directory: str, session_id: str, keep_in_memory: int = 50, batch_size: int = 64):
+        """
+        Args:
+            directory (str): Where <session_id>.jsonl is written
+            session_id (str): Session the turns belong to
+            keep_in_memory (int): Number of recent turns kept for in-process use
+            batch_size (int): Max turns written per worker-thread call
+        """
+        self.session_id = session_id
+        self.path = os.path.join(directory, f"{session_id}.jsonl")
+        self.recent: deque = deque(maxlen=keep_in_memory)
+        self.batch_size = batch_size
+        self.turn_count = 0
+
+        self._directory = directory
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+        self._file = None
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def add_turn(self, speaker: str, text: str, started_at: Optional[float] = None) -> Optional[TranscriptTurn]:
+        text = text.strip()
+        if not text:
+            return None
+        now = time.time()
+        self.turn_count += 1
+        turn = TranscriptTurn(
+            session_id=self.session_id,
+            index=self.turn_count,
+            speaker=speaker,
+            text=text,
+            started_at=started_at or now,
+            ended_at=now,
+        )
+        self.recent.append(turn)
+        self._queue.put_nowait(turn)
+        return turn
+
+    def lines(self) -> List[str]:
+        """Recent turns as "Speaker: text" strings"""
+        return [turn.label() for turn in self.recent]
+
+    async def aclose(self):
+        """Write everything still queued, then stop the writer"""
+        if self._writer is not None:
+            await self._queue.join()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        if self._file is not None:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+    async def _write_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                lines = "".join(json.dumps(asdict(turn), ensure_ascii=False) + "\n" for turn in batch)
+                await asyncio.to_thread(self._append, lines)
+            except Exception as e:      # a failed batch is lost, but the writer keeps going
+                logger.error("Failed to persist %d transcript turns to %s: %r", len(batch), self.path, e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _append(self, lines: str):
+        if self._file is None:
+            os.makedirs(self._directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(lines)
+        self._file.flush()
+
+
+def load_transcript(path: str) -> List[TranscriptTurn]:
+    """
+    Rebuild a session's turns from its JSONL file
+
+    A torn final line (process killed mid-write) is ignored.
+
+    Args:
+        path (str): Path to a <session_id>.jsonl transcript
+
+    Returns:
+        List[TranscriptTurn]: Turns in the order they were written
+    """
+    turns = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                turns.append(TranscriptTurn(**json.loads(line)))
+            except (json.JSONDecodeError, TypeError):
+                continue
+    return turns
+
+
+if __name__ == "__main__":
+    # Replay a transcript: python -m services.transcript_store transcripts/<session_id>.jsonl
+    for turn in load_transcript(sys.argv[1]):
+        print(turn.label())
@@ -0,0 +1,118 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from services import metrics
+
+# Histogram children bound once; stage names match TurnTrace.stages()
+_STAGES = ("uplink_to_model_audio", "transcription_to_model_audio", "model_audio_to_playout", "end_to_end")
+_STAGE_HISTOGRAMS = {stage: metrics.TURN_LATENCY.labels(stage=stage) for stage in _STAGES}
+_CONTEXT_HISTOGRAMS = {context: metrics.CONTEXT_TURN_LATENCY.labels(context=context) for context in ("full", "compressed")}
+
+
+@dataclass
+class TurnTrace:
+    """Monotonic timestamps for one Gemini turn (None when the event never happened)"""
+    index: int
+    started_at: float
+    wall_started_at: float = field(default_factory=time.time)
+    last_uplink: Optional[float] = None
+    first_input_transcription: Optional[float] = None
+    last_input_transcription: Optional[float] = None
+    first_model_audio: Optional[float] = None
+    first_playout: Optional[float] = None
+    ended_at: Optional[float] = None
+
+    def stages(self) -> Dict[str, float]:
+        """Latency of each stage that has both endpoints, in seconds"""
+        pairs = {
+            "uplink_to_model_audio": (self.last_uplink, self.first_model_audio),
+            "transcription_to_model_audio": (self.first_input_transcription, self.first_model_audio),
+            "model_audio_to_playout": (self.first_model_audio, self.first_playout),
+            "end_to_end": (self.last_uplink, self.first_playout),
+        }
+        return {name: end - start for name, (start, end) in pairs.items()
+                if start is not None and end is not None}
+
+    def to_dict(self) -> Dict[str, Any]:
+        def rel(t):
+            return round(t - self.started_at, 4) if t is not None else None
+
+        return {
+            "turn": self.index,
+            "started_at": self.wall_started_at,
+            "last_uplink": rel(self.last_uplink),
+            "first_input_transcription": rel(self.first_input_transcription),
+            "last_input_transcription": rel(self.last_input_transcription),
+            "first_model_audio": rel(self.first_model_audio),
+            "first_playout": rel(self.first_playout),
+            "ended_at": rel(self.ended_at),
+            "stages": {k: round(v, 4) for k, v in self.stages().items()},
+        }
+
+
+class TurnTracer:
+    """Per-session turn timeline, from the last forwarded mic frame to the first frame played.
+
+    The relay calls the hooks in the order events happen; every hook is a
+    clock read plus attribute stores, so they are safe on the audio path.
+    """
+
+    def __init__(self, max_turns: int = 200):
+        self.turns: deque = deque(maxlen=max_turns)
+        self._current: Optional[TurnTrace] = None
+        self._awaiting_playout: Optional[TurnTrace] = None
+        self._last_uplink: Optional[float] = None
+        self._count = 0
+        self.context = "full"       # "compressed" once the session's context has been cut down
+
+    def uplink_sent(self):
+        self._last_uplink = time.monotonic()
+
+    def message(self) -> TurnTrace:
+        """Any message of the current turn; opens a new trace if none is open"""
+        if self._current is None:
+            self._count += 1
+            self._current = TurnTrace(index=self._count, started_at=time.monotonic())
+            self.turns.append(self._current)
+        return self._current
+
+    def input_transcription(self):
+        trace = self.message()
+        now = time.monotonic()
+        if trace.first_input_transcription is None:
+            trace.first_input_transcription = now
+        if trace.first_model_audio is None:
+            trace.last_input_transcription = now
+
+    def model_audio(self):
+        trace = self.message()
+        if trace.first_model_audio is not None:
+            return
+        now = trace.first_model_audio = time.monotonic()
+        trace.last_uplink = self._last_uplink
+        anchor = trace.last_input_transcription or trace.started_at
+        metrics.TIME_TO_FIRST_AUDIO.observe(now - anchor)
+        _CONTEXT_HISTOGRAMS[self.context].observe(now - anchor)
+        self._awaiting_playout = trace
+
+    def playout(self):
+        trace = self._awaiting_playout
+        if trace is None:
+            return
+        self._awaiting_playout = None
+        trace.first_playout = time.monotonic()
+        for stage, value in trace.stages().items():
+            _STAGE_HISTOGRAMS[stage].observe(value)
+
+    def end_turn(self):
+        trace = self._current
+        if trace is None:
+            return
+        self._current = None
+        trace.ended_at = time.monotonic()
+        metrics.TURN_DURATION.observe(trace.ended_at - trace.started_at)
+
+    def dump(self) -> List[Dict[str, Any]]:
+        return [trace.to_dict() for trace in self.turns]
@@ -1,10 +1,18 @@
 import asyncio
-import struct
+import logging
 import time
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 import uvicorn
 
+from audio.analysis import LevelMonitor, analyze
+from audio.framing import FRAME_MIC, FRAME_SPEAKER, encode_frame, parse_frame
+from services.logging_utils import LogSampler, RateCounter, get_logger
+
 app = FastAPI()
+logger = get_logger("test_server")
+
+# Log the full breakdown of one chunk in every N (DEBUG level only)
+CHUNK_DETAIL_EVERY = 50
 
 class AudioTestHandler:
     def __init__(self):
@@ -12,6 +20,9 @@ class AudioTestHandler:
         self.active = True
         self.audio_count = 0
         self.start_time = time.time()
+        self.counters = RateCounter(logger, "audio", interval=1.0, level=logging.INFO)
+        self.detail_sampler = LogSampler(every=CHUNK_DETAIL_EVERY)
+        self.levels = LevelMonitor()
         
     def set_websocket(self, ws):
         self.ws = ws
@@ -25,102 +36,89 @@ class AudioTestHandler:
                 
                 # Parse the frame (assuming same format as your main server)
                 if len(data) < 1:
-                    print("Received empty data")
+                    logger.warning("Received empty data")
                     continue
                     
-                flag = data[0]
-                audio_data = data[1:]
+                frame = parse_frame(data)
+                flag = frame.kind
+                audio_data = frame.payload
                 
                 self.audio_count += 1
-                current_time = time.time()
-                elapsed = current_time - self.start_time
-                
-                print(f"[{elapsed:.2f}s] Audio chunk #{self.audio_count}")
-                print(f"  - Flag: 0x{flag:02x}")
-                print(f"  - Data length: {len(audio_data)} bytes")
-                
-                if flag == 0x01:
-                    print("  - Type: Microphone audio")
-                elif flag == 0x02:
-                    print("  - Type: Speaker audio")
-                else:
-                    print(f"  - Type: Unknown (flag={flag})")
-                    
-                # Print first few bytes as hex for debugging
-                if len(audio_data) > 0:
-                    hex_sample = ' '.join(f'{b:02x}' for b in audio_data[:min(16, len(audio_data))])
-                    print(f"  - First bytes: {hex_sample}{'...' if len(audio_data) > 16 else ''}")
-                    
-                # Check if it looks like valid PCM audio data
-                if len(audio_data) >= 2:
-                    # Try to interpret as 16-bit PCM samples
-                    try:
-                        sample_count = len(audio_data) // 2
-                        samples = struct.unpack(f'<{sample_count}h', audio_data[:sample_count*2])
-                        max_amplitude = max(abs(s) for s in samples[:min(100, sample_count)])
-                        print(f"  - Samples: {sample_count}, Max amplitude: {max_amplitude}")
-                        
-                        # Check for silence (very low amplitude)
-                        if max_amplitude < 100:
-                            print("  - WARNING: Audio appears to be mostly silence")
-                        elif max_amplitude > 30000:
-                            print("  - Note: High amplitude detected (possible clipping)")
-                        else:
-                            print("  - Audio levels look normal")
-                            
-                    except struct.error:
-                        print("  - Could not parse as 16-bit PCM")
-                
-                print("  " + "-" * 50)
+                self.counters.add("chunks")
+                self.counters.add("bytes", len(audio_data))
+                levels = self.levels.update(audio_data) if flag == FRAME_MIC else None
+
+                if self.detail_sampler() and logger.isEnabledFor(logging.DEBUG):
+                    self._log_chunk_details(flag, audio_data, levels)
                 
                 # Send a simple response back (optional)
-                if flag == 0x01:  # If it's mic audio, send back a simple response
-                    response = struct.pack("B", 0x02) + b"test response"
+                if flag == FRAME_MIC:  # If it's mic audio, send back a simple response
+                    response = encode_frame(FRAME_SPEAKER, b"test response")
                     await self.ws.send_bytes(response)
                     
         except WebSocketDisconnect:
-            print("WebSocket disconnected")
+            logger.info("WebSocket disconnected")
             self.active = False
         except Exception as e:
-            print(f"Error in listen_and_log: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in listen_and_log: %s", e)
             self.active = False
     
+    def _log_chunk_details(self, flag, audio_data, levels=None):
+        """Describe one chunk; only called for sampled chunks at DEBUG level"""
+        elapsed = time.time() - self.start_time
+        if flag == FRAME_MIC:
+            kind = "Microphone audio"
+        elif flag == FRAME_SPEAKER:
+            kind = "Speaker audio"
+        else:
+            kind = f"Unknown (flag={flag})"
+
+        hex_sample = ' '.join(f'{b:02x}' for b in audio_data[:16])
+        # Interpret the payload as 16-bit PCM, over the whole chunk
+        if levels is None:
+            levels = analyze(audio_data)
+        description = levels.describe() if levels.samples else "too short for PCM"
+
+        logger.debug(
+            "[%.2fs] chunk #%d flag=0x%02x type=%s len=%d first_bytes=%s%s %s",
+            elapsed, self.audio_count, flag, kind, len(audio_data),
+            hex_sample, '...' if len(audio_data) > 16 else '', description,
+        )
+
     async def send_periodic_status(self):
         """Send periodic status updates"""
         try:
             while self.active:
                 await asyncio.sleep(5)  # Every 5 seconds
                 elapsed = time.time() - self.start_time
-                print(f"\n[STATUS] Running for {elapsed:.1f}s, received {self.audio_count} audio chunks")
+                logger.info("[STATUS] Running for %.1fs, received %d audio chunks", elapsed, self.audio_count)
+                if self.levels.frames:
+                    logger.info("[STATUS] Mic levels: %s", self.levels.stats())
                 if self.audio_count == 0:
-                    print("[STATUS] No audio received yet - check frontend connection")
-                print()
+                    logger.info("[STATUS] No audio received yet - check frontend connection")
         except Exception as e:
-            print(f"Error in status updates: {e}")
+            logger.error("Error in status updates: %s", e)
     
     async def run(self):
         """Main run loop"""
-        print("Audio test handler started")
-        print("Waiting for audio data...")
-        print("=" * 60)
+        logger.info("Audio test handler started, waiting for audio data")
         
         try:
             async with asyncio.TaskGroup() as tg:
                 tg.create_task(self.listen_and_log())
                 tg.create_task(self.send_periodic_status())
         except Exception as e:
-            print(f"Error in AudioTestHandler: {e}")
+            logger.error("Error in AudioTestHandler: %s", e)
         finally:
             self.active = False
-            print("Audio test handler stopped")
+            self.counters.emit()
+            logger.info("Audio test handler stopped")
 
 
 @app.websocket("/ws/audio")
 async def audio_test_ws(ws: WebSocket):
     await ws.accept()
-    print(f"WebSocket connected from: {ws.client}")
+    logger.info("WebSocket connected from: %s", ws.client)
     
     handler = AudioTestHandler()
     handler.set_websocket(ws)
@@ -128,11 +126,9 @@ async def audio_test_ws(ws: WebSocket):
     try:
         await handler.run()
     except WebSocketDisconnect:
-        print("Client disconnected")
+        logger.info("Client disconnected")
     except Exception as e:
-        print(f"WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("WebSocket error: %s", e)
 
 
 @app.get("/")
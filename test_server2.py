@@ -1,8 +1,9 @@
 import asyncio
-import struct
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 import uvicorn
 
+from audio.framing import FRAME_SPEAKER, FrameWriter
+
 app = FastAPI()
 
 # Audio configuration to match your original code
@@ -37,10 +38,11 @@ async def read_audio_chunks():
 async def audio_ws(ws: WebSocket):
     """WebSocket endpoint to send prerecorded or simulated audio to the frontend."""
     await ws.accept()
+    writer = FrameWriter(FRAME_SPEAKER, sample_rate=RECV_SR, capacity=CHUNK)
     try:
         async for chunk in read_audio_chunks():
             # Frame the audio chunk with 0x02 prefix, matching your play_audio method
-            msg = struct.pack("B", 0x02) + chunk
+            msg = writer.build(chunk)
             await ws.send_bytes(msg)
             print(f"Sent {len(chunk)} bytes of audio data")
     except WebSocketDisconnect:
@@ -1,12 +1,21 @@
 import asyncio
-import struct
+import logging
 import time
 from datetime import datetime
 import os
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 import uvicorn
 
+from audio.analysis import LevelMonitor, analyze
+from audio.framing import FRAME_MIC, FRAME_SPEAKER, encode_frame, parse_frame
+from services.logging_utils import LogSampler, RateCounter, get_logger
+from services.recorder import SessionRecorder
+
 app = FastAPI()
+logger = get_logger("test_server3")
+
+# Log the full breakdown of one chunk in every N (DEBUG level only)
+CHUNK_DETAIL_EVERY = 50
 
 class AudioTestHandler:
     def __init__(self):
@@ -14,9 +23,11 @@ class AudioTestHandler:
         self.active = True
         self.audio_count = 0
         self.start_time = time.time()
-        self.mic_file = None
-        self.speaker_file = None
+        self.recorder = None
         self.output_dir = "audio_logs"
+        self.counters = RateCounter(logger, "audio", interval=1.0, level=logging.INFO)
+        self.detail_sampler = LogSampler(every=CHUNK_DETAIL_EVERY)
+        self.levels = LevelMonitor()
         self.stream_info = {
             "mic_chunks": 0,
             "speaker_chunks": 0,
@@ -32,22 +43,16 @@ class AudioTestHandler:
     def set_websocket(self, ws):
         self.ws = ws
         
-    def _get_timestamped_filename(self, audio_type):
-        """Generate a timestamped filename for audio output"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return os.path.join(self.output_dir, f"{audio_type}_{timestamp}.pcm")
-        
     def _open_audio_files(self):
-        """Open new audio files for writing"""
-        self.mic_file = open(self._get_timestamped_filename("mic"), "wb")
-        self.speaker_file = open(self._get_timestamped_filename("speaker"), "wb")
+        """Start streaming raw mic/speaker captures to timestamped .pcm files"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.recorder = SessionRecorder(self.output_dir, timestamp, {"mic": 48000, "speaker": 24000}, wav=False)
+        self.recorder.start()
         
-    def _close_audio_files(self):
-        """Close audio files if open"""
-        if self.mic_file:
-            self.mic_file.close()
-        if self.speaker_file:
-            self.speaker_file.close()
+    async def _close_audio_files(self):
+        """Write what is still buffered and close the files"""
+        if self.recorder:
+            await self.recorder.aclose()
             
     async def listen_and_log(self):
         """Listen for audio data, save it, and log stream details"""
@@ -58,125 +63,109 @@ class AudioTestHandler:
                 data = await self.ws.receive_bytes()
                 
                 if len(data) < 1:
-                    print("Received empty data")
+                    logger.warning("Received empty data")
                     continue
                     
-                flag = data[0]
-                audio_data = data[1:]
+                frame = parse_frame(data)
+                flag = frame.kind
+                audio_data = frame.payload
                 
                 self.audio_count += 1
                 self.stream_info["total_bytes"] += len(audio_data)
-                current_time = time.time()
-                elapsed = current_time - self.start_time
-                
-                # Log detailed stream information
-                print(f"\n[{elapsed:.2f}s] Audio chunk #{self.audio_count}")
-                print(f"  - Flag: 0x{flag:02x}")
-                print(f"  - Data length: {len(audio_data)} bytes")
+                self.counters.add("chunks")
+                self.counters.add("bytes", len(audio_data))
+                levels = None
                 
-                # Save audio data and log type
-                if flag == 0x01:
-                    print("  - Type: Microphone audio")
+                # Save audio data
+                if flag == FRAME_MIC:
                     self.stream_info["mic_chunks"] += 1
-                    self.mic_file.write(audio_data)
-                    self.mic_file.flush()
-                elif flag == 0x02:
-                    print("  - Type: Speaker audio")
+                    levels = self.levels.update(audio_data)
+                    self.recorder.write("mic", audio_data)
+                elif flag == FRAME_SPEAKER:
                     self.stream_info["speaker_chunks"] += 1
-                    self.speaker_file.write(audio_data)
-                    self.speaker_file.flush()
-                else:
-                    print(f"  - Type: Unknown (flag={flag})")
-                    
-                # Print first few bytes as hex for debugging
-                if len(audio_data) > 0:
-                    hex_sample = ' '.join(f'{b:02x}' for b in audio_data[:min(16, len(audio_data))])
-                    print(f"  - First bytes: {hex_sample}{'...' if len(audio_data) > 16 else ''}")
-                    
-                # Analyze audio data
-                if len(audio_data) >= 2:
-                    try:
-                        sample_count = len(audio_data) // 2
-                        samples = struct.unpack(f'<{sample_count}h', audio_data[:sample_count*2])
-                        max_amplitude = max(abs(s) for s in samples[:min(100, sample_count)])
-                        print(f"  - Samples: {sample_count}, Max amplitude: {max_amplitude}")
-                        
-                        # Log stream characteristics
-                        print(f"  - Stream Info:")
-                        print(f"    - Bit depth: {self.stream_info['bit_depth']} bits")
-                        print(f"    - Total bytes received: {self.stream_info['total_bytes']}")
-                        print(f"    - Microphone chunks: {self.stream_info['mic_chunks']}")
-                        print(f"    - Speaker chunks: {self.stream_info['speaker_chunks']}")
-                        
-                        if max_amplitude < 100:
-                            print("  - WARNING: Audio appears to be mostly silence")
-                        elif max_amplitude > 30000:
-                            print("  - Note: High amplitude detected (possible clipping)")
-                        else:
-                            print("  - Audio levels look normal")
-                            
-                    except struct.error:
-                        print("  - Could not parse as 16-bit PCM")
-                
-                print("  " + "-" * 50)
+                    self.recorder.write("speaker", audio_data)
+
+                if self.detail_sampler() and logger.isEnabledFor(logging.DEBUG):
+                    self._log_chunk_details(flag, audio_data, levels)
                 
                 # Send a simple response back (optional)
-                if flag == 0x01:
-                    response = struct.pack("B", 0x02) + b"test response"
+                if flag == FRAME_MIC:
+                    response = encode_frame(FRAME_SPEAKER, b"test response")
                     await self.ws.send_bytes(response)
                     
         except WebSocketDisconnect:
-            print("WebSocket disconnected")
+            logger.info("WebSocket disconnected")
             self.active = False
         except Exception as e:
-            print(f"Error in listen_and_log: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in listen_and_log: %s", e)
             self.active = False
         finally:
-            self._close_audio_files()
+            await self._close_audio_files()
     
+    def _log_chunk_details(self, flag, audio_data, levels=None):
+        """Describe one chunk; only called for sampled chunks at DEBUG level"""
+        elapsed = time.time() - self.start_time
+        if flag == FRAME_MIC:
+            kind = "Microphone audio"
+        elif flag == FRAME_SPEAKER:
+            kind = "Speaker audio"
+        else:
+            kind = f"Unknown (flag={flag})"
+
+        hex_sample = ' '.join(f'{b:02x}' for b in audio_data[:16])
+        # Analyze audio data, over the whole chunk
+        if levels is None:
+            levels = analyze(audio_data)
+        description = levels.describe() if levels.samples else "too short for PCM"
+
+        logger.debug(
+            "[%.2fs] chunk #%d flag=0x%02x type=%s len=%d first_bytes=%s%s %s "
+            "total_bytes=%d mic_chunks=%d speaker_chunks=%d",
+            elapsed, self.audio_count, flag, kind, len(audio_data),
+            hex_sample, '...' if len(audio_data) > 16 else '', description,
+            self.stream_info["total_bytes"], self.stream_info["mic_chunks"],
+            self.stream_info["speaker_chunks"],
+        )
+
     async def send_periodic_status(self):
         """Send periodic status updates with stream summary"""
         try:
             while self.active:
                 await asyncio.sleep(5)
                 elapsed = time.time() - self.start_time
-                print(f"\n[STATUS] Running for {elapsed:.1f}s")
-                print(f"  - Total audio chunks: {self.audio_count}")
-                print(f"  - Microphone chunks: {self.stream_info['mic_chunks']}")
-                print(f"  - Speaker chunks: {self.stream_info['speaker_chunks']}")
-                print(f"  - Total bytes received: {self.stream_info['total_bytes']}")
-                print(f"  - Audio files saved in: {self.output_dir}")
+                logger.info(
+                    "[STATUS] Running for %.1fs: chunks=%d mic=%d speaker=%d bytes=%d dir=%s",
+                    elapsed, self.audio_count, self.stream_info['mic_chunks'],
+                    self.stream_info['speaker_chunks'], self.stream_info['total_bytes'], self.output_dir,
+                )
+                if self.levels.frames:
+                    logger.info("[STATUS] Mic levels: %s", self.levels.stats())
                 if self.audio_count == 0:
-                    print("[STATUS] No audio received yet - check frontend connection")
-                print()
+                    logger.info("[STATUS] No audio received yet - check frontend connection")
         except Exception as e:
-            print(f"Error in status updates: {e}")
+            logger.error("Error in status updates: %s", e)
     
     async def run(self):
         """Main run loop"""
-        print("Audio test handler started")
-        print(f"Saving audio to: {self.output_dir}")
-        print("Waiting for audio data...")
-        print("=" * 60)
+        logger.info("Audio test handler started, saving audio to %s", self.output_dir)
         
         try:
             async with asyncio.TaskGroup() as tg:
                 tg.create_task(self.listen_and_log())
                 tg.create_task(self.send_periodic_status())
         except Exception as e:
-            print(f"Error in AudioTestHandler: {e}")
+            logger.error("Error in AudioTestHandler: %s", e)
         finally:
             self.active = False
-            self._close_audio_files()
-            print("Audio test handler stopped")
+            await self._close_audio_files()
+            self.counters.emit()
+            logger.info("Audio test handler stopped")
 
 
 @app.websocket("/ws/audio")
 async def audio_test_ws(ws: WebSocket):
     await ws.accept()
-    print(f"WebSocket connected from: {ws.client}")
+    logger.info("WebSocket connected from: %s", ws.client)
     
     handler = AudioTestHandler()
     handler.set_websocket(ws)
@@ -184,11 +173,9 @@ async def audio_test_ws(ws: WebSocket):
     try:
         await handler.run()
     except WebSocketDisconnect:
-        print("Client disconnected")
+        logger.info("Client disconnected")
     except Exception as e:
-        print(f"WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("WebSocket error: %s", e)
 
 
 @app.get("/")
@@ -0,0 +1,79 @@
+"""Shared fixtures: the relay's AudioLoop wired to tools.fake_live instead of Gemini.
+
+The relay side (fastapi, google-genai) is imported inside the fixtures that
+need it, so pure unit tests collect without those installed.
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "fake-live")   # main builds a real client at import
+
+from audio.framing import FRAME_MIC, FRAME_TEXT, encode_frame
+
+# Fast fake: no connect or think time, replies sent in one go
+FAST = dict(connect_ms=0.0, latency_ms=0.0, pace=0.0, chunk_ms=40.0, reply_s=0.2, turn_every_s=3600.0)
+
+
+class FakeBrowser:
+    """Stands in for the browser's WebSocket on /ws/audio"""
+
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent = []
+
+    def say(self, text: str):
+        self.incoming.put_nowait(encode_frame(FRAME_TEXT, text.encode()))
+
+    def mic(self, pcm: bytes):
+        self.incoming.put_nowait(encode_frame(FRAME_MIC, pcm))
+
+    def close(self):
+        self.incoming.put_nowait(None)
+
+    async def receive_bytes(self) -> bytes:
+        data = await self.incoming.get()
+        if data is None:
+            from fastapi import WebSocketDisconnect
+            raise WebSocketDisconnect()
+        return data
+
+    async def send_bytes(self, data):
+        self.sent.append(bytes(data))
+
+
+async def until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the relay")
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def relay(monkeypatch, tmp_path):
+    """``main`` with a fast FakeLiveClient, no uplink VAD and no reconnect backoff"""
+    import main
+    from tools.fake_live import FakeLiveClient, FakeLiveOptions
+
+    fake = FakeLiveClient(FakeLiveOptions(**FAST))
+    monkeypatch.setattr(main, "client", fake)
+    monkeypatch.setattr(main, "TRANSCRIPT_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "UPLINK_VAD", "off")
+    monkeypatch.setattr(main, "RECONNECT_BACKOFF_S", 0.0)
+    return main
+
+
+def start_loop(main):
+    """An AudioLoop running against a FakeBrowser; returns (loop, browser, task)"""
+    loop = main.AudioLoop()
+    browser = FakeBrowser()
+    loop.set_websocket(browser)
+    return loop, browser, asyncio.create_task(loop.run())
+
+
+async def stop_loop(browser, task):
+    browser.close()
+    await asyncio.wait_for(task, 5)
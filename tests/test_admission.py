@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+
+from services.session_manager import SessionManager
+
+
+def test_queued_client_is_told_when_admitted(relay, monkeypatch):
+    monkeypatch.setattr(relay, "sessions", SessionManager(max_sessions=1, update_interval=60.0))
+
+    with TestClient(relay.app) as client:
+        with client.websocket_connect("/ws/audio") as first:
+            with client.websocket_connect("/ws/audio") as second:
+                assert second.receive_json()["type"] == "queued"
+                first.close()
+                # Admitted well within half a second of queueing, and still told so
+                admitted = second.receive_json()
+                assert admitted["type"] == "admitted"
+                assert admitted["session_id"]
+
+
+def test_trace_of_unknown_session_is_404(relay):
+    with TestClient(relay.app) as client:
+        response = client.get("/sessions/nope/trace")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Session not found"}
@@ -0,0 +1,50 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from audio.resampler import StreamingResampler
+from tools import archive_audio
+
+soundfile = pytest.importorskip("soundfile")
+
+
+def capture(path, seconds: float, rate: int = 48000, age_s: float = 3600.0):
+    samples = (np.sin(np.arange(int(seconds * rate)) * 0.05) * 8000).astype("<i2")
+    with open(path, "wb") as f:
+        f.write(samples.tobytes())
+    stamp = time.time() - age_s
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_recent_files_are_left_alone(tmp_path):
+    logs = tmp_path / "audio_logs"
+    logs.mkdir()
+    old = capture(logs / "mic_old.pcm", 1.0)
+    live = capture(logs / "mic_live.pcm", 1.0, age_s=1)
+    empty_old = capture(logs / "mic_empty_old.pcm", 0)
+    empty_live = capture(logs / "mic_empty_live.pcm", 0, age_s=1)
+
+    argv = [str(logs), "--out", str(tmp_path / "archive"), "--workers", "1", "--min-age-s", "60",
+            "--delete-originals"]
+    assert archive_audio.main_cli(argv) == 0
+    assert not old.exists() and not empty_old.exists()
+    assert live.exists() and empty_live.exists()
+    assert os.path.exists(tmp_path / "archive" / "audio_logs" / "mic_old.flac")
+    assert not os.path.exists(tmp_path / "archive" / "audio_logs" / "mic_live.flac")
+
+
+def test_resampled_archive_keeps_the_tail(tmp_path):
+    source = capture(tmp_path / "mic_32k.pcm", 1.0, rate=32000)
+    job = archive_audio.Job(str(source), str(tmp_path / "out" / "mic_32k.opus"), os.path.getsize(source),
+                            os.stat(source).st_mtime_ns, 32000, "opus", None)
+    try:
+        entry = archive_audio.process(job)
+    except (RuntimeError, TypeError) as e:      # libsndfile built without Opus
+        pytest.skip(f"no Opus support in libsndfile: {e}")
+    assert entry["archive_rate"] == 48000
+    # The whole second, plus the filter delay the flush pushed out
+    expected = (32000 + StreamingResampler(32000, 48000).delay) * 48000 / 32000
+    assert soundfile.info(job.archive).frames >= int(expected)
@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.async_supabase_service import AsyncInterviewerGeminiService
+from services.supabase_service import chunk_ids
+from tools import stub_postgrest
+
+ROWS = 1000
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """tools/stub_postgrest.py served in-process with ROWS sample rows"""
+    monkeypatch.setattr(stub_postgrest.app.state, "rows", stub_postgrest.sample_rows(ROWS))
+    monkeypatch.setattr(stub_postgrest.app.state, "requests", 0)
+    return stub_postgrest
+
+
+def run(stub, calls, **options):
+    """Run ``calls(service)`` against the stub and return its result"""
+    options.setdefault("backoff_base", 0.001)
+
+    async def main():
+        transport = httpx.ASGITransport(app=stub.app)
+        async with AsyncInterviewerGeminiService("http://stub", "key", transport=transport, **options) as service:
+            return await calls(service)
+
+    return asyncio.run(main())
+
+
+def test_lookups_and_cache(stub):
+    async def calls(service):
+        first = await service.get_by_id(7)
+        again = await service.get_by_id(7)
+        missing = await service.get_by_id(ROWS + 1)
+        filtered = await service.get_with_filters({"status": "active", "duration_minutes": 15})
+        return first, again, missing, filtered
+
+    first, again, missing, filtered = run(stub, calls)
+    assert first.success and first.data["title"] == "Interview 7"
+    assert again.data == first.data
+    assert not missing.success
+    assert filtered.count == len([r for r in stub.sample_rows(ROWS) if r["status"] == "active" and r["duration_minutes"] == 15])
+    assert stub.app.state.requests == 3      # the repeated get_by_id was served from the cache
+
+
+def test_iter_pages_walks_the_table_by_keyset(stub):
+    async def calls(service):
+        return [page async for page in service.iter_pages(page_size=64, columns=["title"], filters={"status": "draft"})]
+
+    pages = run(stub, calls)
+    drafts = [r for r in stub.sample_rows(ROWS) if r["status"] == "draft"]
+    assert [len(page) for page in pages] == [64] * (len(drafts) // 64) + [len(drafts) % 64]
+    assert [row["id"] for page in pages for row in page] == [r["id"] for r in drafts]
+    assert set(pages[0][0]) == {"id", "title"}
+    assert stub.app.state.requests == len(pages)
+
+
+def test_count_uses_content_range(stub):
+    async def calls(service):
+        return await service.count(), await service.count({"status": "archived"}), await service.count({"id": 0})
+
+    total, archived, none = run(stub, calls)
+    assert (total.count, archived.count, none.count) == (ROWS, ROWS // 3, 0)
+
+
+def test_get_many_aligns_with_ids_across_chunks(stub):
+    ids = [5, ROWS + 10, 5, *range(1, ROWS + 1)]
+
+    async def calls(service):
+        await service.get_by_id(2)      # already cached: not asked for again
+        stub.app.state.requests = 0
+        return await service.get_many(ids)
+
+    result = run(stub, calls)
+    assert result.success
+    assert [row and row["id"] for row in result.data] == [5, None, 5, *range(1, ROWS + 1)]
+    assert result.count == len(ids) - 1
+    # Each uncached id asked for once, in several URL-sized in.(...) lists
+    missing = [i for i in dict.fromkeys(ids) if i != 2]
+    assert stub.app.state.requests == len(chunk_ids(missing)) > 1
+
+
+def test_query_with_ranges_in_and_order(stub):
+    async def calls(service):
+        return await service.query(
+            filters={"duration_minutes": {"gte": 30, "lt": 60}, "status": ["active", "archived"]},
+            columns=["id", "duration_minutes"],
+            order_by=["-duration_minutes", "id"],
+            limit=10,
+        )
+
+    result = run(stub, calls)
+    expected = sorted(
+        (r for r in stub.sample_rows(ROWS) if 30 <= r["duration_minutes"] < 60 and r["status"] in ("active", "archived")),
+        key=lambda r: (-r["duration_minutes"], r["id"]),
+    )[:10]
+    assert result.data == [{"id": r["id"], "duration_minutes": r["duration_minutes"]} for r in expected]
+
+
+def test_transient_failures_are_retried(stub, monkeypatch):
+    failures = iter([True, True, False])
+    monkeypatch.setattr(stub.random, "random", lambda: 0.0 if next(failures, False) else 1.0)
+    monkeypatch.setattr(stub, "FAIL_RATE", 0.5)
+
+    async def calls(service):
+        return await service.get_all(limit=5)
+
+    result = run(stub, calls)
+    assert result.success and result.count == 5
+    assert stub.app.state.requests == 3
@@ -0,0 +1,37 @@
+import builtins
+import importlib.util
+import logging
+
+import audio.codec
+
+
+def load_codec(monkeypatch, error):
+    """A fresh copy of audio.codec whose ``import opuslib`` raises ``error``"""
+    real_import = builtins.__import__
+
+    def failing_import(name, *args, **kwargs):
+        if name == "opuslib":
+            raise error
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", failing_import)
+    spec = importlib.util.spec_from_file_location("codec_under_test", audio.codec.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_broken_opuslib_falls_back_to_pcm(monkeypatch, caplog):
+    # opuslib raises a bare Exception when ctypes cannot find libopus
+    with caplog.at_level(logging.WARNING):
+        codec = load_codec(monkeypatch, Exception("Could not find Opus library"))
+    assert not codec.opus_available()
+    assert codec.negotiate("opus").name == codec.CODEC_PCM
+    assert "Could not find Opus library" in caplog.text
+
+
+def test_missing_opuslib_is_silent(monkeypatch, caplog):
+    with caplog.at_level(logging.WARNING):
+        codec = load_codec(monkeypatch, ImportError("No module named 'opuslib'"))
+    assert not codec.opus_available()
+    assert not caplog.records
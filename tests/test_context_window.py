@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from conftest import start_loop, stop_loop, until
+from services.context_window import ContextTracker, check_budget, estimate_tokens
+
+
+def long_turn(i: int) -> str:
+    return f"Turn {i} starts here. " + " ".join(f"word{i}-{n}" for n in range(60)) + ". What next?"
+
+
+def test_seed_text_stays_within_target():
+    tracker = ContextTracker(base_tokens=50, trigger_tokens=400, target_tokens=100, keep_turns=6)
+    for i in range(12):
+        tracker.add_turn("User" if i % 2 else "AI", long_turn(i))
+    seed = tracker.seed_text()
+    assert estimate_tokens(seed) <= 100
+    # Newest turn is still there, condensed if it did not fit verbatim
+    assert "Turn 11" in seed
+
+
+def test_seed_text_keeps_recent_turns_verbatim_when_they_fit():
+    tracker = ContextTracker(base_tokens=50, trigger_tokens=4000, target_tokens=2000, keep_turns=2)
+    for i, text in enumerate(["Hello there.", "Tell me about queues?", "They buffer work.", "Why bound them?"]):
+        tracker.add_turn("User" if i % 2 else "AI", text)
+    seed = tracker.seed_text()
+    assert "Most recent exchange:\nAI: They buffer work.\nUser: Why bound them?" in seed
+    assert "Earlier in the interview (condensed):\nAI: Hello there.\nUser: Tell me about queues?" in seed
+
+
+def test_check_budget():
+    check_budget(100, 1000, 800)
+    with pytest.raises(ValueError):
+        check_budget(113, 150, 100)
+
+
+def test_no_retrigger_until_context_grows():
+    tracker = ContextTracker(base_tokens=100, trigger_tokens=300, target_tokens=150)
+    tracker.observe_usage(320)
+    assert tracker.over_trigger
+    tracker.compressed(250)
+    tracker.observe_usage(310)      # Gemini reports more than estimated, but nothing new was said
+    assert not tracker.over_trigger
+    tracker.add_audio(50 / 32)      # one headroom's worth of new audio
+    assert tracker.over_trigger
+
+
+def test_reseed_does_not_loop(relay, monkeypatch):
+    monkeypatch.setattr(relay, "CONTEXT_COMPRESSION", "reseed")
+    monkeypatch.setattr(relay, "CONTEXT_TRIGGER_TOKENS", 400)
+    monkeypatch.setattr(relay, "CONTEXT_TARGET_TOKENS", 150)
+    relay.client.options.reply_s = 2.0      # ~64 tokens of audio plus ~125 of transcript per turn
+    turns = 12
+
+    async def main():
+        loop, browser, task = start_loop(relay)
+        for i in range(turns):
+            browser.say(long_turn(i))
+            await until(lambda: loop.transcript.turn_count >= i + 2)     # the prompt's answer, then one per turn
+        stats = loop.context.stats()
+        await stop_loop(browser, task)
+        return stats
+
+    stats = asyncio.run(main())
+    assert 1 <= stats["compressions"] < turns // 2
+    assert relay.client.connects == stats["compressions"] + 1
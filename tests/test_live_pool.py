@@ -0,0 +1,113 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from google.genai import errors
+
+from conftest import FAST, until
+from services.live_pool import LiveSessionPool
+from tools.fake_live import FakeLiveClient, FakeLiveOptions
+
+
+async def prime(session):
+    await session.send(input="prompt", end_of_turn=True)
+
+
+def make_pool(fake, **kwargs) -> LiveSessionPool:
+    kwargs.setdefault("size", 2)
+    kwargs.setdefault("check_interval", 60.0)
+    return LiveSessionPool(lambda: fake.aio.live.connect(model="m", config=None), prime=prime, **kwargs)
+
+
+def test_acquire_hands_out_primed_sessions_and_refills():
+    fake = FakeLiveClient(FakeLiveOptions(**FAST))
+
+    async def main():
+        pool = make_pool(fake)
+        assert await pool.acquire() is None     # not started: callers connect directly
+        pool.start()
+        await until(lambda: pool.idle_count == 2)
+        pooled = await pool.acquire()
+        assert pooled is not None
+        async with pooled as session:
+            assert session.turns_requested == 1     # primed before it was pooled
+            await until(lambda: pool.idle_count == 2)
+            assert fake.open_sessions == 3
+        assert fake.open_sessions == 2          # the owner closed its session
+        await pool.aclose()
+        assert fake.open_sessions == 0
+
+    asyncio.run(main())
+    assert fake.connects == 3
+
+
+def test_idle_sessions_are_recycled():
+    fake = FakeLiveClient(FakeLiveOptions(**FAST))
+
+    async def main():
+        pool = make_pool(fake, max_idle_s=0.05, check_interval=0.01)
+        pool.start()
+        await until(lambda: fake.connects >= 6)
+        assert fake.open_sessions <= 2
+        pooled = await pool.acquire()
+        if pooled is not None:
+            assert pooled.age < 0.05
+            await pooled.aclose()
+        await pool.aclose()
+
+    asyncio.run(main())
+
+
+def test_unhealthy_sessions_are_not_handed_out():
+    fake = FakeLiveClient(FakeLiveOptions(**FAST))
+
+    async def main():
+        pool = make_pool(fake)
+        pool.start()
+        await until(lambda: pool.idle_count == 2)
+        fake.drop_all()
+        assert await pool.acquire() is None     # both dead: closed and skipped
+        await until(lambda: pool.idle_count == 2)
+        assert fake.connects == 4               # replaced on demand, without waiting for a sweep
+        pooled = await pool.acquire()
+        assert not pooled.session.dropped
+        await pooled.aclose()
+        await pool.aclose()
+
+    asyncio.run(main())
+
+
+def test_sweep_replaces_dropped_sessions():
+    fake = FakeLiveClient(FakeLiveOptions(**FAST))
+
+    async def main():
+        pool = make_pool(fake, check_interval=0.01)
+        pool.start()
+        await until(lambda: pool.idle_count == 2)
+        fake.drop_all()
+        await until(lambda: fake.connects == 4 and pool.idle_count == 2)
+        assert fake.open_sessions == 2
+        await pool.aclose()
+
+    asyncio.run(main())
+
+
+def test_failed_connects_are_retried():
+    fake = FakeLiveClient(FakeLiveOptions(**FAST))
+    failures = [1]
+
+    @asynccontextmanager
+    async def flaky():
+        if failures:
+            failures.pop()
+            raise errors.APIError(1011, {"message": "unavailable"})
+        async with fake.aio.live.connect(model="m", config=None) as session:
+            yield session
+
+    async def main():
+        pool = LiveSessionPool(flaky, size=1, prime=prime, retry_delay=0.01)
+        pool.start()
+        await until(lambda: pool.idle_count == 1)
+        await pool.aclose()
+
+    asyncio.run(main())
+    assert fake.connects == 1
@@ -0,0 +1,156 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+from google.genai import errors
+
+from conftest import start_loop, stop_loop, until
+from services.context_window import AUDIO_TOKENS_PER_S
+from services.live_resume import UplinkReplayBuffer
+from tools.fake_live import FakeLiveSession
+
+
+def noise(seed: int, ms: int = 20) -> bytes:
+    """A distinct 48 kHz mic frame"""
+    return np.random.default_rng(seed).integers(-2000, 2000, 48 * ms, dtype=np.int16).tobytes()
+
+
+@pytest.fixture
+def uplink(monkeypatch):
+    """Audio each fake connection received, oldest first, keyed by its handle prefix (fake1, fake2, ...)"""
+    received = {}
+    original = FakeLiveSession.send_realtime_input
+
+    async def send_realtime_input(self, audio=None, **kwargs):
+        await original(self, audio=audio, **kwargs)
+        if isinstance(audio, dict):
+            received.setdefault(self.handle_prefix, []).append(bytes(audio["data"]))
+
+    monkeypatch.setattr(FakeLiveSession, "send_realtime_input", send_realtime_input)
+    return received
+
+
+def record_handles(fake):
+    """Resumption handle of every connect attempt, None for a fresh session"""
+    handles = []
+    connect = fake.aio.live.connect
+
+    def recording(model=None, config=None):
+        resumption = getattr(config, "session_resumption", None)
+        handles.append(resumption.handle if resumption else None)
+        return connect(model=model, config=config)
+
+    fake.aio.live.connect = recording
+    return handles
+
+
+async def drained(loop, browser):
+    """Everything the browser sent has gone upstream (or failed to)"""
+    await until(lambda: browser.incoming.empty() and loop.out_queue.empty())
+    await asyncio.sleep(0.05)
+
+
+def test_replay_buffer_keeps_recent_messages_after_ack():
+    now = [0.0]
+    buffer = UplinkReplayBuffer(max_bytes=100, ack_lag_s=0.5, clock=lambda: now[0])
+    buffer.record({"data": b"a" * 10})
+    now[0] = 1.0
+    buffer.record({"data": b"b" * 10})
+    now[0] = 1.2
+    buffer.ack()
+    assert [m["data"][:1] for m in buffer.take()] == [b"b"]
+    assert len(buffer) == 0
+
+
+@pytest.mark.parametrize("go_away", [False, True])
+def test_resumes_with_latest_handle(relay, go_away):
+    handles = record_handles(relay.client)
+
+    async def main():
+        loop, browser, task = start_loop(relay)
+        await until(lambda: loop.resume_handle == "fake1-2")     # issued after the prompt's answer
+        relay.client.drop_all(go_away=go_away)
+        await until(lambda: loop.reconnects == 1)
+        browser.say("Are you still there?")
+        await until(lambda: loop.transcript.turn_count >= 2)
+        await stop_loop(browser, task)
+
+    asyncio.run(main())
+    assert handles == [None, "fake1-2"]
+    assert relay.client.resumes == 1
+
+
+def test_replays_unacknowledged_uplink_in_order(relay, uplink):
+    async def main():
+        loop, browser, task = start_loop(relay)
+        await until(lambda: loop.resume_handle == "fake1-2")
+        for i in range(6):
+            browser.mic(noise(i))
+        await drained(loop, browser)
+        before = list(uplink["fake1"])
+        bytes_out = relay.BYTES_GEMINI_OUT.get()
+        tokens = loop.context.estimated
+
+        relay.client.drop_all()
+        for i in range(6, 10):
+            browser.mic(noise(i))
+        await until(lambda: loop.reconnects == 1)
+        await drained(loop, browser)
+        fresh = uplink["fake2"][len(before):]
+        counted = (relay.BYTES_GEMINI_OUT.get() - bytes_out, loop.context.estimated - tokens)
+        await stop_loop(browser, task)
+        return before, fresh, counted
+
+    before, fresh, (bytes_out, tokens) = asyncio.run(main())
+    assert before
+    assert uplink["fake2"][:len(before)] == before     # replayed first, in the original order
+    assert fresh
+    # Replayed audio is not counted again
+    assert bytes_out == sum(map(len, fresh))
+    assert tokens == pytest.approx(bytes_out / relay.GEMINI_SEND_BYTES_PER_S * AUDIO_TOKENS_PER_S)
+
+
+def test_drop_before_any_handle_starts_a_fresh_session(relay, uplink, monkeypatch):
+    monkeypatch.setattr(FakeLiveSession, "_issue_handle", lambda self: None)
+    handles = record_handles(relay.client)
+
+    async def main():
+        loop, browser, task = start_loop(relay)
+        await until(lambda: loop.transcript.turn_count >= 1)
+        browser.mic(noise(0))
+        await drained(loop, browser)
+        relay.client.drop_all()
+        await until(lambda: loop.transcript.turn_count >= 2)   # the new session answered the prompt again
+        await stop_loop(browser, task)
+        return loop
+
+    loop = asyncio.run(main())
+    assert handles == [None, None]
+    assert relay.client.resumes == 0
+    assert loop.reconnects == 1
+    assert "fake2" not in uplink      # audio meant for the old context is not replayed
+
+
+def test_gives_up_after_reconnect_attempts(relay, monkeypatch):
+    monkeypatch.setattr(relay, "RECONNECT_ATTEMPTS", 3)
+    attempts = []
+
+    @asynccontextmanager
+    async def refuse(model=None, config=None):
+        attempts.append(config.session_resumption.handle)
+        raise errors.APIError(1011, {"message": "unavailable"})
+        yield
+
+    async def main():
+        loop, browser, task = start_loop(relay)
+        await until(lambda: loop.resume_handle == "fake1-2")
+        relay.client.aio.live.connect = refuse
+        relay.client.drop_all()
+        await asyncio.wait_for(task, 5)     # the session ends without the browser closing
+        return loop
+
+    loop = asyncio.run(main())
+    assert attempts == ["fake1-2"] * 3
+    assert not loop.active
+    assert loop.reconnects == 0
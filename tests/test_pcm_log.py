@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from audio.pcm_log import PcmLog
+
+RATE = 48000
+
+
+@pytest.fixture
+def capture(tmp_path):
+    """25 s of noise whose level ramps up, as a raw .pcm capture"""
+    rng = np.random.default_rng(0)
+    n = 25 * RATE
+    samples = (rng.standard_normal(n) * np.linspace(100, 8000, n)).clip(-32768, 32767).astype("<i2")
+    path = tmp_path / "mic_test.pcm"
+    path.write_bytes(samples.tobytes())
+    return str(path), samples
+
+
+def brute_force(samples, edges_s):
+    edges = np.round(np.asarray(edges_s) * RATE).astype(np.int64)
+    peak, rms = [], []
+    for a, b in zip(edges[:-1], edges[1:]):
+        x = samples[a:b].astype(np.float64)
+        peak.append(np.abs(x).max())
+        rms.append(np.sqrt(np.mean(x * x)))
+    return np.array(peak), np.array(rms)
+
+
+@pytest.mark.parametrize("start, end, points", [(1, 20, 5), (0.3, None, 7), (2, 2.01, 50), (0, 25, 1000)])
+def test_overview_reports_the_bins_it_summarised(capture, start, end, points):
+    path, samples = capture
+    with PcmLog(path) as log:
+        ov = log.overview(start, end, points)
+    end = 25 if end is None else end
+
+    assert len(ov.peak) == len(ov.rms) == points
+    assert len(ov.edges_s) == points + 1
+    assert np.all(np.diff(ov.edges_s) > 0)
+    assert ov.start_s == ov.edges_s[0]
+    assert ov.bin_s == pytest.approx((ov.edges_s[-1] - ov.edges_s[0]) / points)
+    # Edges sit within half a bucket (at most 1/32 of a bin, or of a 256-sample level-0 bucket) of the request
+    tolerance = max((end - start) / points / 32, 128 / RATE) + 1 / RATE
+    assert ov.edges_s == pytest.approx(np.linspace(start, end, points + 1), abs=tolerance)
+
+    peak, rms = brute_force(samples, ov.edges_s)
+    assert np.array_equal(ov.peak, peak)
+    assert ov.rms == pytest.approx(rms, rel=1e-4)
+
+
+def test_pyramid_sidecar_is_reused_and_rebuilt_when_stale(capture):
+    path, samples = capture
+    with PcmLog(path) as log:
+        first = log.overview(0, None, 10)
+    with PcmLog(path) as log:
+        assert np.array_equal(log.overview(0, None, 10).peak, first.peak)
+    with open(path, "ab") as f:
+        f.write(np.full(RATE, 30000, dtype="<i2").tobytes())     # one loud second appended
+    with PcmLog(path) as log:
+        grown = log.overview(0, None, 10)
+    assert grown.edges_s[-1] == 26
+    peak, _ = brute_force(np.concatenate([samples, np.full(RATE, 30000, dtype="<i2")]), grown.edges_s)
+    assert np.array_equal(grown.peak, peak)
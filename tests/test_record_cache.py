@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from services.record_cache import TTLCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load_async("k", loader) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(r == {"id": 1} for r in results)
+    assert cache.coalesced == 4
+
+
+def test_cancelled_loader_does_not_cancel_waiters():
+    cache = TTLCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        first = asyncio.create_task(cache.get_or_load_async("k", loader))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_load_async("k", loader))
+        third = asyncio.create_task(cache.get_or_load_async("k", loader))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, await third
+
+    # One waiter takes the load over; the other coalesces onto it
+    assert asyncio.run(main()) == (2, 2)
+    assert len(calls) == 2
+    assert cache.get("k") == 2
+
+
+def test_loader_error_reaches_waiters_and_is_not_cached():
+    cache = TTLCache()
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("down")
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load_async("k", loader) for _ in range(3)),
+                                    return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(main()))
+    assert cache.get("k") is None
@@ -0,0 +1,28 @@
+import asyncio
+
+from services.recorder import SessionRecorder
+
+
+def test_writer_survives_a_failed_batch(tmp_path):
+    recorder = SessionRecorder(str(tmp_path), "s1", {"mic": 16000}, wav=False, batch_bytes=4)
+    write_batch = recorder._write_batch
+    failures = [ValueError("boom")]
+
+    def flaky_write_batch(batch):
+        if failures:
+            raise failures.pop()
+        write_batch(batch)
+
+    recorder._write_batch = flaky_write_batch
+
+    async def main():
+        recorder.start()
+        recorder.write("mic", b"lost")
+        await asyncio.wait_for(recorder._queue.join(), 1)
+        recorder.write("mic", b"kept")
+        await asyncio.wait_for(recorder.aclose(), 1)    # would hang if the failed batch was never marked done
+
+    asyncio.run(main())
+    assert recorder.recorded_bytes == {"mic": 4}
+    with open(recorder.paths[0], "rb") as f:
+        assert f.read() == b"kept"
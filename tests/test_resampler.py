@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from audio.resampler import StreamingResampler
+
+
+@pytest.mark.parametrize("in_rate, out_rate", [(32000, 48000), (48000, 16000), (44100, 48000)])
+def test_flush_emits_the_end_of_the_stream(in_rate, out_rate):
+    # A click on the very last input sample stays inside the filter until flushed
+    x = np.zeros(in_rate // 10, dtype="<i2")
+    x[-1] = 20000
+    resampler = StreamingResampler(in_rate, out_rate)
+    body = np.frombuffer(b"".join(resampler.process(x[i:i + 1000].tobytes()) for i in range(0, x.size, 1000)),
+                         dtype="<i2")
+    tail = np.frombuffer(resampler.flush(), dtype="<i2")
+
+    assert np.abs(body).max() < 2000
+    assert np.abs(tail).max() > 2000 * min(1.0, out_rate / in_rate)
+    # Output now spans the whole input, delayed by the filter
+    expected = (x.size + resampler.delay) * out_rate / in_rate
+    assert abs(body.size + tail.size - expected) <= out_rate / in_rate + 1
+
+
+def test_flush_resets_and_is_empty_when_idle():
+    resampler = StreamingResampler(24000, 48000)
+    assert resampler.flush() == b""
+    first = resampler.process(bytes(range(200)))
+    resampler.flush()
+    assert resampler.process(bytes(range(200))) == first
@@ -0,0 +1,26 @@
+import asyncio
+
+from services.transcript_store import TranscriptStore, load_transcript
+
+
+def test_writer_survives_a_failed_batch(tmp_path):
+    store = TranscriptStore(str(tmp_path), "s1")
+    append = store._append
+    failures = [ValueError("boom")]
+
+    def flaky_append(lines):
+        if failures:
+            raise failures.pop()
+        append(lines)
+
+    store._append = flaky_append
+
+    async def main():
+        store.start()
+        store.add_turn("User", "lost with the failed batch")
+        await asyncio.wait_for(store._queue.join(), 1)
+        store.add_turn("AI", "still written")
+        await asyncio.wait_for(store.aclose(), 1)     # would hang if the failed batch was never marked done
+
+    asyncio.run(main())
+    assert [turn.text for turn in load_transcript(store.path)] == ["still written"]
@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from conftest import start_loop, stop_loop, until
+from tools.fake_live import FakeLiveSession
+
+FRAME_MS = 20
+
+
+def speech(ms: int) -> list:
+    rng = np.random.default_rng(ms)
+    return [rng.integers(-5000, 5000, 48 * FRAME_MS, dtype=np.int16).tobytes() for _ in range(ms // FRAME_MS)]
+
+
+def silence(ms: int) -> list:
+    return [bytes(2 * 48 * FRAME_MS)] * (ms // FRAME_MS)
+
+
+@pytest.fixture
+def stream_ends(monkeypatch):
+    """Session handle of every audio_stream_end marker sent upstream"""
+    ends = []
+    original = FakeLiveSession.send_realtime_input
+
+    async def send_realtime_input(self, audio=None, audio_stream_end=False, **kwargs):
+        if audio_stream_end:
+            ends.append(self.handle_prefix)
+        await original(self, audio=audio, audio_stream_end=audio_stream_end, **kwargs)
+
+    monkeypatch.setattr(FakeLiveSession, "send_realtime_input", send_realtime_input)
+    return ends
+
+
+def test_pause_shorter_than_server_silence_keeps_the_turn_open(relay, monkeypatch, stream_ends):
+    monkeypatch.setattr(relay, "UPLINK_VAD", "gate")
+    assert relay.VAD_HANGOVER_MS >= relay.SILENCE_DURATION_MS
+
+    async def main():
+        loop, browser, task = start_loop(relay)
+        await until(lambda: loop.transcript.turn_count >= 1)
+        pause = relay.SILENCE_DURATION_MS - 4 * FRAME_MS
+        for frame in speech(500) + silence(pause) + speech(300):
+            browser.mic(frame)
+        await until(lambda: browser.incoming.empty() and loop.out_queue.empty())
+        await asyncio.sleep(0.05)
+        during_pause = len(stream_ends)
+
+        for frame in silence(relay.SILENCE_DURATION_MS + 2 * FRAME_MS):
+            browser.mic(frame)
+        await until(lambda: len(stream_ends) == 1)
+        await stop_loop(browser, task)
+        return during_pause
+
+    assert asyncio.run(main()) == 0
@@ -0,0 +1,279 @@
+"""Batch archiver for recorded audio: compress, analyse and index, on every core.
+
+Scans the capture directories (raw ``audio_logs/*.pcm`` and the ``.wav``
+recordings in ``audio_output/``), deletes empty 0-byte leftovers, and
+compresses the rest to FLAC (lossless) or Ogg Opus in a process pool, with
+level / silence analysis of each file done in the same pass.  Every result
+is appended to a JSONL manifest as it completes; a rerun skips files already
+archived unchanged, so an interrupted run resumes where it stopped.  Files
+modified within ``--min-age-s`` are left alone entirely, since a live session
+may still be writing them.
+
+Raw captures carry no header: ``speaker_*`` files are taken as 24 kHz,
+everything else as ``--pcm-rate`` (48 kHz, the browser mic rate).  Needs
+``soundfile`` (libsndfile >= 1.0.29 for Opus); Opus archives of
+recordings at other rates are resampled to 48 kHz.
+
+    python -m tools.archive_audio --out archive --format flac
+    python -m tools.archive_audio audio_logs --format opus --compression-level 0.6 --delete-originals
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from audio.analysis import LevelMonitor, dbfs
+from audio.pcm_log import SIDECAR_SUFFIX, PcmLog
+from audio.resampler import StreamingResampler
+
+try:
+    import soundfile
+except (ImportError, OSError):      # package missing, or libsndfile not found
+    soundfile = None
+
+FORMATS = {
+    "flac": ("FLAC", "PCM_16", ".flac"),
+    "opus": ("OGG", "OPUS", ".opus"),
+}
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+SPEAKER_RATE = 24000
+ANALYSIS_FRAME_MS = 100
+WRITE_BLOCK_S = 10
+
+
+@dataclass
+class Job:
+    source: str
+    archive: str
+    size: int
+    mtime_ns: int
+    pcm_rate: int
+    format: str
+    compression_level: Optional[float]
+
+
+def scan(directories: Iterable[str]) -> List[str]:
+    paths = []
+    for directory in directories:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.endswith((".pcm", ".wav")) and not name.endswith(SIDECAR_SUFFIX):
+                    paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def archive_path(out: str, source: str, fmt: str) -> str:
+    """<out>/<source directory name>/<stem><ext>, so captures from different directories cannot collide"""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(out, os.path.basename(os.path.dirname(os.path.abspath(source))), stem + FORMATS[fmt][2])
+
+
+def load_manifest(path: str) -> Dict[str, dict]:
+    """Latest entry per source; a torn final line (killed mid-write) is ignored"""
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["source"]] = entry
+    return entries
+
+
+def is_done(entry: Optional[dict], size: int, mtime_ns: int) -> bool:
+    return (entry is not None and entry.get("status") == "ok"
+            and entry.get("size") == size and entry.get("mtime_ns") == mtime_ns
+            and os.path.exists(entry.get("archive", "")))
+
+
+def unchanged(job: Job) -> bool:
+    """The source is still exactly what was archived"""
+    try:
+        st = os.stat(job.source)
+    except FileNotFoundError:
+        return False
+    return st.st_size == job.size and st.st_mtime_ns == job.mtime_ns
+
+
+def process(job: Job) -> dict:
+    """
+    Analyse and compress one capture; runs in a worker process
+
+    Args:
+        job (Job): Source, destination and encoding settings
+
+    Returns:
+        dict: Manifest entry with the file's levels, silence ratio and sizes
+    """
+    started = time.process_time()
+    major, subtype, _ = FORMATS[job.format]
+    levels = LevelMonitor(window=1)
+    tmp = job.archive + ".part"
+    os.makedirs(os.path.dirname(job.archive), exist_ok=True)
+
+    try:
+        with PcmLog(job.source, sample_rate=job.pcm_rate) as log:
+            rate = log.sample_rate
+            # Opus only takes its own rates; anything else (e.g. 32 kHz recordings) goes up to 48 kHz
+            out_rate = rate if job.format != "opus" or rate in OPUS_RATES else 48000
+            resampler = StreamingResampler(rate, out_rate) if out_rate != rate else None
+            step = rate * ANALYSIS_FRAME_MS // 1000
+            with soundfile.SoundFile(tmp, "w", samplerate=out_rate, channels=1, format=major, subtype=subtype,
+                                     compression_level=job.compression_level) as out:
+                for block in log.frames(WRITE_BLOCK_S * 1000):
+                    for i in range(0, block.size, step):
+                        levels.update(memoryview(block[i:i + step]).cast("B"))
+                    if resampler is not None:
+                        block = np.frombuffer(resampler.process(memoryview(block).cast("B")), dtype="<i2")
+                    out.write(block)
+                if resampler is not None:
+                    # The filter holds back the last few ms until it sees what follows
+                    out.write(np.frombuffer(resampler.flush(), dtype="<i2"))
+            duration_s = log.duration_s
+        os.replace(tmp, job.archive)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    stats = levels.stats()
+    archived = os.path.getsize(job.archive)
+    pcm_bytes = levels.samples * 2
+    return {
+        "source": job.source,
+        "status": "ok",
+        "size": job.size,
+        "mtime_ns": job.mtime_ns,
+        "archive": job.archive,
+        "format": job.format,
+        "archive_bytes": archived,
+        "ratio": round(pcm_bytes / archived, 2) if archived else None,
+        "sample_rate": rate,
+        "archive_rate": out_rate,
+        "duration_s": round(duration_s, 3),
+        "peak_dbfs": round(dbfs(stats["peak"]), 1),
+        "rms_dbfs": stats["rms_dbfs"],
+        "dc_offset": stats["dc_offset"],
+        "clipped_samples": stats["clipped_samples"],
+        "silence_ratio": round(stats["silent_frames"] / stats["frames"], 3) if stats["frames"] else 1.0,
+        "cpu_s": round(time.process_time() - started, 3),
+    }
+
+
+class Progress:
+    """One status line per ``interval`` seconds: files, data rate and ETA"""
+
+    def __init__(self, total_files: int, total_bytes: int, interval: float = 1.0):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.files = self.bytes = self.failed = 0
+        self.started = self._last = time.monotonic()
+
+    def update(self, size: int, failed: bool = False):
+        self.files += 1
+        self.bytes += size
+        self.failed += failed
+        now = time.monotonic()
+        if now - self._last >= self.interval or self.files == self.total_files:
+            self._last = now
+            elapsed = now - self.started
+            rate = self.bytes / elapsed if elapsed else 0.0
+            eta = (self.total_bytes - self.bytes) / rate if rate else 0.0
+            print(f"[{self.files}/{self.total_files}] {self.bytes / 1e6:.1f}/{self.total_bytes / 1e6:.1f} MB "
+                  f"{rate / 1e6:.1f} MB/s  failed={self.failed}  eta {eta:.0f}s", flush=True)
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compress and analyse recorded audio in parallel")
+    parser.add_argument("directories", nargs="*", default=["audio_logs", "audio_output"])
+    parser.add_argument("--out", default="archive", help="archive root")
+    parser.add_argument("--manifest", default=None, help="JSONL manifest, default <out>/manifest.jsonl")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="flac")
+    parser.add_argument("--compression-level", type=float, default=None,
+                        help="0 (fast / high bitrate) to 1 (slow / small), libsndfile's default when unset")
+    parser.add_argument("--pcm-rate", type=int, default=48000, help="rate of raw captures other than speaker_*")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes, default all cores")
+    parser.add_argument("--keep-empty", action="store_true", help="leave 0-byte captures in place")
+    parser.add_argument("--min-age-s", type=float, default=300.0,
+                        help="skip files modified more recently than this; they may still be recording")
+    parser.add_argument("--delete-originals", action="store_true",
+                        help="remove each source once its archive is written and listed in the manifest")
+    args = parser.parse_args(argv)
+
+    if soundfile is None:
+        print("Archiving needs soundfile (pip install soundfile)")
+        return 1
+    manifest_path = args.manifest or os.path.join(args.out, "manifest.jsonl")
+    done = load_manifest(manifest_path)
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+
+    jobs: List[Job] = []
+    skipped = empty = recent = 0
+    cutoff_ns = time.time_ns() - int(args.min_age_s * 1e9)
+    with open(manifest_path, "a", encoding="utf-8") as manifest:
+        def record(entry: dict):
+            manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+
+        for path in scan(args.directories):
+            st = os.stat(path)
+            if st.st_mtime_ns > cutoff_ns:
+                recent += 1
+                continue
+            if st.st_size < 2 or (path.endswith(".wav") and st.st_size <= 44):
+                empty += 1
+                if not args.keep_empty:
+                    os.remove(path)
+                    record({"source": path, "status": "empty_deleted", "size": st.st_size})
+                continue
+            if is_done(done.get(path), st.st_size, st.st_mtime_ns):
+                skipped += 1
+                continue
+            rate = SPEAKER_RATE if os.path.basename(path).startswith("speaker") else args.pcm_rate
+            jobs.append(Job(path, archive_path(args.out, path, args.format), st.st_size, st.st_mtime_ns,
+                            rate, args.format, args.compression_level))
+
+        print(f"{len(jobs)} to archive, {skipped} already done, {empty} empty"
+              f"{'' if args.keep_empty else ' (deleted)'}, {recent} still recent; {args.workers} workers", flush=True)
+        jobs.sort(key=lambda job: job.size, reverse=True)      # big files first balances the pool
+        progress = Progress(len(jobs), sum(job.size for job in jobs))
+        started = time.monotonic()
+        cpu_s = archived_bytes = 0.0
+
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(process, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    entry = {"source": job.source, "status": "failed", "size": job.size, "error": str(e)}
+                record(entry)
+                ok = entry["status"] == "ok"
+                if ok:
+                    cpu_s += entry["cpu_s"]
+                    archived_bytes += entry["archive_bytes"]
+                    if args.delete_originals and unchanged(job):
+                        os.remove(job.source)
+                progress.update(job.size, failed=not ok)
+
+    wall_s = time.monotonic() - started
+    source_bytes = progress.bytes
+    if jobs:
+        print(f"archived {source_bytes / 1e6:.1f} MB -> {archived_bytes / 1e6:.1f} MB in {wall_s:.1f}s "
+              f"({cpu_s:.1f} CPU-s, x{cpu_s / wall_s if wall_s else 0:.1f} parallel); manifest {manifest_path}")
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,266 @@
+"""Local stand-in for the Gemini Live API, at the Python level AudioLoop talks to.
+
+``FakeLiveClient`` exposes ``client.aio.live.connect(model=..., config=...)``
+yielding sessions with ``send``, ``send_realtime_input`` and ``receive``;
+messages are real ``google.genai.types.LiveServerMessage`` objects, so
+``response.data`` and ``response.server_content.*`` behave as upstream.
+
+The fake answers every ``end_of_turn`` send, every ``audio_stream_end`` /
+``activity_end`` (what the relay's uplink VAD sends after speech), and every
+``FAKE_LIVE_TURN_EVERY_S`` seconds of uplink audio with a model turn, the
+latter three preceded by an input transcription:
+``FAKE_LIVE_LATENCY_MS`` of think time, then ``FAKE_LIVE_REPLY_S`` seconds of
+24 kHz audio in ``FAKE_LIVE_CHUNK_MS`` chunks paced at ``FAKE_LIVE_PACE`` x
+realtime (0 sends the whole reply at once), each with an output transcription.
+A user turn arriving while a reply is still streaming interrupts it: the
+reply stops with ``interrupted`` and ``turn_complete``, like a barge-in.
+
+Sessions hand out a ``session_resumption_update`` handle after setup and
+after every turn, and accept it back in ``config.session_resumption``.
+``FakeLiveClient.drop_all()`` breaks every open connection (``receive`` and
+the sends then raise, as on a network error), or with ``go_away=True`` sends
+``go_away`` first; ``FAKE_LIVE_DROP_EVERY_S`` drops each connection that many
+seconds after it opens.  Under ``python -m tools.fake_live``, drop on demand
+with ``curl -X POST 'localhost:9000/fake_live/drop?go_away=0'``.
+
+Run the relay against it (no API key or network needed):
+
+    FAKE_LIVE_LATENCY_MS=300 python -m tools.fake_live 9000
+"""
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import numpy as np
+from google.genai import errors, types
+
+OUT_RATE = 24000
+
+
+@dataclass
+class FakeLiveOptions:
+    latency_ms: float = 300.0
+    connect_ms: float = 150.0
+    chunk_ms: float = 40.0
+    reply_s: float = 2.0
+    pace: float = 1.0
+    turn_every_s: float = 5.0
+    drop_every_s: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "FakeLiveOptions":
+        return cls(
+            latency_ms=float(os.getenv("FAKE_LIVE_LATENCY_MS", cls.latency_ms)),
+            connect_ms=float(os.getenv("FAKE_LIVE_CONNECT_MS", cls.connect_ms)),
+            chunk_ms=float(os.getenv("FAKE_LIVE_CHUNK_MS", cls.chunk_ms)),
+            reply_s=float(os.getenv("FAKE_LIVE_REPLY_S", cls.reply_s)),
+            pace=float(os.getenv("FAKE_LIVE_PACE", cls.pace)),
+            turn_every_s=float(os.getenv("FAKE_LIVE_TURN_EVERY_S", cls.turn_every_s)),
+            drop_every_s=float(os.getenv("FAKE_LIVE_DROP_EVERY_S", cls.drop_every_s)),
+        )
+
+
+def tone_chunk(chunk_ms: float, rate: int = OUT_RATE, freq: float = 220.0) -> bytes:
+    """A quiet sine burst of int16 mono PCM"""
+    t = np.arange(int(rate * chunk_ms / 1000)) / rate
+    return (np.sin(2 * np.pi * freq * t) * 3000).astype("<i2").tobytes()
+
+
+def _rate_of(mime_type: Optional[str], default: int = 16000) -> int:
+    for part in (mime_type or "").split(";"):
+        key, _, value = part.strip().partition("=")
+        if key == "rate" and value.isdigit():
+            return int(value)
+    return default
+
+
+class FakeLiveSession:
+    """One fake live connection; model turns are produced one at a time, in order"""
+
+    def __init__(self, options: FakeLiveOptions, handle_prefix: str = "fake"):
+        self.options = options
+        self.handle_prefix = handle_prefix
+        self.handles_issued = 0
+        self.dropped = False
+        self.turns_requested = 0
+        self.uplink_bytes = 0
+        self._chunk = tone_chunk(options.chunk_ms)
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._heard = 0.0
+        self._speaking = False
+        self._interrupt = asyncio.Event()
+        self._ws = SimpleNamespace(close_code=None)     # what live_pool.websocket_is_open looks at
+        self._responder = asyncio.create_task(self._respond())
+        self._dropper = asyncio.create_task(self._drop_later()) if options.drop_every_s > 0 else None
+        self._issue_handle()
+
+    async def send(self, input: Any = None, end_of_turn: bool = False):
+        self._check_open()
+        if end_of_turn:
+            self._request_turn()
+
+    async def send_realtime_input(self, audio: Any = None, audio_stream_end: bool = False,
+                                  activity_end: Any = None, **kwargs):
+        self._check_open()
+        if audio_stream_end or activity_end is not None:
+            if self._heard > 0:
+                self._heard = 0.0
+                self._user_turn()
+            return
+        if audio is None:
+            return
+        if isinstance(audio, dict):
+            data, mime_type = audio.get("data", b""), audio.get("mime_type")
+        else:
+            data, mime_type = audio.data or b"", audio.mime_type
+        self.uplink_bytes += len(data)
+        self._heard += len(data) / (2 * _rate_of(mime_type))
+        if self._heard >= self.options.turn_every_s:
+            self._heard -= self.options.turn_every_s
+            self._user_turn()
+
+    async def receive(self):
+        """Yield messages up to and including the next turn_complete, like the real session"""
+        while True:
+            message = await self._messages.get()
+            if message is None:
+                raise errors.APIError(1006, {"message": "Abnormal closure (fake drop)"})
+            yield message
+            if message.server_content and message.server_content.turn_complete:
+                return
+
+    async def close(self):
+        if self._ws.close_code is None:
+            self._ws.close_code = 1000
+        for task in (self._responder, self._dropper):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def drop(self, go_away: bool = False):
+        """Break the connection; with go_away, only announce that it is about to close"""
+        if go_away:
+            self._messages.put_nowait(types.LiveServerMessage(go_away=types.LiveServerGoAway(time_left="10s")))
+            return
+        self.dropped = True
+        self._ws.close_code = 1006
+        self._responder.cancel()
+        self._messages.put_nowait(None)
+
+    def _check_open(self):
+        if self.dropped:
+            raise errors.APIError(1006, {"message": "Abnormal closure (fake drop)"})
+
+    def _issue_handle(self):
+        self.handles_issued += 1
+        self._messages.put_nowait(types.LiveServerMessage(
+            session_resumption_update=types.LiveServerSessionResumptionUpdate(
+                new_handle=f"{self.handle_prefix}-{self.handles_issued}", resumable=True,
+            ),
+        ))
+
+    async def _drop_later(self):
+        await asyncio.sleep(self.options.drop_every_s)
+        self.drop()
+
+    def _user_turn(self):
+        if self._speaking:
+            self._interrupt.set()
+        self._put(input_transcription=types.Transcription(text="candidate speech "))
+        self._request_turn()
+
+    def _request_turn(self):
+        self.turns_requested += 1
+        self._pending.put_nowait(self.turns_requested)
+
+    def _put(self, **content):
+        self._messages.put_nowait(types.LiveServerMessage(server_content=types.LiveServerContent(**content)))
+
+    async def _respond(self):
+        options = self.options
+        chunks = max(1, round(options.reply_s * 1000 / options.chunk_ms))
+        while True:
+            turn = await self._pending.get()
+            await asyncio.sleep(options.latency_ms / 1000)
+            self._speaking = True
+            self._interrupt.clear()
+            for i in range(chunks):
+                if self._interrupt.is_set():
+                    self._put(interrupted=True)
+                    break
+                self._put(
+                    model_turn=types.Content(role="model", parts=[
+                        types.Part(inline_data=types.Blob(data=self._chunk, mime_type=f"audio/pcm;rate={OUT_RATE}")),
+                    ]),
+                    output_transcription=types.Transcription(text=f"reply {turn}.{i} "),
+                )
+                if options.pace > 0:
+                    await asyncio.sleep(options.chunk_ms / 1000 / options.pace)
+            self._speaking = False
+            self._put(turn_complete=True)
+            self._issue_handle()
+
+
+class FakeLiveClient:
+    """Drop-in for ``genai.Client`` as far as ``client.aio.live.connect`` goes"""
+
+    def __init__(self, options: Optional[FakeLiveOptions] = None):
+        self.options = options or FakeLiveOptions()
+        self.aio = SimpleNamespace(live=SimpleNamespace(connect=self.connect))
+        self.connects = 0
+        self.resumes = 0
+        self.sessions = set()
+
+    @property
+    def open_sessions(self) -> int:
+        return len(self.sessions)
+
+    @asynccontextmanager
+    async def connect(self, model: Optional[str] = None, config: Any = None):
+        await asyncio.sleep(self.options.connect_ms / 1000)
+        resumption = getattr(config, "session_resumption", None)
+        handle = resumption.handle if resumption else None
+        if handle is not None:
+            if not handle.startswith("fake"):
+                raise errors.APIError(1008, {"message": f"Unknown resumption handle {handle!r}"})
+            self.resumes += 1
+        self.connects += 1
+        session = FakeLiveSession(self.options, handle_prefix=f"fake{self.connects}")
+        self.sessions.add(session)
+        try:
+            yield session
+        finally:
+            self.sessions.discard(session)
+            await session.close()
+
+    def drop_all(self, go_away: bool = False) -> int:
+        """Drop (or send go_away on) every open connection; returns how many"""
+        sessions = list(self.sessions)
+        for session in sessions:
+            session.drop(go_away)
+        return len(sessions)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    os.environ.setdefault("GOOGLE_API_KEY", "fake-live")   # main builds a real client at import
+    import main
+
+    main.client = FakeLiveClient(FakeLiveOptions.from_env())
+
+    @main.app.post("/fake_live/drop")
+    async def fake_drop(go_away: bool = False):
+        return {"dropped": main.client.drop_all(go_away)}
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 9000
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
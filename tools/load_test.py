@@ -0,0 +1,294 @@
+"""Load generator for /ws/audio: many concurrent clients replaying recorded mic audio.
+
+Each client streams one of the ``audio_logs/mic_*.pcm`` captures or recorder
+WAVs (looped, paced in realtime) as 0x01 frames and reads the relay's speaker
+frames.
+Reported at the end:
+
+* session outcomes (completed / rejected / failed)
+* uplink and downlink throughput
+* time to first audio, and turn latency: time from the end of each
+  ``--turn-every`` seconds of uplink audio to the next speaker frame (this
+  lines up with the fake server's turn trigger, keep its reply shorter;
+  only meaningful with UPLINK_VAD=off, which --spawn sets by default)
+* CPU and RSS of the server process, total and per session (Linux /proc)
+
+Against the fake live server, spawned on the URL's port:
+
+    python -m tools.load_test --spawn --sessions 200 --ramp 20 --duration 30
+
+Against a relay that is already running (pass its pid for CPU/RSS):
+
+    python -m tools.load_test --url ws://127.0.0.1:9000/ws/audio --pid 12345
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+import websockets
+
+from audio.framing import FRAME_MIC, FRAME_SPEAKER, encode_frame, parse_frame
+from audio.pcm_log import PcmLog
+
+
+@dataclass
+class ClientStats:
+    outcome: str = "pending"
+    bytes_up: int = 0
+    bytes_down: int = 0
+    frames_up: int = 0
+    frames_down: int = 0
+    first_audio_s: Optional[float] = None
+    turn_latencies: List[float] = field(default_factory=list)
+
+
+class ProcessSampler:
+    """Samples CPU time and RSS of one process from /proc"""
+
+    def __init__(self, pid: int, interval: float = 1.0):
+        self.pid = pid
+        self.interval = interval
+        self.rss_start = self.rss_peak = self._rss()
+        self.cpu_start = self._cpu()
+        self.cpu_end = self.cpu_start
+        self.peak_sessions = 0
+
+    def _cpu(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def _rss(self) -> int:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    async def run(self, active_sessions):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.rss_peak = max(self.rss_peak, self._rss())
+                self.cpu_end = self._cpu()
+            except FileNotFoundError:
+                return
+            self.peak_sessions = max(self.peak_sessions, active_sessions())
+
+
+def load_captures(pattern: str) -> List[bytes]:
+    captures = []
+    for path in sorted(glob.glob(pattern)):
+        with PcmLog(path) as log:       # raw captures or recorder WAVs
+            data = bytes(log.pcm())
+        if data:
+            captures.append(data)
+    if not captures:
+        raise SystemExit(f"No non-empty captures match {pattern}")
+    return captures
+
+
+async def run_client(args, capture: bytes, stats: ClientStats, active: Dict[str, int]):
+    frame_bytes = int(args.rate * args.frame_ms / 1000) * 2
+    turn_bytes = int(args.rate * args.turn_every) * 2
+    mark: Optional[float] = None
+    started = time.perf_counter()
+
+    async def receive(ws):
+        nonlocal mark
+        async for message in ws:
+            if isinstance(message, str):
+                event = json.loads(message)
+                if event.get("type") == "rejected":
+                    stats.outcome = "rejected"
+                continue
+            frame = parse_frame(message)
+            if frame.kind != FRAME_SPEAKER:
+                continue
+            now = time.perf_counter()
+            stats.bytes_down += len(frame.payload)
+            stats.frames_down += 1
+            if stats.first_audio_s is None:
+                stats.first_audio_s = now - started
+            if mark is not None:
+                stats.turn_latencies.append(now - mark)
+                mark = None
+
+    async def send(ws):
+        nonlocal mark
+        offset = sent_in_turn = 0
+        deadline = time.perf_counter()
+        end = deadline + args.duration
+        while deadline < end:
+            chunk = capture[offset:offset + frame_bytes]
+            offset = offset + frame_bytes if offset + frame_bytes < len(capture) else 0
+            await ws.send(encode_frame(FRAME_MIC, chunk))
+            stats.bytes_up += len(chunk)
+            stats.frames_up += 1
+            sent_in_turn += len(chunk)
+            if sent_in_turn >= turn_bytes:
+                sent_in_turn -= turn_bytes
+                mark = time.perf_counter()
+            deadline += args.frame_ms / 1000
+            await asyncio.sleep(max(0.0, deadline - time.perf_counter()))
+
+    try:
+        async with websockets.connect(args.url, max_size=None, open_timeout=args.open_timeout) as ws:
+            active["n"] += 1
+            try:
+                receiver = asyncio.create_task(receive(ws))
+                sender = asyncio.create_task(send(ws))
+                done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+                for task in (receiver, sender):
+                    task.cancel()
+                for task in done:
+                    if not task.cancelled() and task.exception() is not None:
+                        raise task.exception()
+                if stats.outcome == "pending":
+                    stats.outcome = "completed" if sender in done else "closed_early"
+            finally:
+                active["n"] -= 1
+    except Exception as e:
+        if stats.outcome == "pending":
+            stats.outcome = f"failed: {type(e).__name__}"
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of durations in seconds, in milliseconds"""
+    if not values:
+        return {}
+    p50, p95, p99 = np.percentile(np.asarray(values) * 1000, [50, 95, 99])
+    return {"p50": round(p50, 1), "p95": round(p95, 1), "p99": round(p99, 1), "n": len(values)}
+
+
+def _fmt(pct: Dict[str, float]) -> str:
+    if not pct:
+        return "n/a"
+    return f"p50={pct['p50']:.0f}ms p95={pct['p95']:.0f}ms p99={pct['p99']:.0f}ms (n={pct['n']})"
+
+
+def summarize(args, results: List[ClientStats], wall_s: float, sampler: Optional[ProcessSampler]) -> Dict:
+    outcomes: Dict[str, int] = {}
+    for stats in results:
+        outcomes[stats.outcome] = outcomes.get(stats.outcome, 0) + 1
+    first_audio = [s.first_audio_s for s in results if s.first_audio_s is not None]
+    latencies = [lat for s in results for lat in s.turn_latencies]
+    summary = {
+        "sessions": len(results),
+        "outcomes": outcomes,
+        "wall_s": round(wall_s, 2),
+        "uplink_mb_s": round(sum(s.bytes_up for s in results) / wall_s / 1e6, 3),
+        "downlink_mb_s": round(sum(s.bytes_down for s in results) / wall_s / 1e6, 3),
+        "frames_up_s": round(sum(s.frames_up for s in results) / wall_s, 1),
+        "frames_down_s": round(sum(s.frames_down for s in results) / wall_s, 1),
+        "first_audio_ms": percentiles(first_audio),
+        "turn_latency_ms": percentiles(latencies),
+    }
+    print(f"sessions      {len(results)}  {outcomes}")
+    print(f"uplink        {summary['uplink_mb_s']} MB/s  {summary['frames_up_s']} frames/s")
+    print(f"downlink      {summary['downlink_mb_s']} MB/s  {summary['frames_down_s']} frames/s")
+    print(f"first audio   {_fmt(summary['first_audio_ms'])}")
+    print(f"turn latency  {_fmt(summary['turn_latency_ms'])}")
+
+    if sampler is not None:
+        cpu_s = sampler.cpu_end - sampler.cpu_start
+        peak = max(sampler.peak_sessions, 1)
+        rss_growth = sampler.rss_peak - sampler.rss_start
+        summary.update({
+            "cpu_percent": round(100 * cpu_s / wall_s, 1),
+            "cpu_ms_per_session_s": round(1000 * cpu_s / (peak * wall_s), 2),
+            "rss_start_mb": round(sampler.rss_start / 2**20, 1),
+            "rss_peak_mb": round(sampler.rss_peak / 2**20, 1),
+            "rss_kb_per_session": round(rss_growth / peak / 1024, 1),
+            "peak_sessions": sampler.peak_sessions,
+        })
+        print(f"server cpu    {summary['cpu_percent']}%  "
+              f"{summary['cpu_ms_per_session_s']} ms cpu per session-second")
+        print(f"server rss    {summary['rss_start_mb']} -> {summary['rss_peak_mb']} MB  "
+              f"{summary['rss_kb_per_session']} KB per session at {sampler.peak_sessions} concurrent")
+    return summary
+
+
+def spawn_fake_server(args) -> subprocess.Popen:
+    port = urlparse(args.url).port or 9000
+    env = dict(os.environ)
+    env.setdefault("MAX_LIVE_SESSIONS", str(args.sessions))
+    env.setdefault("ADMISSION_QUEUE_SIZE", str(args.sessions))
+    env.setdefault("FAKE_LIVE_TURN_EVERY_S", str(args.turn_every))
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env.setdefault("UPLINK_VAD", "off")
+    return subprocess.Popen([sys.executable, "-m", "tools.fake_live", str(port)], env=env)
+
+
+async def wait_for_server(url: str, timeout: float = 30.0):
+    parsed = urlparse(url)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(parsed.hostname, parsed.port or 80)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def main(args) -> Dict:
+    captures = load_captures(args.pcm)
+    server = spawn_fake_server(args) if args.spawn else None
+    try:
+        await wait_for_server(args.url)
+        pid = server.pid if server is not None else args.pid
+        active = {"n": 0}
+        sampler = ProcessSampler(pid) if pid else None
+        sampler_task = asyncio.create_task(sampler.run(lambda: active["n"])) if sampler else None
+
+        results = [ClientStats() for _ in range(args.sessions)]
+        started = time.perf_counter()
+        clients = []
+        for i, stats in enumerate(results):
+            clients.append(asyncio.create_task(run_client(args, captures[i % len(captures)], stats, active)))
+            if args.ramp:
+                await asyncio.sleep(args.ramp / args.sessions)
+        await asyncio.gather(*clients)
+        wall_s = time.perf_counter() - started
+
+        if sampler_task is not None:
+            sampler_task.cancel()
+        return summarize(args, results, wall_s, sampler)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--url", default="ws://127.0.0.1:9000/ws/audio")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which clients connect")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of audio each client streams")
+    parser.add_argument("--pcm", default="audio_logs/mic_*.pcm", help="glob of 16-bit mono captures")
+    parser.add_argument("--rate", type=int, default=48000, help="sample rate of the captures")
+    parser.add_argument("--frame-ms", type=float, default=20.0)
+    parser.add_argument("--turn-every", type=float, default=5.0, help="seconds of uplink audio per user turn")
+    parser.add_argument("--open-timeout", type=float, default=30.0)
+    parser.add_argument("--spawn", action="store_true", help="start tools.fake_live on the URL's port")
+    parser.add_argument("--pid", type=int, help="server pid to sample CPU/RSS from")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    summary = asyncio.run(main(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
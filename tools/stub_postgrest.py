@@ -0,0 +1,133 @@
+"""Local stand-in for the Supabase REST API (PostgREST) serving one in-memory table.
+
+Supports the subset the Supabase services use: ``select`` projection,
+``eq/neq/gt/gte/lt/lte/in/is`` filters, ``order``, ``limit``/``offset``
+and ``Prefer: count=exact`` (reported in ``Content-Range``, also on HEAD).
+Latency and failures can be injected to exercise timeouts and retries.
+
+    STUB_ROWS=5000 STUB_LATENCY_MS=20 STUB_FAIL_RATE=0.1 python tools/stub_postgrest.py
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request, Response
+import uvicorn
+
+TABLE_NAME = "interviewer_gemini"
+LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "0"))
+FAIL_RATE = float(os.getenv("STUB_FAIL_RATE", "0"))
+
+app = FastAPI()
+app.state.rows = []
+app.state.requests = 0
+
+
+def sample_rows(n: int) -> List[Dict[str, Any]]:
+    statuses = ["active", "draft", "archived"]
+    return [
+        {
+            "id": i,
+            "title": f"Interview {i}",
+            "status": statuses[i % len(statuses)],
+            "duration_minutes": 15 + (i % 4) * 15,
+            "prompt": f"You are interviewing candidate #{i} for a software engineering position.",
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def _coerce(raw: str) -> Any:
+    if raw == "null":
+        return None
+    if raw in ("true", "false"):
+        return raw == "true"
+    try:
+        return int(raw)
+    except ValueError:
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+
+
+def _matches(row: Dict[str, Any], column: str, expr: str) -> bool:
+    op, _, raw = expr.partition(".")
+    value = row.get(column)
+    if op == "in":
+        options = [_coerce(v.strip('"')) for v in raw.strip("()").split(",") if v]
+        return value in options
+    target = _coerce(raw)
+    if op == "is":
+        return value is target
+    if op == "eq":
+        return value == target
+    if op == "neq":
+        return value != target
+    if value is None or target is None:
+        return False
+    return {"gt": value > target, "gte": value >= target,
+            "lt": value < target, "lte": value <= target}.get(op, False)
+
+
+def _query(request: Request):
+    rows = app.state.rows
+    select = "*"
+    order = None
+    limit = offset = None
+    for key, expr in request.query_params.multi_items():
+        if key == "select":
+            select = expr
+        elif key == "order":
+            order = expr
+        elif key == "limit":
+            limit = int(expr)
+        elif key == "offset":
+            offset = int(expr)
+        else:
+            rows = [row for row in rows if _matches(row, key, expr)]
+
+    if order:
+        for part in reversed(order.split(",")):
+            column, _, direction = part.partition(".")
+            rows = sorted(rows, key=lambda r: (r.get(column) is None, r.get(column)),
+                          reverse=direction.startswith("desc"))
+
+    total = len(rows)
+    start = offset or 0
+    rows = rows[start:start + limit] if limit is not None else rows[start:]
+    if select != "*":
+        columns = select.split(",")
+        rows = [{c: row.get(c) for c in columns} for row in rows]
+    return rows, start, total
+
+
+@app.api_route(f"/rest/v1/{TABLE_NAME}", methods=["GET", "HEAD"])
+async def table(request: Request):
+    app.state.requests += 1
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if FAIL_RATE and random.random() < FAIL_RATE:
+        return Response(status_code=503)
+
+    rows, start, total = _query(request)
+    headers = {}
+    if "count=exact" in request.headers.get("prefer", ""):
+        end = start + len(rows) - 1
+        headers["Content-Range"] = f"{start}-{end}/{total}" if rows else f"*/{total}"
+    body = b"" if request.method == "HEAD" else json.dumps(rows).encode()
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/stats")
+async def stats():
+    return {"rows": len(app.state.rows), "requests": app.state.requests}
+
+
+if __name__ == "__main__":
+    app.state.rows = sample_rows(int(os.getenv("STUB_ROWS", "1000")))
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 54321
+    uvicorn.run(app, host="127.0.0.1", port=port)